@@ -2,6 +2,7 @@ import logging
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from extensions import db
+import sql_profiler
 import os
 from dotenv import load_dotenv
 from datetime import datetime
@@ -57,8 +58,11 @@ def create_app():
         MAIL_PASSWORD=os.getenv("MAIL_PASSWORD"),
         MAIL_DEFAULT_SENDER=os.getenv("MAIL_USERNAME")
     )
+    # Per-request query counts/timings in Server-Timing headers, slow and N+1 queries logged
+    app.config['SQL_PROFILING'] = os.getenv('SQL_PROFILING', '').lower() in ('1', 'true', 'yes')
     db.init_app(app)
     mail.init_app(app)
+    sql_profiler.init_app(app)
 
     # Import models so they get registered
     from models import user, post, like, comment
@@ -425,15 +425,19 @@ def admin_delete_user(user_id):
         return redirect(url_for('post_bp.login'))
     from models.user import User
     from models.post import Post
+    from models.like import Like
+    from models.comment import Comment
     user = User.query.get_or_404(user_id)
     if user.username == 'admin':
         flash('Cannot delete the admin user.', 'error')
         return redirect(url_for('post_bp.admin_dashboard'))
-    # Delete all posts by user (cascades to likes/comments if set up)
-    posts = Post.query.filter_by(user_id=user.id).all()
-    for post in posts:
-        db.session.delete(post)
-    db.session.delete(user)
+    # Set-based deletes in FK order instead of loading every post, like and comment
+    user_posts = db.select(Post.id).where(Post.user_id == user.id)
+    for model in (Like, Comment):
+        model.query.filter(db.or_(model.post_id.in_(user_posts), model.user_id == user.id)) \
+            .delete(synchronize_session=False)
+    Post.query.filter_by(user_id=user.id).delete(synchronize_session=False)
+    User.query.filter_by(id=user.id).delete(synchronize_session=False)
     db.session.commit()
     flash('User and all their posts deleted.', 'success')
     return redirect(url_for('post_bp.admin_dashboard'))
@@ -0,0 +1,20 @@
+"""
+Opt-in per-request SQL profiling (SQL_PROFILING and friends; see the canonical module).
+
+The implementation is shared with jira_clone and lives in
+jira_clone/backend/controllers/sql_profiler.py, which depends only on Flask and
+SQLAlchemy. It is loaded from there, so the two apps can't drift apart.
+"""
+import importlib.util
+import os
+
+_CANONICAL = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                          'jira_clone', 'backend', 'controllers', 'sql_profiler.py')
+
+_spec = importlib.util.spec_from_file_location(__name__, _CANONICAL)
+_profiler = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_profiler)
+
+RequestProfile = _profiler.RequestProfile
+current_profile = _profiler.current_profile
+init_app = _profiler.init_app
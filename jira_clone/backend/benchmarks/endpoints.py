@@ -0,0 +1,246 @@
+"""
+Latency, throughput and SQL statement counts for the hot read endpoints, against a
+database seeded by generate_demo_data.seed_load_data, with a JSON baseline to catch
+regressions.
+
+    python benchmarks/endpoints.py                          # seeds (once) and runs against a cached SQLite file
+    python benchmarks/endpoints.py --save-baseline          # record benchmarks/baselines/endpoints.json
+    python benchmarks/endpoints.py --max-regression 15      # exit 1 if p50 grew >15% or a query was added
+    python benchmarks/endpoints.py --database-url postgresql://... --reseed --items-per-project 5000  # drops all tables
+    python benchmarks/endpoints.py --only get_items,get_item --requests 200 --json
+
+Requests go through the Flask test client, one at a time and endpoints in turn, so
+throughput is for a single worker and includes routing, auth and serialization but not the network.
+Statement counts come from the SQL profiler's X-Query-Count header and must not grow
+at all; the median latency may grow by --max-regression percent (and --min-delta-ms,
+so that a 3 ms endpoint doesn't fail on noise). p95 is reported but never fails a run:
+at a few hundred requests it is set by a handful of GC pauses. Timings only compare
+on the same machine, so record the baseline where the comparisons will run.
+
+The data set, including the --today its dates are generated around, is part of the
+baseline; a baseline recorded on a different data set is not compared against.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+DEFAULT_BASELINE = os.path.join(BACKEND, 'benchmarks', 'baselines', 'endpoints.json')
+# Generated dates are relative to this day, so every run seeds the same rows
+DEFAULT_TODAY = '2026-01-01'
+
+# name -> URL template; filled from the fixture picked in _fixture()
+ENDPOINTS = {
+    'get_items': '/items/projects/{project_id}/items',
+    'get_item': '/items/{item_id}',
+    'get_project_report': '/reports/project/{project_id}',
+    'get_my_tasks': '/items/my-tasks',
+    'get_notifications': '/notifications',
+    'get_user': '/users/{user_id}',
+    'get_columns': '/projects/{project_id}/columns',
+    'get_board': '/projects/{project_id}/board',
+}
+
+
+def _dataset(args):
+    return {'users': args.users, 'projects': args.projects, 'items_per_project': args.items_per_project,
+            'comments_per_item': args.comments_per_item, 'seed': args.seed, 'today': args.today.isoformat()}
+
+
+def _database_url(args):
+    if args.database_url:
+        return args.database_url
+    # One cached file per data set; seeding is the slow part
+    name = 'jira-bench-{users}-{projects}-{items_per_project}-{comments_per_item}-{seed}-{today}.db'.format(
+        **_dataset(args))
+    return 'sqlite:///' + os.path.join(tempfile.gettempdir(), name)
+
+
+def _seed_if_needed(args):
+    """
+    Seeding drops every table, so it only happens on its own for the cached temp file; a
+    --database-url that doesn't already hold the data set needs an explicit --reseed.
+    """
+    from sqlalchemy import inspect
+    from models.db import db
+    from models.user import User
+    from generate_demo_data import reset_db, seed_data, seed_load_data
+    # The last generated user exists only once the whole data set has been written
+    seeded = inspect(db.engine).has_table(User.__table__.name) \
+        and db.session.query(User.id).filter_by(username=f'user{args.users}').first() is not None
+    if not seeded and not args.reseed and args.database_url:
+        raise SystemExit(f'{args.database_url} does not hold this data set (no user{args.users}); '
+                         'pass --reseed to drop all its tables and seed it')
+    if args.reseed or not seeded:
+        print(f"seeding {args.users} users, {args.projects} projects x {args.items_per_project} items ...",
+              file=sys.stderr)
+        reset_db()
+        seed_data()
+        counts = seed_load_data(args.users, args.projects, args.items_per_project, args.comments_per_item,
+                                seed=args.seed, today=args.today, log=lambda line: print(line, file=sys.stderr))
+        print(f"seeded in {counts['seconds']}s", file=sys.stderr)
+
+
+def _fixture():
+    """The biggest generated project, its owner and its most-commented item (any item without comments)."""
+    from sqlalchemy import func
+    from models.db import db
+    from models.item import Item
+    from models.comment import Comment
+    from models.project import Project
+    from models.user import User
+    project_id, owner_id = db.session.query(Project.id, Project.owner_id).join(Item, Item.project_id == Project.id) \
+        .group_by(Project.id, Project.owner_id).order_by(func.count(Item.id).desc(), Project.id).first()
+    item_id = db.session.query(Item.id).outerjoin(Comment, Comment.item_id == Item.id) \
+        .filter(Item.project_id == project_id) \
+        .group_by(Item.id).order_by(func.count(Comment.id).desc(), Item.id).limit(1).scalar()
+    email = db.session.query(User.email).filter_by(id=owner_id).scalar()
+    return {'project_id': project_id, 'user_id': owner_id, 'item_id': item_id, 'email': email}
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def _measure(client, urls, headers, requests, warmup):
+    """{name: metrics}. Endpoints take turns, so a burst of machine noise lands on all of them alike."""
+    timings = {name: [] for name in urls}
+    statements = {name: [] for name in urls}
+    sizes = {}
+    for round_ in range(warmup + requests):
+        for name, url in urls.items():
+            start = time.perf_counter()
+            response = client.get(url, headers=headers)
+            elapsed = (time.perf_counter() - start) * 1000
+            if response.status_code != 200:
+                raise RuntimeError(f'GET {url} returned {response.status_code}: {response.get_data(as_text=True)[:200]}')
+            if round_ >= warmup:
+                timings[name].append(elapsed)
+                statements[name].append(int(response.headers.get('X-Query-Count', 0)))
+                sizes[name] = len(response.get_data())
+    return {name: {
+        'p50_ms': round(statistics.median(timings[name]), 3),
+        'p95_ms': round(_percentile(timings[name], 95), 3),
+        'mean_ms': round(statistics.fmean(timings[name]), 3),
+        'rps': round(len(timings[name]) / (sum(timings[name]) / 1000), 1),
+        'statements': max(statements[name]),
+        'bytes': sizes[name],
+    } for name in urls}
+
+
+def compare(results, baseline, max_regression, min_delta_ms):
+    """Regression messages for results against a baseline's results (empty when within limits)."""
+    failures = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        # Medians only: p95 over a benchmark-sized sample is too noisy to gate on
+        limit = base['p50_ms'] * (1 + max_regression / 100)
+        if result['p50_ms'] > limit and result['p50_ms'] - base['p50_ms'] > min_delta_ms:
+            failures.append(f"{name}: p50_ms {result['p50_ms']:.2f} ms vs baseline {base['p50_ms']:.2f} ms "
+                            f"(+{(result['p50_ms'] / base['p50_ms'] - 1) * 100:.0f}%, limit {max_regression:g}%)")
+        if result['statements'] > base['statements']:
+            failures.append(f"{name}: {result['statements']} SQL statements vs baseline {base['statements']}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    data = parser.add_argument_group('data set (see generate_demo_data.py)')
+    data.add_argument('--users', type=int, default=2000)
+    data.add_argument('--projects', type=int, default=20)
+    data.add_argument('--items-per-project', type=int, default=2000)
+    data.add_argument('--comments-per-item', type=int, default=3)
+    data.add_argument('--seed', type=int, default=42)
+    data.add_argument('--today', type=date.fromisoformat, default=date.fromisoformat(DEFAULT_TODAY),
+                      help=f'Date the generated history ends on (default {DEFAULT_TODAY})')
+    parser.add_argument('--database-url', default=None, help='Defaults to a cached SQLite file in the temp dir')
+    parser.add_argument('--reseed', action='store_true', help='Drop and seed the database even if it looks seeded')
+    parser.add_argument('--requests', type=int, default=100, help='Timed requests per endpoint')
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--only', default=None, help=f"Comma-separated subset of: {', '.join(ENDPOINTS)}")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='Write this run as the new baseline')
+    parser.add_argument('--max-regression', type=float, default=20.0, help='Allowed p50 growth, percent')
+    parser.add_argument('--min-delta-ms', type=float, default=2.0, help='Ignore latency growth smaller than this')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+    names = args.only.split(',') if args.only else list(ENDPOINTS)
+    unknown = set(names) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+
+    from app import create_app
+    from config import Config
+    from models.db import db
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': _database_url(args), 'TESTING': True, 'LOG_LEVEL': 'ERROR',
+        'SECRET_KEY': 'benchmark-only-secret-key-of-32-bytes',
+        'SQL_PROFILING': True, 'SQL_SLOW_REQUEST_MS': float('inf'), 'SQL_SLOW_QUERY_MS': float('inf'),
+        # Production caching, not the testing config's disabled permission cache
+        'PERMISSION_CACHE_SIZE': Config.PERMISSION_CACHE_SIZE,
+    })
+    with app.app_context():
+        _seed_if_needed(args)
+        fixture = _fixture()
+        db.session.remove()
+    client = app.test_client()
+    response = client.post('/login', json={'email': fixture['email'], 'password': 'password123'})
+    headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+    urls = {name: ENDPOINTS[name].format(**fixture) for name in names}
+    results = _measure(client, urls, headers, args.requests, args.warmup)
+
+    baseline = None
+    if not os.path.exists(args.baseline) and not args.save_baseline:
+        print(f'no baseline at {args.baseline}; record one with --save-baseline', file=sys.stderr)
+    elif not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('dataset') != _dataset(args):
+            print(f"baseline {args.baseline} was recorded on a different data set {baseline.get('dataset')}; "
+                  'not comparing', file=sys.stderr)
+            baseline = None
+    failures = compare(results, baseline['results'], args.max_regression, args.min_delta_ms) if baseline else []
+
+    if args.json:
+        print(json.dumps({'dataset': _dataset(args), 'requests': args.requests, 'results': results,
+                          'failures': failures}))
+    else:
+        print(f"{args.requests} requests per endpoint, project {fixture['project_id']}, "
+              f"user {fixture['user_id']}, item {fixture['item_id']}")
+        print(f"  {'endpoint':20} {'p50 ms':>9} {'p95 ms':>9} {'req/s':>8} {'SQL':>5} {'KiB':>7}  "
+              "vs baseline p50 (p95)")
+        for name, r in results.items():
+            base = baseline['results'].get(name) if baseline else None
+            change = '-'
+            if base:
+                change = f"{(r['p50_ms'] / base['p50_ms'] - 1) * 100:+.0f}% " \
+                         f"({(r['p95_ms'] / base['p95_ms'] - 1) * 100:+.0f}%)"
+            print(f"  {name:20} {r['p50_ms']:9.2f} {r['p95_ms']:9.2f} {r['rps']:8.0f} {r['statements']:5d} "
+                  f"{r['bytes'] / 1024:7.1f}  {change}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump({'dataset': _dataset(args), 'requests': args.requests, 'results': results}, f, indent=2,
+                      sort_keys=True)
+            f.write('\n')
+        print(f'baseline written to {args.baseline}', file=sys.stderr)
+    for failure in failures:
+        print(f'REGRESSION {failure}', file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Item-list serialization: the previous path (ORM instances -> hand-built dicts -> Flask's
+stdlib jsonify) against Serializer rows, with the stdlib and the orjson provider.
+
+    python benchmarks/serialization.py                  # 10k items, in-memory SQLite
+    python benchmarks/serialization.py --items 50000 --repeat 7
+    python benchmarks/serialization.py --database-url postgresql://...   # an empty scratch DB
+
+Each timing covers the query, building the payload and encoding the response body.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _seed(items):
+    from sqlalchemy import insert
+    from models.db import db
+    from models.item import Item
+    from generate_demo_data import seed_data
+    seed_data()
+    now = datetime.utcnow()
+    rows = [{
+        'title': f'Benchmark item {n}', 'description': 'x' * 80, 'type': 'task',
+        'status': ('todo', 'inprogress', 'inreview', 'done')[n % 4], 'priority': ('Low', 'Medium', 'High')[n % 3],
+        'project_id': 1, 'column_id': 1, 'reporter_id': 2, 'assignee_id': 3 if n % 2 else None,
+        'due_date': (now + timedelta(days=n % 30)).date(), 'created_at': now, 'updated_at': now,
+    } for n in range(items)]
+    db.session.execute(insert(Item), rows)
+    db.session.commit()
+
+
+def _legacy(app):
+    from flask.json.provider import DefaultJSONProvider
+    from models.item import Item
+    provider = DefaultJSONProvider(app)
+
+    def run():
+        items = Item.query.filter_by(project_id=1).order_by(Item.created_at, Item.id).all()
+        result = [{
+            'id': i.id,
+            'title': i.title,
+            'status': i.status,
+            'assignee_id': i.assignee_id,
+            'priority': i.priority,
+            'due_date': i.due_date.isoformat() if i.due_date else None,
+            'parent_id': i.parent_id,
+            'type': i.type
+        } for i in items]
+        return provider.response({'items': result}).get_data()
+    return run
+
+
+def _declared(app, provider):
+    from models.db import db
+    from models.item import Item
+    from controllers.serialization import ITEM_LIST
+
+    def run():
+        rows = ITEM_LIST.query(Item).filter_by(project_id=1).order_by(Item.created_at, Item.id).all()
+        body = provider.response({'items': ITEM_LIST.dump_many(rows)}).get_data()
+        # Row-only queries leave nothing in the identity map, but keep runs comparable
+        db.session.expunge_all()
+        return body
+    return run
+
+
+def _time(fn, repeat):
+    from models.db import db
+    timings = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        body = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), len(body)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--database-url', default='sqlite://')
+    args = parser.parse_args(argv)
+
+    from app import create_app
+    from flask.json.provider import DefaultJSONProvider
+    from models.db import db
+    from controllers.serialization import OrjsonProvider, orjson
+    app = create_app({'SQLALCHEMY_DATABASE_URI': args.database_url, 'TESTING': True, 'LOG_LEVEL': 'WARNING'})
+    with app.app_context():
+        db.create_all()
+        _seed(args.items)
+        cases = [
+            ('ORM + dicts + stdlib json (before)', _legacy(app)),
+            ('Serializer rows + stdlib json', _declared(app, DefaultJSONProvider(app))),
+        ]
+        if orjson is not None:
+            cases.append(('Serializer rows + orjson', _declared(app, OrjsonProvider(app))))
+        else:
+            print('orjson not installed; skipping the orjson case')
+        baseline = None
+        print(f'{args.items} items, median of {args.repeat} runs')
+        for name, fn in cases:
+            ms, size = _time(fn, args.repeat)
+            baseline = baseline or ms
+            print(f'  {name:38} {ms:9.1f} ms  {baseline / ms:5.2f}x  {size / 1024:8.0f} KiB')
+        db.session.remove()
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Cold-start benchmark: how long a fresh interpreter takes to import the app module and to
+build an app with create_app(), plus the slowest imports as reported by -X importtime.
+
+    python benchmarks/startup.py                 # 5 runs, testing config
+    python benchmarks/startup.py --runs 10 --config production --top 15
+    python benchmarks/startup.py --max-ms 1500   # exit 1 if create_app is slower (CI guard)
+    python benchmarks/startup.py --json          # one JSON line, for tracking over time
+
+Every run is a new process, so nothing is shared through sys.modules or .pyc warm-up
+beyond what a freshly forked gunicorn worker would see.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = """
+import time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+app.create_app({config!r})
+t2 = time.perf_counter()
+print('%f %f' % ((t1 - t0) * 1000, (t2 - t1) * 1000))
+"""
+
+
+def _run_once(config):
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', _PROBE.format(config=config)],
+                          cwd=BACKEND, capture_output=True, text=True, check=True)
+    import_ms, create_ms = map(float, proc.stdout.split()[-2:])
+    return import_ms, create_ms, _parse_importtime(proc.stderr)
+
+
+def _parse_importtime(stderr):
+    """{module: cumulative microseconds} from `import time: self | cumulative | name` lines."""
+    modules = {}
+    for line in stderr.splitlines():
+        fields = line[len('import time:'):].split('|')
+        if not line.startswith('import time:') or len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        # Nested imports keep their indentation
+        modules[fields[2][1:].rstrip()] = int(fields[1])
+    return modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--config', default='testing', help='config name passed to create_app')
+    parser.add_argument('--top', type=int, default=10, help='slowest top-level imports to list')
+    parser.add_argument('--max-ms', type=float, default=None, help='fail if median import+create_app exceeds this')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    runs = [_run_once(args.config) for _ in range(args.runs)]
+    import_ms = statistics.median(r[0] for r in runs)
+    create_ms = statistics.median(r[1] for r in runs)
+    # importtime lists nested imports indented; top-level ones show where the time goes
+    last = runs[-1][2]
+    top = sorted(((us, name) for name, us in last.items() if not name.startswith(' ')), reverse=True)[:args.top]
+    result = {
+        'runs': args.runs,
+        'config': args.config,
+        'import_app_ms': round(import_ms, 1),
+        'create_app_ms': round(create_ms, 1),
+        'total_ms': round(import_ms + create_ms, 1),
+        'slowest_imports_ms': {name: round(us / 1000, 1) for us, name in top},
+    }
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print(f"{args.runs} cold starts ({args.config}), median:")
+        print(f"  import app     {result['import_app_ms']:8.1f} ms")
+        print(f"  create_app()   {result['create_app_ms']:8.1f} ms")
+        print(f"  total          {result['total_ms']:8.1f} ms")
+        print('slowest top-level imports (cumulative, last run):')
+        for name, ms in result['slowest_imports_ms'].items():
+            print(f'  {ms:8.1f} ms  {name}')
+    if args.max_ms is not None and result['total_ms'] > args.max_ms:
+        print(f"startup {result['total_ms']} ms exceeds --max-ms {args.max_ms}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
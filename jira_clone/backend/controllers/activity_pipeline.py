@@ -0,0 +1,135 @@
+import atexit
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from sqlalchemy import event, insert
+from models.db import db
+from models.activity_log import ActivityLog
+from controllers.event_broker import event_broker, project_channel
+
+logger = logging.getLogger(__name__)
+
+_SESSION_KEY = 'pending_activity_logs'
+
+
+class ActivityPipeline:
+    """
+    Buffers ActivityLog rows and writes them with multi-row INSERTs.
+
+    Rows are staged on the current session and dropped if it rolls back. In 'transaction'
+    mode (default) they are inserted right before the session commits, so an edit and its
+    log entries share one commit. In 'queue' mode they are handed, once the session has
+    committed, to a background thread that inserts them every ACTIVITY_LOG_FLUSH_INTERVAL
+    seconds or ACTIVITY_LOG_FLUSH_SIZE rows, whichever comes first, and that is drained on
+    shutdown. Both modes insert rows in the order they were logged.
+    """
+
+    def __init__(self):
+        self.mode = 'transaction'
+        self.flush_size = 100
+        self.flush_interval = 2.0
+        self._app = None
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._worker = None
+        self._stopping = False
+
+    def init_app(self, app):
+        self._app = app
+        self.mode = app.config.get('ACTIVITY_LOG_MODE', self.mode)
+        self.flush_size = app.config.get('ACTIVITY_LOG_FLUSH_SIZE', self.flush_size)
+        self.flush_interval = app.config.get('ACTIVITY_LOG_FLUSH_INTERVAL', self.flush_interval)
+        if self.mode == 'queue' and self._worker is None:
+            self._worker = threading.Thread(target=self._run, name='activity-log-flusher', daemon=True)
+            self._worker.start()
+            atexit.register(self.shutdown)
+
+    def log(self, item_id, user_id, action, details=None, project_id=None):
+        row = {
+            'item_id': item_id,
+            'user_id': int(user_id),
+            'action': action,
+            'details': details,
+            'created_at': datetime.utcnow(),
+        }
+        pending = db.session.info.setdefault(_SESSION_KEY, [])
+        pending.append(row)
+        if project_id:
+            event_broker.publish_after_commit(project_channel(project_id), dict(
+                row, type='activity', project_id=int(project_id), created_at=row['created_at'].isoformat()))
+        if len(pending) >= self.flush_size and not self._queued:
+            self.flush_session(db.session)
+
+    @property
+    def _queued(self):
+        return self.mode == 'queue' and self._worker is not None
+
+    def flush_session(self, session):
+        pending = session.info.pop(_SESSION_KEY, None)
+        if pending:
+            session.flush()
+            for start in range(0, len(pending), self.flush_size):
+                session.execute(insert(ActivityLog), pending[start:start + self.flush_size])
+
+    def enqueue_session(self, session):
+        pending = session.info.pop(_SESSION_KEY, None)
+        if pending:
+            with self._cond:
+                self._queue.extend(pending)
+                if len(self._queue) >= self.flush_size:
+                    self._cond.notify()
+
+    def flush_queue(self):
+        with self._cond:
+            rows = list(self._queue)
+            self._queue.clear()
+        if not rows:
+            return 0
+        with self._app.app_context():
+            try:
+                for start in range(0, len(rows), self.flush_size):
+                    db.session.execute(insert(ActivityLog), rows[start:start + self.flush_size])
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                logger.exception('Dropped %d activity log rows after a failed flush', len(rows))
+                return 0
+        return len(rows)
+
+    def shutdown(self):
+        self._stopping = True
+        with self._cond:
+            self._cond.notify()
+        if self._worker is not None:
+            self._worker.join(timeout=self.flush_interval + 5)
+            self._worker = None
+        if self._app is not None:
+            self.flush_queue()
+
+    def _run(self):
+        while not self._stopping:
+            with self._cond:
+                if len(self._queue) < self.flush_size:
+                    self._cond.wait(self.flush_interval)
+            self.flush_queue()
+
+
+activity_pipeline = ActivityPipeline()
+
+
+@event.listens_for(db.session, 'before_commit')
+def _flush_pending_activity(session):
+    if not activity_pipeline._queued:
+        activity_pipeline.flush_session(session)
+
+
+@event.listens_for(db.session, 'after_commit')
+def _enqueue_pending_activity(session):
+    if activity_pipeline._queued:
+        activity_pipeline.enqueue_session(session)
+
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def _discard_pending_activity(session, previous_transaction):
+    session.info.pop(_SESSION_KEY, None)
@@ -1,14 +1,80 @@
-from flask import request, jsonify
+import hashlib
+from flask import request, jsonify, Response
+from sqlalchemy import select, func, true
 from models.db import db
 from models.board_column import BoardColumn
+from models.item import Item
 from controllers.rbac import require_project_permission
+from controllers.db_router import read_replica
 
 @require_project_permission('view_tasks')
 def get_columns(project_id):
-    columns = BoardColumn.query.filter_by(project_id=project_id).order_by(BoardColumn.order.asc()).all()
-    result = [{'id': c.id, 'name': c.name, 'order': c.order} for c in columns]
+    columns = BoardColumn.query.filter_by(project_id=project_id) \
+        .order_by(BoardColumn.rank.asc().nulls_last(), BoardColumn.order.asc(), BoardColumn.id.asc()).all()
+    result = [{'id': c.id, 'name': c.name, 'order': c.order, 'rank': c.rank} for c in columns]
     return jsonify({'columns': result})
 
+def board_etag(project_id):
+    """
+    Strong validator for a project's board: row counts plus latest updated_at of its
+    columns and items. Any insert, update or delete moves at least one of them.
+    """
+    columns = select(func.count(BoardColumn.id).label('n'), func.max(BoardColumn.updated_at).label('latest')) \
+        .where(BoardColumn.project_id == project_id).subquery()
+    items = select(func.count(Item.id).label('n'), func.max(Item.updated_at).label('latest')) \
+        .where(Item.project_id == project_id).subquery()
+    # Two single-row aggregates cross-joined: one round trip
+    column_count, column_updated, item_count, item_updated = db.session.execute(
+        select(columns.c.n, columns.c.latest, items.c.n, items.c.latest)
+        .select_from(columns.join(items, true()))).one()
+    key = f'{project_id}:{column_count}:{column_updated}:{item_count}:{item_updated}'
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def _card(item):
+    return {
+        'id': item.id,
+        'title': item.title,
+        'status': item.status,
+        'type': item.type,
+        'priority': item.priority,
+        'assignee_id': item.assignee_id,
+        'parent_id': item.parent_id,
+        'due_date': item.due_date.isoformat() if item.due_date else None,
+        'rank': item.rank,
+    }
+
+
+def load_board(project_id):
+    # One LEFT JOIN ordered by column then card; grouped into columns while reading
+    rows = db.session.query(BoardColumn, Item) \
+        .outerjoin(Item, (Item.column_id == BoardColumn.id) & (Item.project_id == project_id)) \
+        .filter(BoardColumn.project_id == project_id) \
+        .order_by(BoardColumn.rank.asc().nulls_last(), BoardColumn.order.asc(), BoardColumn.id.asc(),
+                  Item.rank.asc().nulls_last(), Item.created_at.asc(), Item.id.asc()) \
+        .all()
+    columns = []
+    for column, item in rows:
+        if not columns or columns[-1]['id'] != column.id:
+            columns.append({'id': column.id, 'name': column.name, 'order': column.order, 'rank': column.rank, 'items': []})
+        if item is not None:
+            columns[-1]['items'].append(_card(item))
+    return columns
+
+
+@read_replica
+@require_project_permission('view_tasks')
+def get_board(project_id):
+    etag = board_etag(project_id)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify({'project_id': project_id, 'columns': load_board(project_id)})
+    response.set_etag(etag)
+    # Clients may keep the copy but must revalidate on every poll
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
 @require_project_permission('manage_project')
 def create_column(project_id):
     data = request.get_json()
@@ -0,0 +1,283 @@
+from collections import Counter, defaultdict
+from datetime import datetime
+from flask import request, jsonify
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import insert, update
+from models.db import db
+from models.item import Item, ITEM_STATUSES, ITEM_TYPES, ITEM_PRIORITIES
+from models.user import User
+from models.board_column import BoardColumn
+from controllers.rbac import has_permission
+from controllers.activity_pipeline import activity_pipeline
+from controllers.notification_controller import send_notifications
+from controllers.project_stats import count_rows, apply_deltas
+from controllers.timeseries import insert_status_events
+from controllers.search import reindex_items
+from controllers.ranking import last_rank, rank_after
+from controllers.deletion import delete_items
+
+MAX_OPERATIONS = 1000
+
+ALLOWED_STATUS = set(ITEM_STATUSES)
+ALLOWED_TYPES = set(ITEM_TYPES)
+ALLOWED_PRIORITY = set(ITEM_PRIORITIES) | {None}
+UPDATABLE = ('title', 'description', 'status', 'assignee_id', 'priority', 'type', 'severity', 'estimate', 'due_date')
+# Every create row carries all of these (None when not given), so count_rows and the INSERT see one shape
+_CREATE_KEYS = UPDATABLE + ('parent_id', 'project_id', 'column_id', 'reporter_id', 'rank', 'created_at', 'updated_at')
+# Op fields that must be integer ids
+_ID_FIELDS = ('id', 'project_id', 'column_id', 'assignee_id', 'parent_id')
+# Item fields that must be strings when given (None clears the optional ones)
+_TEXT_FIELDS = ('title', 'description', 'status', 'type', 'priority', 'severity')
+# Columns the stats/search/flow hooks care about; bulk writes bypass the flush, so they are applied here
+_ITEM_COLUMNS = (Item.id, Item.project_id, Item.title, Item.status, Item.type,
+                 Item.reporter_id, Item.assignee_id, Item.column_id)
+
+# op -> (permission, permission for the item's reporter/assignee)
+PERMISSIONS = {
+    'create': ('create_task', None),
+    'update': ('edit_any_task', 'edit_own_task'),
+    'move': ('edit_any_task', 'edit_own_task'),
+    'delete': ('delete_any_task', 'delete_own_task'),
+}
+
+
+class OperationError(ValueError):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def check_item_fields(fields):
+    """Validate item fields the way update_item does; due_date strings are parsed in place."""
+    # Wrong JSON types are reported per row/op, not left to fail in len() or a set lookup
+    for field in _TEXT_FIELDS:
+        if fields.get(field) is not None and not isinstance(fields[field], str):
+            raise OperationError(f'{field} must be a string')
+    if fields.get('estimate') is not None and (not _ids([fields['estimate']]) or fields['estimate'] < 0):
+        raise OperationError('estimate must be a non-negative integer')
+    if 'title' in fields and (not fields['title'] or len(fields['title']) > 120):
+        raise OperationError('Title required (max 120 chars)')
+    if 'status' in fields and fields['status'] not in ALLOWED_STATUS:
+        raise OperationError(f'Invalid status: {fields["status"]}')
+    if 'type' in fields and fields['type'] not in ALLOWED_TYPES:
+        raise OperationError(f'Invalid type: {fields["type"]}')
+    if 'priority' in fields and fields['priority'] not in ALLOWED_PRIORITY:
+        raise OperationError(f'Invalid priority: {fields["priority"]}')
+    if fields.get('due_date'):
+        try:
+            fields['due_date'] = datetime.strptime(fields['due_date'], '%Y-%m-%d').date()
+        except (TypeError, ValueError):
+            raise OperationError(f'Invalid due_date: {fields["due_date"]}')
+    return fields
+
+
+def _ids(values):
+    # Only well-formed ids are looked up; validate() rejects the rest per operation
+    return {v for v in values if isinstance(v, int) and not isinstance(v, bool)}
+
+
+class _Batch:
+    """Validates a list of operations and applies them with one statement per op type."""
+
+    def __init__(self, operations, user_id):
+        self.operations = operations
+        self.user_id = user_id
+        self.results = [None] * len(operations)
+        self.plans = {'create': [], 'update': [], 'move': [], 'delete': []}
+        self._allowed = {}
+        ops = [op for op in operations if isinstance(op, dict)]
+        ids = _ids(op.get('parent_id') if op.get('op') == 'create' else op.get('id') for op in ops)
+        self.items = {row.id: row for row in db.session.query(*_ITEM_COLUMNS).filter(Item.id.in_(ids))}
+        self.columns = dict(db.session.query(BoardColumn.id, BoardColumn.project_id)
+                            .filter(BoardColumn.id.in_(_ids(op.get('column_id') for op in ops))))
+        assignees = _ids(op.get('assignee_id') for op in ops)
+        self.users = {uid for (uid,) in db.session.query(User.id).filter(User.id.in_(assignees))}
+
+    def check_fields(self, fields):
+        if fields.get('assignee_id') is not None and fields['assignee_id'] not in self.users:
+            raise OperationError(f'Unknown assignee_id: {fields["assignee_id"]}')
+        return check_item_fields(fields)
+
+    def allowed(self, op, project_id, item=None):
+        # One permission lookup per distinct (project, action)
+        action, own_action = PERMISSIONS[op]
+        for act in (action, own_action):
+            if act and (project_id, act) not in self._allowed:
+                self._allowed[(project_id, act)] = has_permission(self.user_id, act, project_id=project_id)
+        if self._allowed[(project_id, action)]:
+            return True
+        return bool(own_action and item and self._allowed[(project_id, own_action)]
+                    and self.user_id in (item.reporter_id, item.assignee_id))
+
+    def validate(self):
+        seen = set()
+        for index, op in enumerate(self.operations):
+            try:
+                if not isinstance(op, dict) or not isinstance(op.get('op'), str) or op['op'] not in PERMISSIONS:
+                    raise OperationError(f"op must be one of {', '.join(PERMISSIONS)}")
+                kind = op['op']
+                for field in _ID_FIELDS:
+                    if op.get(field) is not None and not _ids([op[field]]):
+                        raise OperationError(f'{field} must be an integer')
+                if kind == 'create':
+                    plan = self._plan_create(op)
+                else:
+                    item = self.items.get(op.get('id'))
+                    if not item:
+                        raise OperationError(f'Item not found: {op.get("id")}', 404)
+                    if item.id in seen:
+                        raise OperationError(f'Item {item.id} appears in more than one operation', 409)
+                    seen.add(item.id)
+                    if not self.allowed(kind, item.project_id, item):
+                        raise OperationError(f"Forbidden: You lack '{PERMISSIONS[kind][0]}' permission.", 403)
+                    plan = getattr(self, f'_plan_{kind}')(op, item)
+                self.plans[kind].append((index, plan))
+                self.results[index] = {'index': index, 'op': kind, 'ok': True}
+            except OperationError as e:
+                self.results[index] = {'index': index, 'ok': False, 'status': e.status, 'error': e.message}
+        return all(r['ok'] for r in self.results)
+
+    def _plan_create(self, op):
+        project_id = self.columns.get(op.get('column_id'))
+        if project_id is None or project_id != op.get('project_id'):
+            raise OperationError('column_id must be a column of project_id')
+        if not self.allowed('create', project_id):
+            raise OperationError("Forbidden: You lack 'create_task' permission.", 403)
+        fields = self.check_fields({f: op[f] for f in UPDATABLE + ('parent_id',) if f in op})
+        if not fields.get('title'):
+            raise OperationError('Title required (max 120 chars)')
+        parent = self.items.get(fields.get('parent_id'))
+        if fields.get('parent_id') is not None and (not parent or parent.project_id != project_id):
+            raise OperationError(f'Parent item not found in project: {fields["parent_id"]}', 404)
+        row = dict(fields, project_id=project_id, column_id=op['column_id'], reporter_id=self.user_id)
+        row.setdefault('type', 'task')
+        row.setdefault('status', 'todo')
+        return row
+
+    def _plan_update(self, op, item):
+        fields = self.check_fields({f: op[f] for f in UPDATABLE if f in op})
+        if not fields:
+            raise OperationError(f'Nothing to update; allowed fields: {", ".join(UPDATABLE)}')
+        return item, fields
+
+    def _plan_move(self, op, item):
+        if self.columns.get(op.get('column_id')) != item.project_id:
+            raise OperationError('column_id must be a column of the item\'s project')
+        return item, op['column_id']
+
+    def _plan_delete(self, op, item):
+        return item
+
+    # --- apply ---
+    def apply(self):
+        now = datetime.utcnow()
+        self.project_deltas, self.user_deltas = Counter(), Counter()
+        self.status_events, self.reindex, self.notifications = [], set(), []
+        self.next_rank = {}
+        self._apply_creates(now)
+        self._apply_updates(now)
+        self._apply_moves(now)
+        self._apply_deletes()
+        apply_deltas(db.session, self.project_deltas, self.user_deltas)
+        insert_status_events(db.session, self.status_events)
+        reindex_items(db.session.connection(), self.reindex)
+        send_notifications(self.notifications, commit=False)
+        db.session.commit()
+
+    def _rank(self, column_id):
+        # Appends to the end of the column, one max(rank) lookup per column
+        if column_id not in self.next_rank:
+            self.next_rank[column_id] = last_rank(Item, Item.column_id, column_id)
+        self.next_rank[column_id] = rank_after(self.next_rank[column_id])
+        return self.next_rank[column_id]
+
+    def _notify_assignee(self, assignee_id, title):
+        if assignee_id:
+            self.notifications.append((assignee_id, f"You have been assigned to task '{title}'"))
+
+    def _apply_creates(self, now):
+        if not self.plans['create']:
+            return
+        rows = [{k: row.get(k) for k in _CREATE_KEYS} | {'rank': self._rank(row['column_id']),
+                                                         'created_at': now, 'updated_at': now}
+                for _, row in self.plans['create']]
+        # render_nulls keeps rows with and without e.g. an assignee in one multi-row INSERT
+        ids = db.session.execute(insert(Item).returning(Item.id, sort_by_parameter_order=True)
+                                 .execution_options(render_nulls=True), rows).scalars().all()
+        count_rows(rows, 1, self.project_deltas, self.user_deltas)
+        for (index, _), row, item_id in zip(self.plans['create'], rows, ids):
+            self.results[index]['id'] = item_id
+            self.status_events.append((row['project_id'], item_id, None, row['status']))
+            self.reindex.add(item_id)
+            self._notify_assignee(row.get('assignee_id'), row['title'])
+            activity_pipeline.log(item_id, self.user_id, 'created', f'Task created: {row["title"]}',
+                                  project_id=row['project_id'])
+
+    def _apply_updates(self, now):
+        # One executemany per distinct set of changed fields
+        groups = defaultdict(list)
+        for index, (item, fields) in self.plans['update']:
+            groups[tuple(sorted(fields))].append((item, fields))
+            old = {c: getattr(item, c) for c in ('project_id', 'status', 'type', 'reporter_id', 'assignee_id')}
+            new = dict(old, **{k: v for k, v in fields.items() if k in old})
+            count_rows([old], -1, self.project_deltas, self.user_deltas)
+            count_rows([new], 1, self.project_deltas, self.user_deltas)
+            if new['status'] != old['status']:
+                self.status_events.append((item.project_id, item.id, old['status'], new['status']))
+            if {'title', 'description'} & set(fields):
+                self.reindex.add(item.id)
+            if fields.get('assignee_id') and fields['assignee_id'] != item.assignee_id:
+                self._notify_assignee(fields['assignee_id'], fields.get('title', item.title))
+            changes = [f'{k}: {getattr(item, k)} -> {v}' if k in item._fields else f'{k} -> {v}'
+                       for k, v in fields.items() if k not in item._fields or getattr(item, k) != v]
+            activity_pipeline.log(item.id, self.user_id, 'updated', '; '.join(changes), project_id=item.project_id)
+        for entries in groups.values():
+            db.session.execute(update(Item), [dict(fields, id=item.id, updated_at=now) for item, fields in entries])
+
+    def _apply_moves(self, now):
+        if not self.plans['move']:
+            return
+        rows = []
+        for index, (item, column_id) in self.plans['move']:
+            rank = self._rank(column_id)
+            rows.append({'id': item.id, 'column_id': column_id, 'rank': rank, 'updated_at': now})
+            self.results[index]['rank'] = rank
+            if column_id != item.column_id:
+                activity_pipeline.log(item.id, self.user_id, 'updated', f'column_id: {item.column_id} -> {column_id}',
+                                      project_id=item.project_id)
+        db.session.execute(update(Item), rows)
+
+    def _apply_deletes(self):
+        # Counters, events and search documents are handled by the deletion service
+        if self.plans['delete']:
+            delete_items([item.id for _, item in self.plans['delete']])
+
+
+def bulk_items():
+    """
+    POST /items/bulk {"operations": [...], "atomic": true}
+
+        {"op": "create", "project_id": 1, "column_id": 2, "title": "...", ...}
+        {"op": "update", "id": 5, "status": "done", "assignee_id": 3, ...}
+        {"op": "move",   "id": 5, "column_id": 4}          # appended to the column
+        {"op": "delete", "id": 5}
+
+    Everything is written in one transaction. With atomic (the default) any invalid
+    operation rejects the whole batch; otherwise the valid ones are applied.
+    """
+    user_id = int(get_jwt_identity())
+    data = request.get_json() or {}
+    operations = data.get('operations')
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'error': 'operations must be a non-empty list'}), 400
+    if len(operations) > MAX_OPERATIONS:
+        return jsonify({'error': f'Too many operations (max {MAX_OPERATIONS})'}), 400
+    batch = _Batch(operations, user_id)
+    valid = batch.validate()
+    if not valid and data.get('atomic', True):
+        db.session.rollback()
+        return jsonify({'applied': 0, 'results': batch.results}), 400
+    batch.apply()
+    applied = sum(1 for r in batch.results if r['ok'])
+    return jsonify({'applied': applied, 'results': batch.results}), 200 if valid else 207
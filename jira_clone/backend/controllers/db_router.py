@@ -0,0 +1,151 @@
+"""
+Read-replica routing and connection-pool settings.
+
+Controllers decorated with @read_replica run their GET queries against one of the
+DB_REPLICA_URIS; everything else uses the primary (see models.db.RoutingSession).
+After a request commits a write, the writer reads from the primary for
+DB_REPLICA_STICKY_SECONDS so they see their own changes despite replication lag. The pin
+is kept both in a cookie (survives hopping between workers) and per JWT identity in this
+process (for clients that don't keep cookies).
+"""
+import random
+import threading
+import time
+from functools import wraps
+from flask import current_app, g, request, has_request_context
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from models.db import db
+
+STICKY_COOKIE = 'db_primary_until'
+
+_POOL_OPTIONS = {
+    'pool_size': 'DB_POOL_SIZE',
+    'max_overflow': 'DB_MAX_OVERFLOW',
+    'pool_timeout': 'DB_POOL_TIMEOUT',
+    'pool_recycle': 'DB_POOL_RECYCLE',
+    'pool_pre_ping': 'DB_POOL_PRE_PING',
+}
+
+
+class _StickyWriters:
+    """Per-process map of identity -> time until which their reads stay on the primary."""
+
+    def __init__(self):
+        self._until = {}
+        self._lock = threading.Lock()
+
+    def pin(self, identity, until):
+        with self._lock:
+            self._until[identity] = until
+            if len(self._until) > 10000:
+                now = time.time()
+                self._until = {k: v for k, v in self._until.items() if v > now}
+
+    def pinned(self, identity):
+        with self._lock:
+            return self._until.get(identity, 0) > time.time()
+
+
+sticky_writers = _StickyWriters()
+
+
+def pool_options(config, url):
+    """Engine pool kwargs from DB_POOL_* config; SQLite's pools take none of them."""
+    if make_url(url).get_backend_name() == 'sqlite':
+        return {}
+    return {option: config[key] for option, key in _POOL_OPTIONS.items() if config.get(key) is not None}
+
+
+def init_app(app):
+    """Call before db.init_app(app): sets pool options and registers replicas as binds."""
+    app.config.setdefault('DB_POOL_SIZE', 10)
+    app.config.setdefault('DB_MAX_OVERFLOW', 20)
+    app.config.setdefault('DB_POOL_TIMEOUT', 30)
+    app.config.setdefault('DB_POOL_RECYCLE', 1800)
+    app.config.setdefault('DB_POOL_PRE_PING', True)
+    app.config.setdefault('DB_REPLICA_URIS', [])
+    app.config.setdefault('DB_REPLICA_STICKY_SECONDS', 5)
+    options = app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+    for option, value in pool_options(app.config, app.config['SQLALCHEMY_DATABASE_URI']).items():
+        options.setdefault(option, value)
+    binds = app.config.setdefault('SQLALCHEMY_BINDS', {})
+    keys = []
+    for n, uri in enumerate(app.config['DB_REPLICA_URIS']):
+        key = f'replica_{n}'
+        binds[key] = dict(pool_options(app.config, uri), url=uri)
+        keys.append(key)
+    app.extensions['db_replicas'] = keys
+    app.after_request(_set_sticky_cookie)
+
+
+def _identity():
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        # No JWT verified on this request
+        return None
+
+
+def _pinned_to_primary():
+    try:
+        if float(request.cookies.get(STICKY_COOKIE, 0)) > time.time():
+            return True
+    except ValueError:
+        pass
+    identity = _identity()
+    return identity is not None and sticky_writers.pinned(str(identity))
+
+
+def read_replica(f):
+    """Route this GET controller's reads to a replica unless the caller just wrote."""
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        replicas = current_app.extensions.get('db_replicas')
+        if replicas and request.method == 'GET' and not _pinned_to_primary():
+            g.db_replica = random.choice(replicas)
+        return f(*args, **kwargs)
+    return wrapper
+
+
+def _set_sticky_cookie(response):
+    until = g.pop('db_primary_until', None)
+    if until:
+        response.set_cookie(STICKY_COOKIE, f'{until:.3f}', max_age=int(until - time.time()) + 1,
+                            httponly=True, samesite='Lax')
+    return response
+
+
+@event.listens_for(db.session, 'after_flush')
+def _note_flush(session, flush_context):
+    session.info['db_wrote'] = True
+
+
+@event.listens_for(db.session, 'do_orm_execute')
+def _note_dml(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info['db_wrote'] = True
+
+
+@event.listens_for(db.session, 'after_commit')
+def _pin_writer(session):
+    session.info.pop('db_primary', None)
+    if not session.info.pop('db_wrote', False) or not has_request_context():
+        return
+    if not current_app.extensions.get('db_replicas'):
+        return
+    # The rest of this request reads its own write too
+    g.pop('db_replica', None)
+    until = time.time() + current_app.config['DB_REPLICA_STICKY_SECONDS']
+    g.db_primary_until = until
+    identity = _identity()
+    if identity is not None:
+        sticky_writers.pin(str(identity), until)
+
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def _forget_writes(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop('db_wrote', None)
+        session.info.pop('db_primary', None)
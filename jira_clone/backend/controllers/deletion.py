@@ -0,0 +1,121 @@
+"""
+Set-based deletes for items, projects and users.
+
+Each delete is a handful of DELETE/UPDATE ... WHERE statements issued in foreign-key
+order, so no Python object is loaded per child row. Because these statements bypass the
+ORM flush, the counters, status events and search documents that the flush hooks keep
+are updated here. Every function returns {table: rows affected} and leaves the commit to
+the caller.
+"""
+from collections import Counter
+from sqlalchemy import select, delete, update, union
+from models.db import db
+from models.item import Item
+from models.comment import Comment
+from models.activity_log import ActivityLog
+from models.board_column import BoardColumn
+from models.project import Project
+from models.project_member import ProjectMember, ProjectJoinRequest
+from models.project_stats import ProjectStats, UserTaskStats
+from models.item_event import ItemStatusEvent, ProjectDailyStatus
+from models.notification import Notification
+from models.team import Team
+from models.team_member import TeamMember
+from models.user import User
+from controllers.project_stats import count_rows, apply_deltas, refresh_user_counts
+from controllers.timeseries import insert_status_events
+from controllers.search import reindex_items, remove_project_documents
+
+# Keeps IN lists under driver parameter limits
+CHUNK_SIZE = 5000
+
+
+class DeletionBlocked(Exception):
+    """The row can't be deleted until something else is reassigned first."""
+
+
+def _run(counts, key, statement):
+    counts[key] = counts.get(key, 0) + db.session.execute(statement).rowcount
+    return counts
+
+
+def delete_items(item_ids):
+    """Delete items with their comments and activity; their subtasks are detached, not deleted."""
+    ids = sorted(set(item_ids))
+    counts = {}
+    for start in range(0, len(ids), CHUNK_SIZE):
+        chunk = ids[start:start + CHUNK_SIZE]
+        rows = db.session.execute(
+            select(Item.id, Item.project_id, Item.status, Item.type, Item.reporter_id, Item.assignee_id)
+            .where(Item.id.in_(chunk))).mappings().all()
+        if not rows:
+            continue
+        chunk = [row['id'] for row in rows]
+        _run(counts, 'item (subtasks detached)', update(Item.__table__)
+             .where(Item.parent_id.in_(chunk), Item.id.notin_(chunk)).values(parent_id=None))
+        _run(counts, 'comment', delete(Comment.__table__).where(Comment.item_id.in_(chunk)))
+        _run(counts, 'activity_log', delete(ActivityLog.__table__).where(ActivityLog.item_id.in_(chunk)))
+        _run(counts, 'item', delete(Item.__table__).where(Item.id.in_(chunk)))
+        project_deltas, user_deltas = Counter(), Counter()
+        count_rows(rows, -1, project_deltas, user_deltas)
+        apply_deltas(db.session, project_deltas, user_deltas)
+        insert_status_events(db.session, [(row['project_id'], row['id'], row['status'], None) for row in rows])
+        reindex_items(db.session.connection(), chunk)
+    return counts
+
+
+def delete_project(project_id):
+    """Delete a project and everything under it; no item is loaded into Python."""
+    project_items = select(Item.id).where(Item.project_id == project_id).scalar_subquery()
+    # Users whose task counts drop with the project's items
+    involved = union(
+        select(Item.reporter_id).where(Item.project_id == project_id),
+        select(Item.assignee_id).where(Item.project_id == project_id, Item.assignee_id.isnot(None)),
+    ).subquery()
+    user_ids = [user_id for (user_id,) in db.session.execute(select(involved.c[0]))]
+    counts = {}
+    _run(counts, 'item (subtasks detached)', update(Item.__table__)
+         .where(Item.parent_id.in_(project_items), Item.project_id != project_id).values(parent_id=None))
+    _run(counts, 'activity_log', delete(ActivityLog.__table__).where(ActivityLog.item_id.in_(project_items)))
+    _run(counts, 'comment', delete(Comment.__table__).where(Comment.item_id.in_(project_items)))
+    _run(counts, 'item', delete(Item.__table__).where(Item.project_id == project_id))
+    for model in (ItemStatusEvent, ProjectDailyStatus, ProjectStats, BoardColumn, ProjectMember, ProjectJoinRequest):
+        _run(counts, model.__tablename__, delete(model.__table__).where(model.project_id == project_id))
+    remove_project_documents(db.session.connection(), project_id)
+    _run(counts, 'project', delete(Project.__table__).where(Project.id == project_id))
+    refresh_user_counts(user_ids)
+    return counts
+
+
+def delete_user(user_id):
+    """
+    Delete a user. Items they reported are handed to each project's owner, their
+    assignments are cleared, and their comments, activity and notifications go with them.
+    Raises DeletionBlocked while they still own projects or manage teams.
+    """
+    owned = db.session.query(Project.id).filter_by(owner_id=user_id).count()
+    managed = db.session.query(Team.id).filter_by(manager_id=user_id).count()
+    if owned or managed:
+        raise DeletionBlocked(f'User owns {owned} project(s) and manages {managed} team(s); transfer them first')
+    reported_projects = select(Item.project_id).where(Item.reporter_id == user_id).distinct()
+    owners = [owner_id for (owner_id,) in db.session.execute(
+        select(Project.owner_id).where(Project.id.in_(reported_projects)).distinct())]
+    commented_items = [item_id for (item_id,) in db.session.execute(
+        select(Comment.item_id).where(Comment.user_id == user_id).distinct())]
+    counts = {}
+    project_owner = select(Project.owner_id).where(Project.id == Item.project_id).scalar_subquery()
+    _run(counts, 'item (reporter reassigned)', update(Item.__table__)
+         .where(Item.reporter_id == user_id).values(reporter_id=project_owner))
+    _run(counts, 'item (unassigned)', update(Item.__table__)
+         .where(Item.assignee_id == user_id).values(assignee_id=None))
+    _run(counts, 'comment', delete(Comment.__table__).where(Comment.user_id == user_id))
+    _run(counts, 'activity_log', delete(ActivityLog.__table__).where(ActivityLog.user_id == user_id))
+    _run(counts, 'item_status_event (anonymized)', update(ItemStatusEvent.__table__)
+         .where(ItemStatusEvent.user_id == user_id).values(user_id=None))
+    for model in (Notification, TeamMember, ProjectMember, ProjectJoinRequest, UserTaskStats):
+        _run(counts, model.__tablename__, delete(model.__table__).where(model.user_id == user_id))
+    _run(counts, 'user', delete(User.__table__).where(User.id == user_id))
+    refresh_user_counts(owners)
+    for start in range(0, len(commented_items), CHUNK_SIZE):
+        reindex_items(db.session.connection(), commented_items[start:start + CHUNK_SIZE])
+    return counts
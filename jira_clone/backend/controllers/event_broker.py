@@ -0,0 +1,151 @@
+import json
+import logging
+import queue
+import threading
+from sqlalchemy import event
+from models.db import db
+
+logger = logging.getLogger(__name__)
+
+_SESSION_KEY = 'pending_events'
+
+
+class InProcessBroker:
+    """Fan-out to subscribers of this worker process only."""
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel, payload):
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        for sub in subscribers:
+            sub.put(payload)
+
+    def subscribe(self, channels):
+        sub = _QueueSubscription(self, channels, self.queue_size)
+        with self._lock:
+            for channel in channels:
+                self._channels.setdefault(channel, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            for channel in sub.channels:
+                subscribers = self._channels.get(channel)
+                if subscribers:
+                    subscribers.discard(sub)
+                    if not subscribers:
+                        del self._channels[channel]
+
+
+class _QueueSubscription:
+    def __init__(self, broker, channels, queue_size):
+        self.broker = broker
+        self.channels = list(channels)
+        self._queue = queue.Queue(maxsize=queue_size)
+
+    def put(self, payload):
+        try:
+            self._queue.put_nowait(payload)
+        except queue.Full:
+            # A stalled client must not block publishers; it can resync from the REST endpoints
+            logger.warning('Dropping event for slow subscriber on %s', self.channels)
+
+    def get(self, timeout=None):
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class RedisBroker:
+    """Pub/sub through Redis so events reach subscribers in every worker process."""
+
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('EVENT_BROKER_URL points at Redis but the redis package is not installed')
+        self._client = redis.Redis.from_url(url)
+
+    def publish(self, channel, payload):
+        self._client.publish(channel, json.dumps(payload))
+
+    def subscribe(self, channels):
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(*channels)
+        return _RedisSubscription(pubsub)
+
+
+class _RedisSubscription:
+    def __init__(self, pubsub):
+        self._pubsub = pubsub
+
+    def get(self, timeout=None):
+        message = self._pubsub.get_message(timeout=timeout)
+        if not message:
+            return None
+        return json.loads(message['data'])
+
+    def close(self):
+        self._pubsub.close()
+
+
+class EventBroker:
+    """
+    Facade used by the rest of the app. The backend is chosen from EVENT_BROKER_URL:
+    unset uses InProcessBroker, 'redis://...' uses RedisBroker. Any object with
+    publish(channel, payload) and subscribe(channels) can be plugged in with set_backend().
+    """
+
+    def __init__(self):
+        self.backend = InProcessBroker()
+
+    def init_app(self, app):
+        url = app.config.get('EVENT_BROKER_URL')
+        if url and url.startswith(('redis://', 'rediss://')):
+            self.set_backend(RedisBroker(url))
+
+    def set_backend(self, backend):
+        self.backend = backend
+
+    def publish(self, channel, payload):
+        try:
+            self.backend.publish(channel, payload)
+        except Exception:
+            logger.exception('Failed to publish event on %s', channel)
+
+    def subscribe(self, channels):
+        return self.backend.subscribe(channels)
+
+    def publish_after_commit(self, channel, payload):
+        """Publish once the current DB session commits; dropped if it rolls back."""
+        db.session.info.setdefault(_SESSION_KEY, []).append((channel, payload))
+
+
+event_broker = EventBroker()
+
+
+def user_channel(user_id):
+    return f'user:{int(user_id)}'
+
+
+def project_channel(project_id):
+    return f'project:{int(project_id)}'
+
+
+@event.listens_for(db.session, 'after_commit')
+def _publish_pending_events(session):
+    for channel, payload in session.info.pop(_SESSION_KEY, ()):
+        event_broker.publish(channel, payload)
+
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def _discard_pending_events(session, previous_transaction):
+    session.info.pop(_SESSION_KEY, None)
@@ -0,0 +1,90 @@
+"""
+Streaming project exports for BI jobs.
+
+GET /projects/<id>/export?format=ndjson|csv&data=items|activity
+
+Rows come off a server-side cursor (yield_per) and are written to the response as they
+arrive, so memory stays flat however big the project is. The body is gzipped on the fly
+when the client accepts it.
+"""
+import csv
+import io
+import zlib
+from flask import Response, current_app, request, jsonify, stream_with_context
+from models.item import Item
+from models.activity_log import ActivityLog
+from controllers.rbac import require_project_permission
+from controllers.db_router import read_replica
+from controllers.serialization import ITEM_EXPORT, ACTIVITY_EXPORT
+
+# Rows fetched per round trip, and bytes buffered before a chunk is sent/compressed
+BATCH_SIZE = 1000
+CHUNK_BYTES = 64 * 1024
+
+FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+
+def _rows(data, project_id):
+    if data == 'items':
+        query = ITEM_EXPORT.query(Item).filter(Item.project_id == project_id).order_by(Item.id)
+        return ITEM_EXPORT, query.yield_per(BATCH_SIZE)
+    query = ACTIVITY_EXPORT.query(ActivityLog).join(Item, Item.id == ActivityLog.item_id) \
+        .filter(Item.project_id == project_id).order_by(ActivityLog.id)
+    return ACTIVITY_EXPORT, query.yield_per(BATCH_SIZE)
+
+
+def _ndjson(serializer, rows):
+    dumps = current_app.json.dumps
+    for row in rows:
+        yield dumps(serializer.dump(row)) + '\n'
+
+
+def _csv(serializer, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(serializer.fields)
+    # The header goes out on its own, so an empty export is still a valid CSV
+    yield buffer.getvalue()
+    for row in rows:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(serializer.dump(row).values())
+        yield buffer.getvalue()
+
+
+def _chunked(lines, compress):
+    # Group lines into ~CHUNK_BYTES writes; gzip is a single stream across chunks
+    gzip = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    pending, size = [], 0
+    for line in lines:
+        data = line.encode()
+        pending.append(data)
+        size += len(data)
+        if size >= CHUNK_BYTES:
+            chunk = b''.join(pending)
+            pending, size = [], 0
+            chunk = gzip.compress(chunk) if gzip else chunk
+            if chunk:
+                yield chunk
+    chunk = b''.join(pending)
+    yield gzip.compress(chunk) + gzip.flush() if gzip else chunk
+
+
+@read_replica
+@require_project_permission('view_tasks')
+def export_project(project_id):
+    fmt = request.args.get('format', 'ndjson')
+    data = request.args.get('data', 'items')
+    if fmt not in FORMATS:
+        return jsonify({'error': f"format must be one of {', '.join(FORMATS)}"}), 400
+    if data not in ('items', 'activity'):
+        return jsonify({'error': 'data must be items or activity'}), 400
+    serializer, rows = _rows(data, project_id)
+    lines = _ndjson(serializer, rows) if fmt == 'ndjson' else _csv(serializer, rows)
+    compress = 'gzip' in request.headers.get('Accept-Encoding', '')
+    response = Response(stream_with_context(_chunked(lines, compress)), mimetype=FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename=project-{project_id}-{data}.{fmt}'
+    response.headers['Vary'] = 'Accept-Encoding'
+    if compress:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
@@ -0,0 +1,162 @@
+from flask import request, jsonify
+from sqlalchemy import select, func, case, literal, exists
+from sqlalchemy.orm import aliased
+from models.db import db
+from models.item import Item
+from controllers.rbac import require_project_permission
+
+DEFAULT_DEPTH = 10
+MAX_DEPTH = 25
+
+
+def _depth_arg():
+    try:
+        depth = int(request.args.get('depth', DEFAULT_DEPTH))
+    except ValueError:
+        depth = DEFAULT_DEPTH
+    return max(0, min(depth, MAX_DEPTH))
+
+
+def _done():
+    return case((Item.status == 'done', 1), else_=0)
+
+
+def load_subtree(item_id, max_depth=DEFAULT_DEPTH):
+    """
+    Every item under `item_id` (itself included) down to `max_depth` levels, with per-node
+    roll-ups over its own subtree, in a single WITH RECURSIVE statement.
+    Returns flat rows ordered by depth, or [] if the item doesn't exist. Each item appears
+    once, at its shallowest depth, even if bad data has formed a parent cycle.
+    """
+    root = select(Item.id, Item.project_id, literal(0).label('depth')) \
+        .where(Item.id == item_id).cte('walk', recursive=True)
+    child = aliased(Item)
+    walk = root.union_all(
+        select(child.id, child.project_id, (root.c.depth + 1).label('depth'))
+        .join(root, child.parent_id == root.c.id)
+        # Children filed under another project are not visible through this one
+        .where(root.c.depth < max_depth, child.project_id == root.c.project_id)
+    )
+    # A cycle makes the walk revisit ids until the depth cap; keep the first visit
+    tree = select(walk.c.id, func.min(walk.c.depth).label('depth')).group_by(walk.c.id).cte('tree')
+    # Closure pairs (ancestor, descendant) inside the loaded tree, so each node gets its own roll-up.
+    # UNION (not ALL) drops repeated pairs, so this ends on its own even around a cycle.
+    anchor = select(tree.c.id.label('ancestor_id'), tree.c.id.label('item_id')).cte('closure', recursive=True)
+    below = aliased(Item)
+    closure = anchor.union(
+        select(anchor.c.ancestor_id, below.id)
+        .join(anchor, below.parent_id == anchor.c.item_id)
+        .join(tree, tree.c.id == below.id)
+    )
+    rolled = select(
+        closure.c.ancestor_id,
+        func.count().label('total'),
+        func.sum(_done()).label('done'),
+        func.coalesce(func.sum(Item.estimate), 0).label('estimate_total'),
+        func.coalesce(func.sum(case((Item.status == 'done', Item.estimate), else_=0)), 0).label('estimate_done'),
+    ).join(Item, Item.id == closure.c.item_id).group_by(closure.c.ancestor_id).subquery('rolled')
+    # Nodes at the depth limit that still have children are reported as truncated
+    grandchild = aliased(Item)
+    has_children = exists().where(grandchild.parent_id == Item.id)
+    query = select(
+        Item.id, Item.parent_id, Item.title, Item.type, Item.status, Item.priority,
+        Item.assignee_id, Item.due_date, Item.estimate, tree.c.depth,
+        rolled.c.total, rolled.c.done, rolled.c.estimate_total, rolled.c.estimate_done,
+        has_children.label('has_children'),
+    ).join(tree, tree.c.id == Item.id) \
+        .join(rolled, rolled.c.ancestor_id == Item.id) \
+        .order_by(tree.c.depth, Item.id)
+    return db.session.execute(query).all()
+
+
+def load_ancestors(item_id, max_depth=MAX_DEPTH):
+    """The parent chain of `item_id`, root first, as one WITH RECURSIVE statement."""
+    start = select(Item.id, Item.parent_id, literal(0).label('depth')) \
+        .where(Item.id == item_id).cte('chain', recursive=True)
+    parent = aliased(Item)
+    chain = start.union_all(
+        select(parent.id, parent.parent_id, (start.c.depth + 1).label('depth'))
+        .join(start, parent.id == start.c.parent_id)
+        .where(start.c.depth < max_depth)
+    )
+    query = select(Item.id, Item.parent_id, Item.title, Item.type, Item.status, Item.project_id, chain.c.depth) \
+        .join(chain, chain.c.id == Item.id) \
+        .where(chain.c.depth > 0) \
+        .order_by(chain.c.depth.desc())
+    return db.session.execute(query).all()
+
+
+def would_create_cycle(item_id, new_parent_id):
+    """
+    True if making `new_parent_id` the parent of `item_id` would put the item under itself.
+    Walks the whole parent chain, however deep (UNION stops at an existing cycle).
+    """
+    if new_parent_id is None:
+        return False
+    if int(new_parent_id) == int(item_id):
+        return True
+    start = select(Item.id, Item.parent_id).where(Item.id == new_parent_id).cte('chain', recursive=True)
+    parent = aliased(Item)
+    chain = start.union(select(parent.id, parent.parent_id).join(start, parent.id == start.c.parent_id))
+    return db.session.execute(select(exists().where(chain.c.id == int(item_id)))).scalar()
+
+
+def _progress(total, done, estimate_total, estimate_done):
+    # Estimate-weighted when estimates exist, otherwise by item count
+    if estimate_total:
+        percent = 100.0 * estimate_done / estimate_total
+    else:
+        percent = 100.0 * done / total if total else 0.0
+    return {
+        'total': total,
+        'done': int(done or 0),
+        'estimate_total': int(estimate_total or 0),
+        'estimate_done': int(estimate_done or 0),
+        'percent_done': round(percent, 1),
+    }
+
+
+@require_project_permission('view_tasks')
+def get_item_tree(item_id):
+    max_depth = _depth_arg()
+    rows = load_subtree(item_id, max_depth)
+    if not rows:
+        return jsonify({'error': f'Item not found: {item_id}'}), 404
+    nodes = {}
+    for row in rows:
+        nodes[row.id] = {
+            'id': row.id,
+            'parent_id': row.parent_id,
+            'title': row.title,
+            'type': row.type,
+            'status': row.status,
+            'priority': row.priority,
+            'assignee_id': row.assignee_id,
+            'due_date': row.due_date.isoformat() if row.due_date else None,
+            'estimate': row.estimate,
+            'depth': row.depth,
+            'progress': _progress(row.total, row.done, row.estimate_total, row.estimate_done),
+            'truncated': bool(row.has_children) and row.depth == max_depth,
+            'children': [],
+        }
+    # Rows arrive ordered by depth, so every parent is already in place. The root's own
+    # parent can be inside the tree only through a cycle; it stays the root.
+    for row in rows[1:]:
+        nodes[row.parent_id]['children'].append(nodes[row.id])
+    return jsonify({'tree': nodes[rows[0].id], 'max_depth': max_depth}), 200
+
+
+@require_project_permission('view_tasks')
+def get_item_ancestors(item_id):
+    item = Item.query.get(item_id)
+    if not item:
+        return jsonify({'error': f'Item not found: {item_id}'}), 404
+    ancestors = [{
+        'id': row.id,
+        'parent_id': row.parent_id,
+        'title': row.title,
+        'type': row.type,
+        'status': row.status,
+        'project_id': row.project_id,
+    } for row in load_ancestors(item_id) if row.project_id == item.project_id]
+    return jsonify({'ancestors': ancestors}), 200
@@ -0,0 +1,271 @@
+"""
+Bulk import of items from CSV or JSON (other trackers' exports).
+
+Rows are validated like update_item, columns/assignees/parents are resolved through
+in-memory maps built with one query each, and valid rows are inserted with one multi-row
+INSERT per chunk. Counters, status events, search documents, activity and ranks are
+written alongside, as the flush hooks would for single creates. Assignees get one
+summary notification each instead of one per item.
+
+    POST /projects/<id>/import?format=csv|json&dry_run=1     (file upload or raw body)
+    flask import-items <project_id> <file> --reporter alice@example.com [--dry-run]
+
+Recognised fields: title, description, type, status, priority, severity, estimate,
+due_date (YYYY-MM-DD), column (id or name), assignee (id, email or username), parent_id.
+"""
+import csv
+import io
+import json
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+import click
+from flask import request, jsonify
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import insert, func, or_
+from models.db import db
+from models.item import Item
+from models.user import User
+from models.project import Project
+from models.board_column import BoardColumn
+from models.activity_log import ActivityLog
+from controllers.rbac import require_project_permission
+from controllers.bulk_controller import check_item_fields, OperationError
+from controllers.notification_controller import send_notifications
+from controllers.project_stats import count_rows, apply_deltas
+from controllers.timeseries import insert_status_events
+from controllers.search import reindex_items
+from controllers.ranking import last_rank, ranks_after
+
+CHUNK_SIZE = 1000
+MAX_ROWS = 100000  # per HTTP request; the CLI has no limit
+FIELDS = ('title', 'description', 'type', 'status', 'priority', 'severity', 'estimate', 'due_date', 'parent_id')
+
+
+class ImportFileError(ValueError):
+    """The file itself can't be read (unknown format, invalid JSON, not a list of rows)."""
+
+
+def parse_rows(raw, fmt):
+    """List of row dicts from CSV (header row) or JSON (a list, or {"items": [...]})."""
+    if isinstance(raw, bytes):
+        raw = raw.decode('utf-8-sig')
+    if fmt == 'csv':
+        return list(csv.DictReader(io.StringIO(raw)))
+    if fmt == 'json':
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            raise ImportFileError(f'Invalid JSON: {e}')
+        rows = data.get('items') if isinstance(data, dict) else data
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ImportFileError('JSON must be a list of objects or {"items": [...]}')
+        return rows
+    raise ImportFileError('format must be csv or json')
+
+
+def _blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+class ItemImport:
+    def __init__(self, project_id, reporter_id, rows):
+        self.project_id = project_id
+        self.reporter_id = int(reporter_id)
+        self.rows = rows
+        self.errors = []
+        self.valid = []
+        columns = db.session.query(BoardColumn.id, BoardColumn.name) \
+            .filter(BoardColumn.project_id == project_id) \
+            .order_by(BoardColumn.rank.asc().nulls_last(), BoardColumn.id).all()
+        self.default_column = columns[0].id if columns else None
+        self.columns = {str(c.id): c.id for c in columns}
+        self.columns.update({c.name.strip().lower(): c.id for c in columns})
+        self.users = self._user_map(rows)
+        parent_ids = {self._int(row.get('parent_id')) for row in rows if not _blank(row.get('parent_id'))}
+        self.parents = {item_id for (item_id,) in db.session.query(Item.id).filter(
+            Item.project_id == project_id, Item.id.in_(parent_ids - {None}))}
+
+    @staticmethod
+    def _int(value):
+        # JSON true/false are not numbers here, although int(True) == 1
+        if isinstance(value, bool):
+            return None
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    def _user_map(self, rows):
+        keys = {str(row.get('assignee') if row.get('assignee') is not None else row.get('assignee_id')).strip()
+                for row in rows if not _blank(row.get('assignee', row.get('assignee_id')))}
+        ids = {int(k) for k in keys if k.isdigit()}
+        names = {k.lower() for k in keys if not k.isdigit()}
+        if not keys:
+            return {}
+        found = db.session.query(User.id, User.email, User.username).filter(or_(
+            User.id.in_(ids), func.lower(User.email).in_(names), func.lower(User.username).in_(names)))
+        users = {}
+        for user_id, email, username in found:
+            users[str(user_id)] = user_id
+            users[email.lower()] = user_id
+            users[username.lower()] = user_id
+        return users
+
+    def _resolve(self, row):
+        fields = {f: row[f] for f in FIELDS if f in row and not _blank(row[f])}
+        fields = {f: v.strip() if isinstance(v, str) else v for f, v in fields.items()}
+        fields.setdefault('type', 'task')
+        fields.setdefault('status', 'todo')
+        if 'title' not in fields:
+            raise OperationError('Title required (max 120 chars)')
+        if 'estimate' in fields:
+            fields['estimate'] = self._int(fields['estimate'])
+            if fields['estimate'] is None or fields['estimate'] < 0:
+                raise OperationError(f'Invalid estimate: {row["estimate"]}')
+        check_item_fields(fields)
+        if 'parent_id' in fields:
+            fields['parent_id'] = self._int(fields['parent_id'])
+            if fields['parent_id'] not in self.parents:
+                raise OperationError(f'Parent item not found in project: {row["parent_id"]}')
+        column = row.get('column', row.get('column_id'))
+        if _blank(column):
+            fields['column_id'] = self.default_column
+        else:
+            fields['column_id'] = self.columns.get(str(column).strip().lower())
+            if fields['column_id'] is None:
+                raise OperationError(f'Unknown column: {column}')
+        if fields['column_id'] is None:
+            raise OperationError('Project has no board columns')
+        assignee = row.get('assignee', row.get('assignee_id'))
+        if not _blank(assignee):
+            fields['assignee_id'] = self.users.get(str(assignee).strip().lower())
+            if fields['assignee_id'] is None:
+                raise OperationError(f'Unknown assignee: {assignee}')
+        return fields
+
+    def validate(self):
+        for number, row in enumerate(self.rows, start=1):
+            try:
+                self.valid.append(self._resolve(row))
+            except OperationError as e:
+                self.errors.append({'row': number, 'error': e.message})
+        return not self.errors
+
+    def apply(self):
+        """Insert the valid rows; returns their ids. The caller commits."""
+        now = datetime.utcnow()
+        # Imported rows go to the end of their column, in file order
+        by_column = defaultdict(list)
+        for fields in self.valid:
+            by_column[fields['column_id']].append(fields)
+        for column_id, rows in by_column.items():
+            for fields, rank in zip(rows, ranks_after(last_rank(Item, Item.column_id, column_id), len(rows))):
+                fields['rank'] = rank
+        keys = set(FIELDS) | {'column_id', 'assignee_id', 'rank'}
+        ids = []
+        project_deltas, user_deltas, assigned = Counter(), Counter(), Counter()
+        for start in range(0, len(self.valid), CHUNK_SIZE):
+            chunk = [dict({k: fields.get(k) for k in keys}, project_id=self.project_id, reporter_id=self.reporter_id,
+                          created_at=now, updated_at=now)
+                     for fields in self.valid[start:start + CHUNK_SIZE]]
+            # render_nulls: otherwise the ORM groups rows by which keys are None, and a file
+            # alternating assigned/unassigned rows becomes one INSERT per row
+            chunk_ids = db.session.execute(insert(Item).returning(Item.id, sort_by_parameter_order=True)
+                                           .execution_options(render_nulls=True), chunk).scalars().all()
+            count_rows(chunk, 1, project_deltas, user_deltas)
+            insert_status_events(db.session, [(self.project_id, item_id, None, row['status'])
+                                              for row, item_id in zip(chunk, chunk_ids)])
+            db.session.execute(insert(ActivityLog), [
+                {'item_id': item_id, 'user_id': self.reporter_id, 'action': 'created',
+                 'details': f'Task imported: {row["title"]}', 'created_at': now}
+                for row, item_id in zip(chunk, chunk_ids)])
+            reindex_items(db.session.connection(), chunk_ids)
+            assigned.update(row['assignee_id'] for row in chunk if row['assignee_id'])
+            ids.extend(chunk_ids)
+        apply_deltas(db.session, project_deltas, user_deltas)
+        project_name = db.session.query(Project.name).filter(Project.id == self.project_id).scalar()
+        send_notifications([(user_id, f"{count} task(s) were assigned to you by an import into '{project_name}'")
+                            for user_id, count in assigned.items()], commit=False)
+        return ids
+
+
+def run_import(project_id, reporter_id, rows, dry_run=False):
+    """Validate and (unless dry_run or any row is invalid) insert; returns the report dict."""
+    started = time.perf_counter()
+    job = ItemImport(project_id, reporter_id, rows)
+    ok = job.validate()
+    imported = 0
+    if ok and not dry_run:
+        imported = len(job.apply())
+        db.session.commit()
+    else:
+        db.session.rollback()
+    seconds = time.perf_counter() - started
+    return {
+        'rows': len(rows),
+        'valid': len(job.valid),
+        'imported': imported,
+        'dry_run': dry_run,
+        'errors': job.errors,
+        'seconds': round(seconds, 3),
+        'rows_per_sec': round(len(rows) / seconds, 1) if seconds else None,
+    }
+
+
+@require_project_permission('create_task')
+def import_items(project_id):
+    """
+    All-or-nothing: if any row is invalid nothing is inserted and the report lists every
+    bad row (1-based, header excluded). dry_run=1 only validates.
+    """
+    upload = request.files.get('file')
+    raw = upload.read() if upload else request.get_data()
+    name = upload.filename if upload else request.mimetype
+    fmt = request.args.get('format') or ('json' if (name or '').endswith('json') else 'csv')
+    try:
+        rows = parse_rows(raw, fmt)
+    except (ImportFileError, UnicodeDecodeError, csv.Error) as e:
+        return jsonify({'error': str(e)}), 400
+    if not rows:
+        return jsonify({'error': 'No rows to import'}), 400
+    if len(rows) > MAX_ROWS:
+        return jsonify({'error': f'Too many rows (max {MAX_ROWS}); use the import-items CLI'}), 400
+    dry_run = request.args.get('dry_run', '').lower() in ('1', 'true', 'yes')
+    report = run_import(project_id, get_jwt_identity(), rows, dry_run=dry_run)
+    if report['errors']:
+        return jsonify(report), 400
+    return jsonify(report), 200 if dry_run else 201
+
+
+def init_app(app):
+    @app.cli.command('import-items')
+    @click.argument('project_id', type=int)
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--reporter', required=True, help='Reporter email, username or id')
+    @click.option('--format', 'fmt', type=click.Choice(['csv', 'json']), default=None,
+                  help='Defaults to the file extension')
+    @click.option('--dry-run', is_flag=True, help='Validate only')
+    def import_items_command(project_id, path, reporter, fmt, dry_run):
+        """Import items into a project from a CSV or JSON file."""
+        reporter_id = db.session.query(User.id).filter(or_(
+            User.email == reporter, User.username == reporter,
+            User.id == (int(reporter) if reporter.isdigit() else None))).scalar()
+        if reporter_id is None:
+            raise click.ClickException(f'Unknown reporter: {reporter}')
+        if db.session.get(Project, project_id) is None:
+            raise click.ClickException(f'Project not found: {project_id}')
+        with open(path, 'rb') as f:
+            try:
+                rows = parse_rows(f.read(), fmt or ('json' if path.endswith('.json') else 'csv'))
+            except ImportFileError as e:
+                raise click.ClickException(str(e))
+        report = run_import(project_id, reporter_id, rows, dry_run=dry_run)
+        for error in report['errors'][:50]:
+            click.echo(f"row {error['row']}: {error['error']}", err=True)
+        if len(report['errors']) > 50:
+            click.echo(f"... {len(report['errors']) - 50} more invalid rows", err=True)
+        click.echo(f"{report['imported']} of {report['rows']} rows imported in {report['seconds']}s "
+                   f"({report['rows_per_sec']} rows/sec){' [dry run]' if dry_run else ''}")
+        if report['errors']:
+            raise SystemExit(1)
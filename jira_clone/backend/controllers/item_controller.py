@@ -1,27 +1,32 @@
 import logging
 from flask import request, jsonify
 from models.db import db
-from models.item import Item
+from models.item import Item, ITEM_STATUSES, ITEM_TYPES, ITEM_PRIORITIES
 from models.project import Project
 from models.user import User
 from models.activity_log import ActivityLog
 from datetime import datetime
 from controllers.rbac import require_project_permission
 from models.comment import Comment
-from sqlalchemy.orm import joinedload
-from controllers.notification_controller import create_notification
+from sqlalchemy import or_
+from controllers.notification_controller import create_notification, notify_many
+from controllers.activity_pipeline import activity_pipeline
 from flask_jwt_extended import get_jwt_identity
+from controllers.pagination import page_args, keyset_page, offset_page, approximate_count, InvalidCursor
+from controllers.item_query import compile_query, QueryError
+from controllers.hierarchy import would_create_cycle
+from controllers.deletion import delete_items
+from controllers.serialization import ITEM_LIST, ITEM_SUMMARY, ITEM_TASK, ITEM_DETAIL, COMMENT, query_item_detail
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def log_activity(item_id, user_id, action, details=None):
+def log_activity(item_id, user_id, action, details=None, project_id=None):
     if item_id is None:
         logger.warning("Tried to log activity with null item_id. Skipping log entry.")
         return
-    log = ActivityLog(item_id=item_id, user_id=user_id, action=action, details=details)
-    db.session.add(log)
-    db.session.commit()
+    # Buffered; written in bulk when the current session commits
+    activity_pipeline.log(item_id, user_id, action, details, project_id=project_id)
 
 def get_recent_activity():
     user_id = get_jwt_identity()
@@ -57,10 +62,11 @@ def create_item(project_id):
     priority = data.get('priority')
     parent_id = data.get('parent_id')
     severity = data.get('severity')
+    estimate = data.get('estimate')
     # --- Field validation ---
-    allowed_status = {'todo', 'inprogress', 'done', 'inreview'}
-    allowed_types = {'task', 'bug', 'epic', 'feature'}
-    allowed_priority = {'Low', 'Medium', 'High', 'Critical', None}
+    allowed_status = set(ITEM_STATUSES)
+    allowed_types = set(ITEM_TYPES)
+    allowed_priority = set(ITEM_PRIORITIES) | {None}
     if not title or not column_id:
         return jsonify({'error': 'Title and column_id required'}), 400
     if len(title) > 120:
@@ -83,11 +89,13 @@ def create_item(project_id):
         due_date=datetime.strptime(due_date, '%Y-%m-%d').date() if due_date else None,
         priority=priority,
         parent_id=parent_id,
-        severity=severity
+        severity=severity,
+        estimate=estimate
     )
     db.session.add(item)
+    db.session.flush()
+    log_activity(item.id, reporter_id, 'created', f'Task created: {title}', project_id=project_id)
     db.session.commit()
-    log_activity(item.id, reporter_id, 'created', f'Task created: {title}')
     # Notify assignee if assigned (task creation)
     if assignee_id:
         assignee = User.query.get(assignee_id)
@@ -98,89 +106,57 @@ def create_item(project_id):
 @require_project_permission('view_tasks')
 def get_items(project_id=None, **kwargs):
     item_type = request.args.get('type')
-    limit = int(request.args.get('limit', 50))
-    offset = int(request.args.get('offset', 0))
-    query = Item.query.filter_by(project_id=project_id)
+    limit, cursor, include_total = page_args()
+    query = ITEM_LIST.query(Item).filter_by(project_id=project_id)
     if item_type:
         query = query.filter_by(type=item_type)
-    total = query.count()
-    items = query.offset(offset).limit(limit).all()
-    result = [{
-        'id': i.id,
-        'title': i.title,
-        'status': i.status,
-        'assignee_id': i.assignee_id,
-        'priority': i.priority,
-        'due_date': i.due_date.isoformat() if i.due_date else None,
-        'parent_id': i.parent_id,
-        'type': i.type
-    } for i in items]
-    return jsonify({'items': result, 'total': total, 'limit': limit, 'offset': offset}), 200
+    # ?q= takes a JQL-style filter, e.g. status in (todo,inprogress) AND due < 2026-11-01 ORDER BY priority
+    order_by = []
+    if request.args.get('q'):
+        try:
+            where, order_by = compile_query(request.args['q'], current_user_id=get_jwt_identity())
+        except QueryError as e:
+            return jsonify({'error': f'Invalid query: {e.message}', 'position': e.position}), 400
+        if where is not None:
+            query = query.filter(where)
+    try:
+        if order_by:
+            items, next_cursor = offset_page(query.order_by(*order_by, Item.id), cursor=cursor, limit=limit)
+        else:
+            items, next_cursor = keyset_page(query, Item.created_at, Item.id, cursor=cursor, limit=limit)
+    except InvalidCursor:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    response = {'items': ITEM_LIST.dump_many(items), 'limit': limit, 'next_cursor': next_cursor}
+    if include_total:
+        response['total'] = approximate_count(query)
+    return jsonify(response), 200
+
+def load_item_detail(item_id):
+    """
+    Load an item with its parent, assignee/reporter names, comments (with authors) and subtasks.
+    Always three queries, independent of the number of comments or subtasks.
+    """
+    row = query_item_detail().filter(Item.id == item_id).first()
+    if not row:
+        return None
+    item = ITEM_DETAIL.dump(row)
+    item['comments'] = COMMENT.dump_many(COMMENT.query(Comment)
+                                         .outerjoin(User, User.id == Comment.user_id)
+                                         .filter(Comment.item_id == item_id)
+                                         .order_by(Comment.created_at.asc(), Comment.id.asc()))
+    # Subtasks and the parent in one query
+    related = ITEM_SUMMARY.query(Item).filter(or_(Item.parent_id == item_id, Item.id == row.parent_id)) \
+        .add_columns(Item.parent_id).order_by(Item.id.asc()).all()
+    item['subtasks'] = [ITEM_SUMMARY.dump(r) for r in related if r.parent_id == item_id]
+    item['parent_epic'] = next((ITEM_SUMMARY.dump(r) for r in related if r.id == row.parent_id), None)
+    return item
 
 @require_project_permission('view_tasks')
 def get_item(item_id):
-    item = Item.query.options(
-        joinedload(Item.comments),
-        joinedload(Item.subtasks)
-    ).get(item_id)
+    item = load_item_detail(item_id)
     if not item:
         return jsonify({'error': f'Item not found: {item_id}'}), 404
-    assignee = User.query.get(item.assignee_id) if item.assignee_id else None
-    reporter = User.query.get(item.reporter_id) if item.reporter_id else None
-    # Fetch comments
-    comments = []
-    for c in item.comments.all() if hasattr(item, 'comments') else []:
-        author = User.query.get(c.user_id) if c.user_id else None
-        comments.append({
-            'id': c.id,
-            'author_name': author.username if author else None,
-            'content': c.content,
-            'user_id': c.user_id,
-            'created_at': c.created_at.isoformat() if hasattr(c, 'created_at') and c.created_at else None
-        })
-    # Fetch subtasks (children)
-    subtasks = []
-    if hasattr(item, 'subtasks'):
-        for s in item.subtasks:
-            subtasks.append({
-                'id': s.id,
-                'title': s.title,
-                'status': s.status,
-                'priority': s.priority,
-                'due_date': s.due_date.isoformat() if s.due_date else None
-            })
-    # Fetch parent epic (if any)
-    parent_epic = None
-    if item.parent_id:
-        parent = Item.query.get(item.parent_id)
-        if parent:
-            parent_epic = {
-                'id': parent.id,
-                'title': parent.title,
-                'status': parent.status,
-                'priority': parent.priority,
-                'due_date': parent.due_date.isoformat() if parent.due_date else None
-            }
-    return jsonify({'item': {
-        'id': item.id,
-        'title': item.title,
-        'description': item.description,
-        'status': item.status,
-        'priority': item.priority,
-        'due_date': item.due_date.isoformat() if item.due_date else None,
-        'parent_id': item.parent_id,
-        'assignee_id': item.assignee_id,
-        'assignee_name': assignee.username if assignee else None,
-        'reporter_id': item.reporter_id,
-        'reporter_name': reporter.username if reporter else None,
-        'type': item.type,
-        'column_id': item.column_id,
-        'created_at': item.created_at.isoformat() if item.created_at else None,
-        'updated_at': item.updated_at.isoformat() if item.updated_at else None,
-        'comments': comments,
-        'subtasks': subtasks,
-        'parent_epic': parent_epic
-    }}), 200
+    return jsonify({'item': item}), 200
 
 @require_project_permission('edit_any_task', allow_own='edit_own_task')
 def update_item(item_id):
@@ -189,10 +165,13 @@ def update_item(item_id):
         return jsonify({'error': f'Item not found: {item_id}'}), 404
     data = request.get_json()
     changes = []
-    allowed_status = {'todo', 'inprogress', 'done', 'inreview'}
-    allowed_types = {'task', 'bug', 'epic', 'story'}
-    allowed_priority = {'Low', 'Medium', 'High', 'Critical', None}
-    for field in ['title', 'description', 'status', 'assignee_id', 'column_id', 'priority', 'parent_id', 'type', 'severity']:
+    allowed_status = set(ITEM_STATUSES)
+    allowed_types = set(ITEM_TYPES)
+    allowed_priority = set(ITEM_PRIORITIES) | {None}
+    old_assignee = item.assignee_id
+    if data.get('parent_id') and would_create_cycle(item.id, data['parent_id']):
+        return jsonify({'error': 'An item cannot be moved under itself or one of its subtasks'}), 400
+    for field in ['title', 'description', 'status', 'assignee_id', 'column_id', 'priority', 'parent_id', 'type', 'severity', 'estimate']:
         if field in data:
             if field == 'title' and len(data['title']) > 120:
                 return jsonify({'error': 'Title too long (max 120 chars)'}), 400
@@ -213,18 +192,13 @@ def update_item(item_id):
         if old != new:
             changes.append(f'due_date: {old} -> {new}')
         item.due_date = datetime.strptime(data['due_date'], '%Y-%m-%d').date() if data['due_date'] else None
-    db.session.commit()
     if changes:
-        log_activity(item.id, get_jwt_identity(), 'updated', '; '.join(changes))
-    old_assignee = item.assignee_id
-    for field in ['title', 'description', 'status', 'assignee_id', 'column_id', 'priority', 'parent_id', 'type', 'severity']:
-        if field in data:
-            if field == 'assignee_id' and data['assignee_id'] != old_assignee:
-                new_assignee = data['assignee_id']
-                if new_assignee:
-                    assignee_user = User.query.get(new_assignee)
-                    if assignee_user:
-                        create_notification(new_assignee, f"You have been assigned to task '{item.title}'")
+        log_activity(item.id, get_jwt_identity(), 'updated', '; '.join(changes), project_id=item.project_id)
+    # The notification shares the edit's commit
+    new_assignee = data.get('assignee_id')
+    if 'assignee_id' in data and new_assignee and new_assignee != old_assignee and User.query.get(new_assignee):
+        notify_many([new_assignee], f"You have been assigned to task '{item.title}'", commit=False)
+    db.session.commit()
     return jsonify({'message': 'Item updated'}), 200
 
 @require_project_permission('delete_any_task', allow_own='delete_own_task')
@@ -232,12 +206,10 @@ def delete_item(item_id):
     item = Item.query.get(item_id)
     if not item:
         return jsonify({'error': f'Item not found: {item_id}'}), 404
-    log_activity(item_id, get_jwt_identity(), 'deleted', 'Task deleted')
-    for log in item.activity_logs.all():
-        db.session.delete(log)
-    db.session.delete(item)
+    # The item's history goes with it, so no 'deleted' entry is logged
+    counts = delete_items([item_id])
     db.session.commit()
-    return jsonify({'message': 'Item deleted'}), 200
+    return jsonify({'message': 'Item deleted', 'deleted': counts}), 200
 
 @require_project_permission('view_tasks')
 def get_subtasks(item_id):
@@ -246,14 +218,8 @@ def get_subtasks(item_id):
         return jsonify({'error': 'Parent task not found'}), 404
     limit = int(request.args.get('limit', 50))
     offset = int(request.args.get('offset', 0))
-    subtasks_query = parent.subtasks.offset(offset).limit(limit)
-    result = [{
-        'id': s.id,
-        'title': s.title,
-        'status': s.status,
-        'priority': s.priority,
-        'due_date': s.due_date.isoformat() if s.due_date else None
-    } for s in subtasks_query]
+    result = ITEM_SUMMARY.dump_many(ITEM_SUMMARY.query(Item).filter(Item.parent_id == item_id)
+                                    .offset(offset).limit(limit))
     total = parent.subtasks.count()
     return jsonify({'subtasks': result, 'total': total, 'limit': limit, 'offset': offset}), 200
 
@@ -277,11 +243,13 @@ def create_subtask(item_id):
         assignee_id=data.get('assignee_id'),
         due_date=datetime.strptime(data['due_date'], '%Y-%m-%d').date() if data.get('due_date') else None,
         priority=data.get('priority'),
+        estimate=data.get('estimate'),
         parent_id=parent.id
     )
     db.session.add(subtask)
+    db.session.flush()
+    log_activity(subtask.id, get_jwt_identity(), 'created', f'Subtask created: {title}', project_id=parent.project_id)
     db.session.commit()
-    log_activity(subtask.id, get_jwt_identity(), 'created', f'Subtask created: {title}')
     if data.get('assignee_id'):
         assignee = User.query.get(data.get('assignee_id'))
         if assignee:
@@ -296,7 +264,7 @@ def update_subtask(subtask_id):
     data = request.get_json()
     changes = []
     old_assignee = subtask.assignee_id
-    for field in ['title', 'description', 'status', 'assignee_id', 'priority', 'type']:
+    for field in ['title', 'description', 'status', 'assignee_id', 'priority', 'type', 'estimate']:
         if field in data:
             old = getattr(subtask, field)
             new = data[field]
@@ -314,9 +282,9 @@ def update_subtask(subtask_id):
         if old != new:
             changes.append(f'due_date: {old} -> {new}')
         subtask.due_date = datetime.strptime(data['due_date'], '%Y-%m-%d').date() if data['due_date'] else None
-    db.session.commit()
     if changes:
-        log_activity(subtask.id, get_jwt_identity(), 'updated', '; '.join(changes))
+        log_activity(subtask.id, get_jwt_identity(), 'updated', '; '.join(changes), project_id=subtask.project_id)
+    db.session.commit()
     return jsonify({'message': 'Subtask updated'}), 200
 
 @require_project_permission('delete_any_task')
@@ -324,14 +292,19 @@ def delete_subtask(subtask_id):
     subtask = Item.query.get(subtask_id)
     if not subtask or not subtask.parent_id:
         return jsonify({'error': 'Subtask not found'}), 404
-    db.session.delete(subtask)
+    # Logging against a deleted row would violate the item FK; its history goes with it
+    counts = delete_items([subtask_id])
     db.session.commit()
-    log_activity(subtask_id, get_jwt_identity(), 'deleted', 'Subtask deleted')
-    return jsonify({'message': 'Subtask deleted'}), 200
+    return jsonify({'message': 'Subtask deleted', 'deleted': counts}), 200
 
 @require_project_permission('view_tasks')
 def get_activity_logs(item_id):
-    logs = ActivityLog.query.filter_by(item_id=item_id).order_by(ActivityLog.created_at.asc()).all()
+    limit, cursor, include_total = page_args()
+    query = ActivityLog.query.filter_by(item_id=item_id)
+    try:
+        logs, next_cursor = keyset_page(query, ActivityLog.created_at, ActivityLog.id, cursor=cursor, limit=limit)
+    except InvalidCursor:
+        return jsonify({'error': 'Invalid cursor'}), 400
     result = [{
         'id': log.id,
         'user_id': log.user_id,
@@ -339,34 +312,28 @@ def get_activity_logs(item_id):
         'details': log.details,
         'created_at': log.created_at.isoformat()
     } for log in logs]
-    return jsonify({'activity_logs': result}), 200
+    response = {'activity_logs': result, 'limit': limit, 'next_cursor': next_cursor}
+    if include_total:
+        response['total'] = approximate_count(query)
+    return jsonify(response), 200
 
 def get_my_tasks():
     user_id = get_jwt_identity()
     user = User.query.get(user_id)
     if not user:
         return jsonify({'error': 'User not found'}), 401
+    limit, cursor, include_total = page_args()
     try:
-        tasks = Item.query.filter(
+        query = ITEM_TASK.query(Item).filter(
             (Item.assignee_id == user_id) | (Item.reporter_id == user_id)
-        ).order_by(Item.created_at.desc()).all()
-        result = []
-        for task in tasks:
-            result.append({
-                'id': task.id,
-                'title': task.title,
-                'description': task.description,
-                'status': task.status,
-                'type': task.type,
-                'priority': task.priority,
-                'due_date': task.due_date.isoformat() if task.due_date else None,
-                'project_id': task.project_id,
-                'assignee_id': task.assignee_id,
-                'reporter_id': task.reporter_id,
-                'created_at': task.created_at.isoformat(),
-                'updated_at': task.updated_at.isoformat() if task.updated_at else None,
-            })
-        return jsonify({'tasks': result}), 200
+        )
+        tasks, next_cursor = keyset_page(query, Item.created_at, Item.id, cursor=cursor, limit=limit, descending=True)
+        response = {'tasks': ITEM_TASK.dump_many(tasks), 'limit': limit, 'next_cursor': next_cursor}
+        if include_total:
+            response['total'] = approximate_count(query)
+        return jsonify(response), 200
+    except InvalidCursor:
+        return jsonify({'error': 'Invalid cursor'}), 400
     except Exception as e:
         logger.error(f'[get_my_tasks] Exception: {e}')
         return jsonify({'error': 'Internal server error'}), 500
@@ -385,12 +352,8 @@ def add_comment(item_id):
     db.session.commit()
     item = Item.query.get(item_id)
     if item:
-        notified_users = set()
-        if item.assignee_id and item.assignee_id != user.id:
-            create_notification(item.assignee_id, f"New comment on task '{item.title}'")
-            notified_users.add(item.assignee_id)
-        if item.reporter_id and item.reporter_id != user.id and item.reporter_id not in notified_users:
-            create_notification(item.reporter_id, f"New comment on task '{item.title}'")
+        recipients = [u for u in (item.assignee_id, item.reporter_id) if u and u != user.id]
+        notify_many(recipients, f"New comment on task '{item.title}'")
     return jsonify({'message': 'Comment added', 'comment': {'id': comment.id, 'content': comment.content, 'user_id': comment.user_id, 'author_name': user.username, 'created_at': comment.created_at.isoformat()}}), 201
 
 @require_project_permission('edit_any_comment', allow_own='edit_own_comment')
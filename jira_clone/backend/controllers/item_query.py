@@ -0,0 +1,294 @@
+"""
+Small JQL-style filter language for items, compiled to a SQLAlchemy expression.
+
+    status in (todo, inprogress) AND assignee = 12 AND due < 2026-11-01 ORDER BY priority DESC
+
+Grammar (keywords are case-insensitive):
+
+    query      := [expr] [ORDER BY field [ASC|DESC] {, field [ASC|DESC]}]
+    expr       := term {OR term}
+    term       := factor {AND factor}
+    factor     := NOT factor | '(' expr ')' | condition
+    condition  := field op value
+                | field [NOT] IN '(' value {, value} ')'
+                | field IS [NOT] (EMPTY | NULL)
+    op         := = | != | < | <= | > | >= | ~ | !~
+
+Only fields in FIELDS can be referenced and every value is a bound parameter.
+"""
+import re
+from datetime import date, datetime, timedelta
+from sqlalchemy import and_, or_, not_, case
+from models.item import Item, ITEM_STATUSES, ITEM_TYPES, ITEM_PRIORITIES
+
+MAX_QUERY_LENGTH = 1000
+MAX_CONDITIONS = 50
+MAX_IN_VALUES = 100
+MAX_DEPTH = 32  # nested parentheses / NOTs
+
+_EQ = ('=', '!=')
+_CMP = ('=', '!=', '<', '<=', '>', '>=')
+_TEXT = ('=', '!=', '~', '!~')
+
+
+class QueryError(ValueError):
+    def __init__(self, message, position=None):
+        super().__init__(message)
+        self.message = message
+        self.position = position
+
+
+class Field:
+    def __init__(self, column, kind, ops, choices=None, nullable=True):
+        self.column = column
+        self.kind = kind
+        self.ops = ops
+        self.choices = choices
+        self.nullable = nullable
+
+
+# The allow-list: query name -> column. Project-scoped listings lead with project_id,
+# so status/created/due comparisons seek on the (project_id, ...) indexes.
+FIELDS = {
+    'id': Field(Item.id, 'int', _CMP, nullable=False),
+    'title': Field(Item.title, 'text', _TEXT, nullable=False),
+    'status': Field(Item.status, 'choice', _EQ, choices=ITEM_STATUSES, nullable=False),
+    'type': Field(Item.type, 'choice', _EQ, choices=ITEM_TYPES, nullable=False),
+    'priority': Field(Item.priority, 'choice', _CMP, choices=ITEM_PRIORITIES),
+    'severity': Field(Item.severity, 'text', _TEXT),
+    'assignee': Field(Item.assignee_id, 'user', _EQ),
+    'reporter': Field(Item.reporter_id, 'user', _EQ, nullable=False),
+    'parent': Field(Item.parent_id, 'int', _EQ),
+    'column': Field(Item.column_id, 'int', _EQ, nullable=False),
+    'due': Field(Item.due_date, 'date', _CMP),
+    'start': Field(Item.start_date, 'datetime', _CMP),
+    'created': Field(Item.created_at, 'datetime', _CMP),
+    'updated': Field(Item.updated_at, 'datetime', _CMP),
+}
+
+_TOKEN = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+  | (?P<op>!=|<=|>=|!~|=|<|>|~)
+  | (?P<punct>[(),])
+  | (?P<word>[A-Za-z0-9_.:\-]+)
+""", re.VERBOSE)
+
+_KEYWORDS = {'and', 'or', 'not', 'in', 'is', 'empty', 'null', 'order', 'by', 'asc', 'desc'}
+
+
+def _tokenize(text):
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if not match:
+            raise QueryError(f'Unexpected character {text[pos]!r}', pos)
+        kind = match.lastgroup
+        value = match.group()
+        if kind == 'string':
+            tokens.append(('string', re.sub(r'\\(.)', r'\1', value[1:-1]), pos))
+        elif kind == 'word' and value.lower() in _KEYWORDS:
+            tokens.append(('kw', value.lower(), pos))
+        elif kind != 'ws':
+            tokens.append((kind, value, pos))
+        pos = match.end()
+    tokens.append(('end', None, pos))
+    return tokens
+
+
+def _priority_rank(column):
+    return case({p: i for i, p in enumerate(ITEM_PRIORITIES, 1)}, value=column, else_=None)
+
+
+class _Parser:
+    def __init__(self, text, current_user_id):
+        self.tokens = _tokenize(text)
+        self.index = 0
+        self.current_user_id = current_user_id
+        self.conditions = 0
+        self.depth = 0
+
+    # --- token helpers ---
+    def peek(self, kind=None, value=None):
+        tok_kind, tok_value, _ = self.tokens[self.index]
+        return (kind is None or tok_kind == kind) and (value is None or tok_value == value)
+
+    def take(self, kind=None, value=None):
+        tok = self.tokens[self.index]
+        if not self.peek(kind, value):
+            expected = value or kind
+            found = tok[1] if tok[0] != 'end' else 'end of query'
+            raise QueryError(f'Expected {expected} but found {found!r}', tok[2])
+        self.index += 1
+        return tok
+
+    # --- grammar ---
+    def parse(self):
+        where = None
+        if not self.peek('end') and not self.peek('kw', 'order'):
+            where = self.expr()
+        order_by = self.order_by() if self.peek('kw', 'order') else []
+        self.take('end')
+        return where, order_by
+
+    def expr(self):
+        parts = [self.term()]
+        while self.peek('kw', 'or'):
+            self.take()
+            parts.append(self.term())
+        return parts[0] if len(parts) == 1 else or_(*parts)
+
+    def term(self):
+        parts = [self.factor()]
+        while self.peek('kw', 'and'):
+            self.take()
+            parts.append(self.factor())
+        return parts[0] if len(parts) == 1 else and_(*parts)
+
+    def factor(self):
+        # Each NOT and '(' recurses; bounded well before Python's recursion limit
+        self.depth += 1
+        if self.depth > MAX_DEPTH:
+            raise QueryError(f'Query is nested too deeply (max {MAX_DEPTH})', self.tokens[self.index][2])
+        try:
+            if self.peek('kw', 'not'):
+                self.take()
+                return not_(self.factor())
+            if self.peek('punct', '('):
+                self.take()
+                inner = self.expr()
+                self.take('punct', ')')
+                return inner
+            return self.condition()
+        finally:
+            self.depth -= 1
+
+    def field(self):
+        _, name, pos = self.take('word')
+        field = FIELDS.get(name.lower())
+        if not field:
+            raise QueryError(f'Unknown field {name!r}; allowed: {", ".join(sorted(FIELDS))}', pos)
+        return name.lower(), field
+
+    def condition(self):
+        self.conditions += 1
+        if self.conditions > MAX_CONDITIONS:
+            raise QueryError(f'Too many conditions (max {MAX_CONDITIONS})', self.tokens[self.index][2])
+        name, field = self.field()
+        if self.peek('kw', 'is'):
+            self.take()
+            negate = self.peek('kw', 'not')
+            if negate:
+                self.take()
+            if not (self.peek('kw', 'empty') or self.peek('kw', 'null')):
+                self.take('kw', 'empty')
+            self.take()
+            return field.column.isnot(None) if negate else field.column.is_(None)
+        if self.peek('kw', 'not') or self.peek('kw', 'in'):
+            negate = self.peek('kw', 'not')
+            if negate:
+                self.take()
+            self.take('kw', 'in')
+            if '=' not in field.ops:
+                raise QueryError(f'IN is not supported for {name}', self.tokens[self.index][2])
+            values = self.value_list(name, field)
+            return field.column.notin_(values) if negate else field.column.in_(values)
+        _, op, pos = self.take('op')
+        if op not in field.ops:
+            raise QueryError(f'Operator {op} is not supported for {name}', pos)
+        return self.compare(name, field, op, self.value(name, field, op))
+
+    def value_list(self, name, field):
+        self.take('punct', '(')
+        values = [self.value(name, field, '=')]
+        while self.peek('punct', ','):
+            self.take()
+            values.append(self.value(name, field, '='))
+        self.take('punct', ')')
+        if len(values) > MAX_IN_VALUES:
+            raise QueryError(f'Too many values in IN list (max {MAX_IN_VALUES})')
+        return values
+
+    def value(self, name, field, op):
+        kind, raw, pos = self.tokens[self.index]
+        if kind not in ('word', 'string'):
+            raise QueryError(f'Expected a value for {name}', pos)
+        self.index += 1
+        if field.kind == 'user' and kind == 'word' and raw.lower() == 'currentuser':
+            # currentUser() — the parentheses are optional
+            if self.peek('punct', '('):
+                self.take()
+                self.take('punct', ')')
+            return int(self.current_user_id)
+        try:
+            if field.kind in ('int', 'user'):
+                return int(raw)
+            if field.kind == 'date':
+                return date.fromisoformat(raw)
+            if field.kind == 'datetime':
+                # A bare date stays a date and matches the whole day
+                return date.fromisoformat(raw) if len(raw) == 10 else datetime.fromisoformat(raw)
+        except ValueError:
+            raise QueryError(f'Invalid value {raw!r} for {name}', pos)
+        if field.kind == 'choice':
+            for choice in field.choices:
+                if choice.lower() == raw.lower():
+                    return choice
+            raise QueryError(f'Invalid value {raw!r} for {name}; allowed: {", ".join(field.choices)}', pos)
+        return raw
+
+    def compare(self, name, field, op, value):
+        column = field.column
+        if name == 'priority' and op not in _EQ:
+            column, value = _priority_rank(column), ITEM_PRIORITIES.index(value) + 1
+        if field.kind == 'text' and op in ('~', '!~'):
+            pattern = '%' + value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            clause = column.ilike(pattern, escape='\\')
+            return not_(clause) if op == '!~' else clause
+        if field.kind == 'datetime' and not isinstance(value, datetime):
+            day = datetime.combine(value, datetime.min.time())
+            next_day = day + timedelta(days=1)
+            return {
+                '=': and_(column >= day, column < next_day),
+                '!=': or_(column < day, column >= next_day),
+                '<': column < day,
+                '<=': column < next_day,
+                '>': column >= next_day,
+                '>=': column >= day,
+            }[op]
+        return {
+            '=': column == value,
+            '!=': column != value,
+            '<': column < value,
+            '<=': column <= value,
+            '>': column > value,
+            '>=': column >= value,
+        }[op]
+
+    def order_by(self):
+        self.take('kw', 'order')
+        self.take('kw', 'by')
+        clauses = []
+        while True:
+            name, field = self.field()
+            column = _priority_rank(field.column) if name == 'priority' else field.column
+            descending = False
+            if self.peek('kw', 'asc') or self.peek('kw', 'desc'):
+                descending = self.take()[1] == 'desc'
+            clause = column.desc() if descending else column.asc()
+            clauses.append(clause.nulls_last() if field.nullable else clause)
+            if not self.peek('punct', ','):
+                break
+            self.take()
+        return clauses
+
+
+def compile_query(text, current_user_id=None):
+    """
+    Parse `text` into (where, order_by): a SQLAlchemy boolean expression (or None)
+    and a list of ORDER BY clauses. Raises QueryError on any syntax or field error.
+    """
+    if len(text) > MAX_QUERY_LENGTH:
+        raise QueryError(f'Query too long (max {MAX_QUERY_LENGTH} characters)')
+    return _Parser(text, current_user_id).parse()
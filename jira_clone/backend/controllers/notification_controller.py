@@ -1,19 +1,53 @@
-from flask import request, jsonify
+import json
+from flask import current_app, request, jsonify, Response, stream_with_context
+from datetime import datetime
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
+from sqlalchemy import insert, func
 from models.notification import Notification
 from models.db import db
 from flask_jwt_extended import get_jwt_identity
+from controllers.pagination import page_args, keyset_page, approximate_count, InvalidCursor
+from controllers.event_broker import event_broker, user_channel, project_channel
+from controllers.rbac import has_permission
+from controllers.db_router import read_replica
 import logging
 
+STREAM_KEEPALIVE = 15  # seconds between SSE comment frames on an idle stream
+STREAM_TOKEN_SALT = 'notification-stream'
+
+@read_replica
 def get_notifications():
     user_id = get_jwt_identity()
-    notifs = Notification.query.filter_by(user_id=user_id).order_by(Notification.created_at.desc()).all()
-    return jsonify([{
+    limit, cursor, include_total = page_args()
+    query = Notification.query.filter_by(user_id=user_id)
+    if request.args.get('unread', '').lower() in ('1', 'true', 'yes'):
+        query = query.filter_by(is_read=False)
+    try:
+        notifs, next_cursor = keyset_page(query, Notification.created_at, Notification.id,
+                                          cursor=cursor, limit=limit, descending=True)
+    except InvalidCursor:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    response = jsonify([{
         'id': n.id,
         'user_id': n.user_id,
         'message': n.message,
         'is_read': n.is_read,
         'created_at': n.created_at.isoformat()
-    } for n in notifs]), 200
+    } for n in notifs])
+    # The body stays a plain list for existing clients; paging metadata travels in headers
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    if include_total:
+        response.headers['X-Total-Count'] = str(approximate_count(query))
+    return response, 200
+
+@read_replica
+def get_unread_count():
+    user_id = get_jwt_identity()
+    count = db.session.query(func.count(Notification.id)).filter(
+        Notification.user_id == user_id, Notification.is_read.is_(False)
+    ).scalar()
+    return jsonify({'unread': count}), 200
 
 def mark_as_read(notif_id):
     user_id = get_jwt_identity()
@@ -27,8 +61,89 @@ def mark_as_read(notif_id):
     logging.warning(f"[mark_as_read] Notification {notif_id} not found or does not belong to user {user_id}")
     return jsonify({'error': 'Not found'}), 404
 
-def create_notification(user_id, message):
-    notif = Notification(user_id=user_id, message=message)
-    db.session.add(notif)
+def mark_all_as_read():
+    user_id = get_jwt_identity()
+    updated = Notification.query.filter(
+        Notification.user_id == user_id, Notification.is_read.is_(False)
+    ).update({Notification.is_read: True}, synchronize_session=False)
     db.session.commit()
-    return notif 
\ No newline at end of file
+    return jsonify({'success': True, 'updated': updated}), 200
+
+def send_notifications(notifications, commit=True):
+    """
+    Write (user_id, message) pairs with one multi-row INSERT.
+    Duplicate pairs and empty user ids are skipped; returns the number of rows written.
+    """
+    pairs = list(dict.fromkeys((int(u), message) for u, message in notifications if u))
+    if not pairs:
+        return 0
+    now = datetime.utcnow()
+    db.session.execute(insert(Notification).values([
+        {'user_id': u, 'message': message, 'is_read': False, 'created_at': now} for u, message in pairs
+    ]))
+    for u, message in pairs:
+        event_broker.publish_after_commit(user_channel(u), {
+            'type': 'notification', 'user_id': u, 'message': message, 'created_at': now.isoformat()
+        })
+    if commit:
+        db.session.commit()
+    return len(pairs)
+
+def notify_many(user_ids, message, commit=True):
+    """Send the same message to several users with one multi-row INSERT."""
+    return send_notifications([(u, message) for u in user_ids], commit=commit)
+
+def create_notification(user_id, message):
+    notify_many([user_id], message)
+
+def _stream_tokens():
+    # Signed with its own salt: a stream token is not a JWT and can't authenticate anything else
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt=STREAM_TOKEN_SALT)
+
+def issue_stream_token():
+    """
+    Short-lived token for opening the notification stream. EventSource can't send an
+    Authorization header, and the long-lived access token must not end up in URLs and logs.
+    """
+    ttl = current_app.config.get('STREAM_TOKEN_TTL', 60)
+    return jsonify({'token': _stream_tokens().dumps(str(get_jwt_identity())), 'expires_in': ttl}), 200
+
+def stream_events():
+    """
+    Server-Sent Events stream of the caller's notifications, plus activity on any
+    ?project_id= the caller can view. Authenticated by ?token= from issue_stream_token(),
+    checked only when the stream opens.
+    """
+    try:
+        user_id = _stream_tokens().loads(request.args.get('token', ''),
+                                         max_age=current_app.config.get('STREAM_TOKEN_TTL', 60))
+    except SignatureExpired:
+        return jsonify({'error': 'Stream token expired'}), 401
+    except BadSignature:
+        return jsonify({'error': 'Invalid stream token'}), 401
+    channels = [user_channel(user_id)]
+    for project_id in request.args.getlist('project_id', type=int):
+        if not has_permission(user_id, 'view_tasks', project_id=project_id):
+            return jsonify({'error': f"Forbidden: You lack 'view_tasks' permission on project {project_id}."}), 403
+        channels.append(project_channel(project_id))
+    # Don't hold a pooled connection for the lifetime of the stream
+    db.session.close()
+    subscription = event_broker.subscribe(channels)
+
+    def generate():
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                payload = subscription.get(timeout=STREAM_KEEPALIVE)
+                if payload is None:
+                    yield ': keepalive\n\n'
+                    continue
+                yield f"event: {payload['type']}\ndata: {json.dumps(payload)}\n\n"
+        finally:
+            subscription.close()
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+
@@ -0,0 +1,98 @@
+import base64
+import json
+from datetime import datetime
+from flask import request
+from sqlalchemy import tuple_
+from models.db import db
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at, row_id):
+    raw = json.dumps([created_at.isoformat() if created_at else None, row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+
+
+def page_args():
+    """Read limit/cursor/include_total from the query string; limit is clamped to MAX_LIMIT."""
+    try:
+        limit = int(request.args.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        limit = DEFAULT_LIMIT
+    limit = max(1, min(limit, MAX_LIMIT))
+    include_total = request.args.get('include_total', '').lower() in ('1', 'true', 'yes')
+    return limit, request.args.get('cursor') or None, include_total
+
+
+def keyset_page(query, created_col, id_col, cursor=None, limit=DEFAULT_LIMIT, descending=False):
+    """
+    Fetch one page of `query` ordered by (created_at, id) and seek past `cursor`.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        key = tuple_(created_col, id_col)
+        bound = tuple_(created_at, last_id)
+        query = query.filter(key < bound if descending else key > bound)
+    if descending:
+        query = query.order_by(created_col.desc(), id_col.desc())
+    else:
+        query = query.order_by(created_col.asc(), id_col.asc())
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows, next_cursor
+
+
+def offset_page(query, cursor=None, limit=DEFAULT_LIMIT):
+    """
+    Page an already-ordered query whose sort keys can't be seeked on (e.g. user-chosen
+    ORDER BY). The cursor is an opaque offset. Returns (rows, next_cursor).
+    """
+    offset = 0
+    if cursor:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            offset = int(json.loads(raw)['offset'])
+        except (ValueError, TypeError, KeyError):
+            raise InvalidCursor(cursor)
+        # Only crafted cursors get here; Postgres rejects a negative OFFSET
+        if offset < 0:
+            raise InvalidCursor(cursor)
+    rows = query.offset(offset).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        raw = json.dumps({'offset': offset + limit}, separators=(',', ':'))
+        next_cursor = base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+    return rows, next_cursor
+
+
+def approximate_count(query):
+    """
+    Row estimate for a query. On Postgres this is the planner estimate (no scan);
+    other backends fall back to an exact COUNT.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        compiled = query.order_by(None).statement.compile(dialect=db.engine.dialect)
+        plan = db.session.connection().exec_driver_sql('EXPLAIN (FORMAT JSON) ' + str(compiled), compiled.params).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+    return query.order_by(None).count()
@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class PermissionCache:
+    """
+    Process-wide LRU/TTL cache of resolved permission sets.
+    Keys are (user_id, scope, scope_id) as produced by rbac.get_permissions, values are
+    frozensets of permission actions. Each worker process holds its own copy, so the TTL
+    bounds how long another worker can serve a permission set after it was invalidated here.
+    """
+
+    def __init__(self, maxsize=10000, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, maxsize=None, ttl=None):
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if ttl is not None:
+                self.ttl = ttl
+            self._trim()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, permissions):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, frozenset(permissions))
+            self._entries.move_to_end(key)
+            self._trim()
+
+    def invalidate(self, user_id=None, scope=None, scope_id=None):
+        """Drop every entry matching the given key parts; None matches anything."""
+        user_id = int(user_id) if user_id is not None else None
+        scope_id = int(scope_id) if scope_id is not None else None
+        with self._lock:
+            stale = [k for k in self._entries if _matches(k, user_id, scope, scope_id)]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+            }
+
+    def _trim(self):
+        while len(self._entries) > max(self.maxsize, 0):
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+def _matches(key, user_id, scope, scope_id):
+    key_user, key_scope, key_scope_id = key
+    if user_id is not None and key_user != user_id:
+        return False
+    if scope is not None and key_scope != scope:
+        return False
+    if scope_id is not None and key_scope_id != scope_id:
+        return False
+    return True
+
+
+permission_cache = PermissionCache()
@@ -8,7 +8,10 @@ from models.item import Item
 from models.board_column import BoardColumn
 from models.team_member import TeamMember
 from models.role import Role 
-from controllers.rbac import require_project_permission, require_permission
+from controllers.rbac import require_project_permission, require_permission, invalidate_permissions
+from controllers.report_controller import status_stats
+from controllers.project_stats import user_task_count
+from controllers import deletion
 from flask_jwt_extended import get_jwt_identity, jwt_required
 
 
@@ -56,6 +59,7 @@ def create_project():
                 pm = ProjectMember(project_id=project.id, user_id=tm.user_id, role_id=contributor_role.id)
                 db.session.add(pm)
     db.session.commit()
+    invalidate_permissions(scope='project', scope_id=project.id)
 
     return jsonify({'message': 'Project created', 'project_id': project.id}), 201
 
@@ -89,7 +93,7 @@ def get_dashboard_stats():
         return jsonify({'error': 'User not found'}), 401
 
     project_count = ProjectMember.query.filter_by(user_id=user.id).count()
-    task_count = Item.query.filter((Item.reporter_id == user.id) | (Item.assignee_id == user.id)).count()
+    task_count = user_task_count(user.id)
     team_count = TeamMember.query.filter_by(user_id=user.id).count()
 
     return jsonify({
@@ -104,13 +108,12 @@ def get_project_progress(project_id):
     user = User.query.get(user_id)
     if not user:
         return jsonify({'error': 'User not found'}), 401
-    total = Item.query.filter_by(project_id=project_id).count()
-    completed = Item.query.filter_by(project_id=project_id, status='done').count()
+    stats = status_stats(project_id)
     return jsonify({
-        'total': total,
-        'completed': completed,
-        'in_progress': Item.query.filter_by(project_id=project_id, status='inprogress').count(),
-        'todo': Item.query.filter_by(project_id=project_id, status='todo').count()
+        'total': stats['total'],
+        'completed': stats['done'],
+        'in_progress': stats['inprogress'],
+        'todo': stats['todo']
     }), 200
 
 @require_project_permission('manage_project')
@@ -132,9 +135,10 @@ def delete_project(project_id):
     project = Project.query.get(project_id)
     if not project:
         return jsonify({'error': 'Project not found'}), 404
-    db.session.delete(project)
+    counts = deletion.delete_project(project_id)
     db.session.commit()
-    return jsonify({'message': 'Project deleted'}), 200
+    invalidate_permissions(scope='project', scope_id=project_id)
+    return jsonify({'message': 'Project deleted', 'deleted': counts}), 200
 
 @require_project_permission('transfer_ownership')
 def transfer_ownership(project_id):
@@ -8,8 +8,9 @@ from controllers.rbac import require_project_permission
 from models.project_member import ProjectJoinRequest
 from flask_jwt_extended import get_jwt_identity
 from flask_jwt_extended import jwt_required
-from controllers.notification_controller import create_notification
-from controllers.rbac import is_admin
+from controllers.notification_controller import create_notification, notify_many
+from controllers.rbac import is_admin, invalidate_permissions, invalidate_project_membership
+from controllers.serialization import MEMBER
 
 @require_project_permission('add_remove_members')
 def add_member(project_id):
@@ -53,6 +54,7 @@ def remove_member(project_id, user_id):
             return jsonify({'error': 'Cannot remove the only Project Owner from the project.'}), 400
     db.session.delete(member)
     db.session.commit()
+    invalidate_project_membership(user_id, project_id)
     return jsonify({'message': 'Member removed'}), 200
 
 @require_project_permission('add_remove_members')
@@ -85,21 +87,15 @@ def update_member_role(project_id, user_id):
             return jsonify({'error': 'Cannot demote the only Project Owner from the project.'}), 400
     member.role_id = role.id
     db.session.commit()
+    invalidate_permissions(scope='project', scope_id=project_id)
     return jsonify({'message': 'Role updated'}), 200
 
 @require_project_permission('view_project_settings')
 def list_members(project_id):
-    members = ProjectMember.query.filter_by(project_id=project_id).all()
-    result = []
-    for m in members:
-        user = User.query.get(m.user_id)
-        result.append({
-            'user_id': m.user_id,
-            'username': user.username if user else None,
-            'email': user.email if user else None,
-            'role': m.role.name if m.role else None
-        })
-    return jsonify({'members': result}), 200
+    rows = MEMBER.query(ProjectMember).filter_by(project_id=project_id) \
+        .outerjoin(User, User.id == ProjectMember.user_id) \
+        .outerjoin(Role, Role.id == ProjectMember.role_id)
+    return jsonify({'members': MEMBER.dump_many(rows)}), 200
 
 def request_to_join_project(project_id, user_id):
     if ProjectMember.query.filter_by(project_id=project_id, user_id=user_id).first():
@@ -118,8 +114,7 @@ def request_to_join_project(project_id, user_id):
         ProjectMember.project_id == project_id,
         ProjectMember.role.has(Role.name.in_(['Project Owner', 'Project Manager']))
     ).all()
-    for m in managers:
-        create_notification(m.user_id, f"New join request for project {project_id}.")
+    notify_many([m.user_id for m in managers], f"New join request for project {project_id}.")
     return jsonify({'message': 'Join request submitted'}), 200
 
 @require_project_permission('add_remove_members')
@@ -154,6 +149,7 @@ def accept_join_request(project_id, request_id):
     db.session.add(member)
     req.status = 'accepted'
     db.session.commit()
+    invalidate_project_membership(req.user_id, project_id)
     create_notification(req.user_id, f"Your join request for project {project_id} was accepted.")
     return jsonify({'message': 'Request accepted, user added'}), 200
 
@@ -196,13 +192,13 @@ def accept_invitation(project_id, invite_id, user_id):
     db.session.add(member)
     inv.status = 'accepted'
     db.session.commit()
+    invalidate_project_membership(user_id, project_id)
     # Notify all project owners/managers
     managers = ProjectMember.query.filter(
         ProjectMember.project_id == project_id,
         ProjectMember.role.has(Role.name.in_(['Project Owner', 'Project Manager']))
     ).all()
-    for m in managers:
-        create_notification(m.user_id, f"User {user_id} accepted invitation to project {project_id}.")
+    notify_many([m.user_id for m in managers], f"User {user_id} accepted invitation to project {project_id}.")
     return jsonify({'message': 'Invitation accepted, user added'}), 200
 
 def reject_invitation(project_id, invite_id, user_id):
@@ -216,6 +212,5 @@ def reject_invitation(project_id, invite_id, user_id):
         ProjectMember.project_id == project_id,
         ProjectMember.role.has(Role.name.in_(['Project Owner', 'Project Manager']))
     ).all()
-    for m in managers:
-        create_notification(m.user_id, f"User {user_id} rejected invitation to project {project_id}.")
+    notify_many([m.user_id for m in managers], f"User {user_id} rejected invitation to project {project_id}.")
     return jsonify({'message': 'Invitation rejected'}), 200
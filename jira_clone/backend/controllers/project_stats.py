@@ -0,0 +1,162 @@
+from collections import Counter
+import click
+from sqlalchemy import event, func, delete, select, union
+from sqlalchemy.orm.attributes import get_history
+from models.db import db
+from models.item import Item
+from models.project import Project
+from models.user import User
+from models.project_stats import ProjectStats, UserTaskStats
+
+# Item columns counted per project
+DIMENSIONS = ('status', 'type')
+
+
+def _upsert(session, table, key_cols, values, counter_col, delta):
+    dialect = session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise RuntimeError(f'Project stats upsert is not implemented for {dialect}')
+    stmt = insert(table).values(**values, **{counter_col: delta})
+    stmt = stmt.on_conflict_do_update(
+        index_elements=key_cols,
+        set_={counter_col: table.c[counter_col] + delta},
+    )
+    session.connection().execute(stmt)
+
+
+def apply_deltas(session, project_deltas, user_deltas):
+    """
+    Apply count changes in the current transaction.
+    project_deltas: Counter of (project_id, dimension, value) -> delta
+    user_deltas: Counter of user_id -> delta
+    """
+    for (project_id, dimension, value), delta in sorted(project_deltas.items()):
+        if delta and value is not None:
+            _upsert(session, ProjectStats.__table__, ['project_id', 'dimension', 'value'],
+                    {'project_id': project_id, 'dimension': dimension, 'value': value}, 'count', delta)
+    for user_id, delta in sorted(user_deltas.items()):
+        if delta:
+            _upsert(session, UserTaskStats.__table__, ['user_id'], {'user_id': user_id}, 'task_count', delta)
+
+
+def count_rows(rows, sign, project_deltas, user_deltas):
+    # rows: mappings with project_id, status, type, reporter_id, assignee_id
+    for row in rows:
+        for dimension in DIMENSIONS:
+            project_deltas[(row['project_id'], dimension, row[dimension])] += sign
+        for user_id in {row['reporter_id'], row['assignee_id']} - {None}:
+            user_deltas[int(user_id)] += sign
+
+
+_TRACKED = ('project_id', 'reporter_id', 'assignee_id') + DIMENSIONS
+
+
+def _values(item, old):
+    values = {}
+    for attr in _TRACKED:
+        if old:
+            history = get_history(item, attr)
+            if history.deleted:
+                values[attr] = history.deleted[0]
+            elif history.unchanged:
+                values[attr] = history.unchanged[0]
+            else:
+                values[attr] = getattr(item, attr)
+        else:
+            values[attr] = getattr(item, attr)
+    return values
+
+
+def _tracked_changed(item):
+    return any(get_history(item, attr).has_changes() for attr in _TRACKED)
+
+
+@event.listens_for(db.session, 'before_flush')
+def _track_item_changes(session, flush_context, instances):
+    project_deltas, user_deltas = Counter(), Counter()
+    for obj in session.new:
+        if isinstance(obj, Item):
+            count_rows([_values(obj, old=False)], 1, project_deltas, user_deltas)
+    for obj in session.dirty:
+        if isinstance(obj, Item) and _tracked_changed(obj):
+            count_rows([_values(obj, old=True)], -1, project_deltas, user_deltas)
+            count_rows([_values(obj, old=False)], 1, project_deltas, user_deltas)
+    for obj in session.deleted:
+        if isinstance(obj, Item):
+            count_rows([_values(obj, old=True)], -1, project_deltas, user_deltas)
+    apply_deltas(session, project_deltas, user_deltas)
+    # Rows keyed on a deleted project/user would block the parent delete
+    for obj in session.deleted:
+        if isinstance(obj, Project):
+            session.connection().execute(delete(ProjectStats.__table__).where(ProjectStats.project_id == obj.id))
+        elif isinstance(obj, User):
+            session.connection().execute(delete(UserTaskStats.__table__).where(UserTaskStats.user_id == obj.id))
+
+
+def project_counts(project_id, dimension):
+    rows = db.session.query(ProjectStats.value, ProjectStats.count) \
+        .filter_by(project_id=project_id, dimension=dimension).all()
+    return {value: count for value, count in rows if count}
+
+
+def user_task_count(user_id):
+    count = db.session.query(UserTaskStats.task_count).filter_by(user_id=user_id).scalar()
+    return count or 0
+
+
+def rebuild_stats(project_id=None):
+    """Recompute counters from the item table, for all projects or just one."""
+    stats = ProjectStats.__table__
+    if project_id is None:
+        db.session.execute(delete(stats))
+    else:
+        db.session.execute(delete(stats).where(stats.c.project_id == project_id))
+    for dimension in DIMENSIONS:
+        column = getattr(Item, dimension)
+        query = select(Item.project_id, column, func.count(Item.id)).group_by(Item.project_id, column)
+        if project_id is not None:
+            query = query.where(Item.project_id == project_id)
+        rows = [{'project_id': pid, 'dimension': dimension, 'value': value, 'count': count}
+                for pid, value, count in db.session.execute(query) if value is not None]
+        if rows:
+            db.session.execute(stats.insert(), rows)
+    # Per-user counts span projects, so they are always rebuilt in full
+    refresh_user_counts()
+    db.session.commit()
+
+
+def refresh_user_counts(user_ids=None):
+    """Recount task involvement for the given users (all when None), in the current transaction."""
+    reporters = select(Item.id.label('item_id'), Item.reporter_id.label('user_id'))
+    assignees = select(Item.id.label('item_id'), Item.assignee_id.label('user_id')).where(Item.assignee_id.isnot(None))
+    stats = UserTaskStats.__table__
+    if user_ids is not None:
+        user_ids = list(set(user_ids) - {None})
+        if not user_ids:
+            return
+        reporters = reporters.where(Item.reporter_id.in_(user_ids))
+        assignees = assignees.where(Item.assignee_id.in_(user_ids))
+    involvement = union(reporters, assignees).subquery()
+    user_rows = [{'user_id': user_id, 'task_count': count} for user_id, count in db.session.execute(
+        select(involvement.c.user_id, func.count()).group_by(involvement.c.user_id))]
+    if user_ids is None:
+        db.session.execute(delete(stats))
+    else:
+        db.session.execute(delete(stats).where(stats.c.user_id.in_(user_ids)))
+    if user_rows:
+        db.session.execute(stats.insert(), user_rows)
+
+
+def init_app(app):
+    @app.cli.command('rebuild-stats')
+    @click.option('--project-id', type=int, default=None, help='Only rebuild this project')
+    def rebuild_stats_command(project_id):
+        """Repair drift in the materialized project/user counters (and catch up flow buckets)."""
+        from controllers.timeseries import rollup, rollup_all
+        rebuild_stats(project_id)
+        days = rollup_all() if project_id is None else rollup(project_id)
+        click.echo(f'Project stats rebuilt; {days} project-days of flow buckets rolled up.')
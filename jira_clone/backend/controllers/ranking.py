@@ -0,0 +1,282 @@
+"""
+Lexicographic rank keys for board columns and cards.
+
+A key is a base-36 fraction written without the leading "0." (so "i" is 0.5) and never
+ends in "0". Between any two keys there is always another one, so moving a card or column
+rewrites only that row. Keys grow by about one character per repeated insert at the same
+spot; once one passes MAX_RANK_LENGTH its siblings are re-spaced in the background.
+Moves and re-spacing both lock the list's owner row (the column for cards, the project
+for columns) first, so a move never computes a key from ranks that are being rewritten.
+Appends to the end of a list count up at a fixed width instead (rank_after), so they
+don't grow keys at all.
+"""
+import logging
+import math
+import threading
+from collections import defaultdict
+from datetime import datetime
+import click
+from flask import current_app, request, jsonify
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event, func
+from sqlalchemy.orm.attributes import get_history
+from models.db import db
+from models.item import Item
+from models.board_column import BoardColumn
+from controllers.rbac import require_project_permission
+
+logger = logging.getLogger(__name__)
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+MAX_RANK_LENGTH = 16
+APPEND_WIDTH = 5  # appends count up in the 5th digit: ~1.7M per leading digit before a key grows
+
+
+def rank_between(before=None, after=None):
+    """A key strictly between `before` and `after`; None means the start/end of the list."""
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f'{before!r} must sort before {after!r}')
+    return _midpoint(before or '', after)
+
+
+def _midpoint(a, b):
+    if b is not None:
+        # Carry over the common prefix (a is padded with '0's)
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else '0') == b[n]:
+            n += 1
+        if n:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else BASE
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    if b is not None and len(b) > 1:
+        return b[0]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def spaced_ranks(count):
+    """`count` evenly spaced keys of equal length, for (re)numbering a whole list."""
+    width = max(1, math.ceil(math.log(count + 1, BASE)) + 1)
+    step = BASE ** width // (count + 1)
+    ranks = []
+    for i in range(1, count + 1):
+        value, digits = i * step, []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        ranks.append(''.join(reversed(digits)).rstrip('0'))
+    return ranks
+
+
+def rank_after(last):
+    """
+    The key for appending after `last`: `last` plus one in its last place (at least
+    APPEND_WIDTH digits), so repeated appends don't lengthen keys the way halving does.
+    """
+    if not last:
+        return rank_between(None, None)
+    digits = [DIGITS.index(c) for c in last.ljust(APPEND_WIDTH, '0')]
+    for i in reversed(range(len(digits))):
+        if digits[i] < BASE - 1:
+            # Trailing 'z's carry over and become (dropped) zeros
+            return ''.join(DIGITS[d] for d in digits[:i]) + DIGITS[digits[i] + 1]
+    # All 'z': there is no room left at this length
+    return last + rank_between(None, None)
+
+
+def ranks_after(last, count):
+    """`count` ascending keys after `last`, as `count` successive appends."""
+    ranks = []
+    for _ in range(count):
+        last = rank_after(last)
+        ranks.append(last)
+    return ranks
+
+
+def last_rank(model, scope_col, scope_id):
+    return db.session.query(func.max(model.rank)).filter(scope_col == scope_id).scalar()
+
+
+@event.listens_for(db.session, 'before_flush')
+def _assign_ranks(session, flush_context, instances):
+    # New cards/columns without a rank, and cards moved to another column without
+    # an explicit rank, go to the end of their list.
+    pending = defaultdict(list)
+    for obj in session.new:
+        if isinstance(obj, Item) and not obj.rank and obj.column_id:
+            pending[(Item, obj.column_id)].append(obj)
+        elif isinstance(obj, BoardColumn) and not obj.rank and obj.project_id:
+            pending[(BoardColumn, obj.project_id)].append(obj)
+    for obj in session.dirty:
+        if isinstance(obj, Item) and get_history(obj, 'column_id').has_changes() \
+                and not get_history(obj, 'rank').has_changes():
+            obj.rank = None
+            pending[(Item, obj.column_id)].append(obj)
+    for (model, scope_id), objs in pending.items():
+        scope_col = Item.column_id if model is Item else BoardColumn.project_id
+        with session.no_autoflush:
+            last = last_rank(model, scope_col, scope_id)
+        objs.sort(key=lambda o: (getattr(o, 'order', 0) or 0, o.id or 0))
+        for obj in objs:
+            last = obj.rank = rank_after(last)
+
+
+def _lock_scope(model, scope_id):
+    # Row lock on the list's owner; SQLite has no FOR UPDATE and serializes writers anyway
+    from models.project import Project
+    owner = BoardColumn if model is Item else Project
+    db.session.query(owner.id).filter(owner.id == scope_id).with_for_update().first()
+
+
+def rebalance(model, scope_id):
+    """
+    Re-space every rank in one column (cards) or project (columns); returns rows written.
+    Only flushes: the caller commits, together with whatever else it is doing.
+    """
+    scope_col = Item.column_id if model is Item else BoardColumn.project_id
+    _lock_scope(model, scope_id)
+    rows = db.session.query(model.id).filter(scope_col == scope_id) \
+        .order_by(model.rank.asc().nulls_last(), model.created_at.asc(), model.id.asc()).all()
+    ranks = spaced_ranks(len(rows))
+    now = datetime.utcnow()
+    if rows:
+        # updated_at moves too, so board ETags change with the new order
+        db.session.bulk_update_mappings(model, [
+            {'id': row_id, 'rank': rank, 'updated_at': now} for (row_id,), rank in zip(rows, ranks)
+        ])
+    db.session.flush()
+    return len(rows)
+
+
+def _rebalance_async(model, scope_id):
+    app = current_app._get_current_object()
+
+    def run():
+        with app.app_context():
+            try:
+                rebalance(model, scope_id)
+                db.session.commit()
+            except Exception:
+                logger.exception('Rank rebalance failed for %s %s', model.__name__, scope_id)
+                db.session.rollback()
+            finally:
+                db.session.remove()
+
+    threading.Thread(target=run, name='rank-rebalance', daemon=True).start()
+
+
+def _neighbour_rank(model, row_id, scope_col, scope_id):
+    """Rank of a neighbour in the same list; raises LookupError if it isn't there."""
+    row = db.session.query(model.rank).filter(model.id == row_id, scope_col == scope_id).first()
+    if row is None:
+        raise LookupError(row_id)
+    return row.rank
+
+
+def _place(model, obj, scope_col, scope_id, before_id, after_id):
+    """
+    Rank `obj` between its new neighbours; a one-row update except for legacy unranked lists,
+    which are numbered first. Nothing is committed.
+    """
+    _lock_scope(model, scope_id)
+    for attempt in range(2):
+        before = _neighbour_rank(model, before_id, scope_col, scope_id) if before_id else None
+        after = _neighbour_rank(model, after_id, scope_col, scope_id) if after_id else None
+        if before_id is None and after_id is not None and after is not None:
+            before = db.session.query(func.max(model.rank)) \
+                .filter(scope_col == scope_id, model.rank < after, model.id != obj.id).scalar()
+        elif after_id is None and before_id is not None and before is not None:
+            after = db.session.query(func.min(model.rank)) \
+                .filter(scope_col == scope_id, model.rank > before, model.id != obj.id).scalar()
+        elif before_id is None and after_id is None:
+            before = db.session.query(func.max(model.rank)) \
+                .filter(scope_col == scope_id, model.id != obj.id).scalar()
+        if (before_id and before is None) or (after_id and after is None):
+            if attempt:
+                break
+            # Rows created before ranks existed: number the list once, then place
+            rebalance(model, scope_id)
+            continue
+        obj.rank = rank_after(before) if after is None else rank_between(before, after)
+        return obj.rank
+    raise ValueError('Could not rank the list')
+
+
+@require_project_permission('edit_any_task', allow_own='edit_own_task')
+def move_item(item_id):
+    """
+    POST body: {before_id, after_id, column_id?}. before_id is the card that should end up
+    directly above this one and after_id the card directly below; either may be null for
+    the top/bottom of the column. column_id defaults to the current column.
+    """
+    item = Item.query.get(item_id)
+    if not item:
+        return jsonify({'error': f'Item not found: {item_id}'}), 404
+    data = request.get_json() or {}
+    column_id = data.get('column_id') or item.column_id
+    column = BoardColumn.query.get(column_id)
+    if not column or column.project_id != item.project_id:
+        return jsonify({'error': 'Column not found in this project'}), 404
+    before_id, after_id = data.get('before_id'), data.get('after_id')
+    if item.id in (before_id, after_id):
+        return jsonify({'error': 'An item cannot be placed next to itself'}), 400
+    old_column = item.column_id
+    try:
+        rank = _place(Item, item, Item.column_id, column_id, before_id, after_id)
+    except LookupError as e:
+        db.session.rollback()
+        return jsonify({'error': f'Neighbour {e.args[0]} is not in column {column_id}'}), 409
+    except ValueError:
+        db.session.rollback()
+        return jsonify({'error': 'Neighbours are out of order; reload the board'}), 409
+    # Set after ranking so the flush hook doesn't also append it to the new column
+    item.column_id = column_id
+    if old_column != column_id:
+        from controllers.item_controller import log_activity
+        log_activity(item.id, get_jwt_identity(), 'updated', f'column_id: {old_column} -> {column_id}',
+                     project_id=item.project_id)
+    db.session.commit()
+    if len(rank) > MAX_RANK_LENGTH:
+        _rebalance_async(Item, column_id)
+    return jsonify({'message': 'Item moved', 'item': {'id': item.id, 'column_id': column_id, 'rank': rank}}), 200
+
+
+@require_project_permission('manage_project')
+def move_column(column_id):
+    """POST body: {before_id, after_id} — the columns that should end up left and right of this one."""
+    column = BoardColumn.query.get(column_id)
+    if not column:
+        return jsonify({'error': 'Column not found'}), 404
+    data = request.get_json() or {}
+    before_id, after_id = data.get('before_id'), data.get('after_id')
+    if column.id in (before_id, after_id):
+        return jsonify({'error': 'A column cannot be placed next to itself'}), 400
+    try:
+        rank = _place(BoardColumn, column, BoardColumn.project_id, column.project_id, before_id, after_id)
+    except LookupError as e:
+        db.session.rollback()
+        return jsonify({'error': f'Neighbour {e.args[0]} is not in this project'}), 409
+    except ValueError:
+        db.session.rollback()
+        return jsonify({'error': 'Neighbours are out of order; reload the board'}), 409
+    db.session.commit()
+    if len(rank) > MAX_RANK_LENGTH:
+        _rebalance_async(BoardColumn, column.project_id)
+    return jsonify({'message': 'Column moved', 'column': {'id': column.id, 'rank': rank}}), 200
+
+
+def init_app(app):
+    @app.cli.command('rebalance-ranks')
+    def rebalance_ranks_command():
+        """Re-space rank keys of every board column and card (also backfills missing ranks)."""
+        from models.project import Project
+        for (project_id,) in db.session.query(Project.id).all():
+            rebalance(BoardColumn, project_id)
+            db.session.commit()
+        for (column_id,) in db.session.query(BoardColumn.id).all():
+            rebalance(Item, column_id)
+            db.session.commit()
+        click.echo('Ranks rebalanced.')
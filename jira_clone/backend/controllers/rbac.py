@@ -1,48 +1,124 @@
 from functools import wraps
-from flask import request, jsonify
+from flask import request, jsonify, g, has_app_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import select, union_all, literal
+from models.db import db
 from models.project_member import ProjectMember
 from models.team_member import TeamMember
-from models.role import Role
+from models.role import Role, role_permissions
 from models.permission import Permission
 from models.item import Item
+from models.board_column import BoardColumn
 from models.user import User
 from models.team import Team
 from models.project import Project
+from controllers.permission_cache import permission_cache
 
-def is_admin(user_id):
-    user = User.query.get(user_id)
-    admin_role = Role.query.filter_by(name='Firm Admin', scope='firm').first()
-    # Check if user is the only admin (by email or username)
-    return user and user.email == 'admin@example.com'
+ADMIN_EMAIL = 'admin@example.com'
+# Sentinel action returned in the firm scope for the admin user; grants everything.
+ADMIN_ACTION = '*'
 
 
-def has_permission(user_id, action, team_id=None, project_id=None):
-    # 0. Admin override: admin user has all permissions
-    if is_admin(user_id):
-        return True
-
-    # 1. Check firm-level roles (if any)
-    firm_roles = Role.query.filter_by(scope='firm').all()
-    firm_role_ids = [r.id for r in firm_roles]
-    firm_memberships = TeamMember.query.filter_by(user_id=user_id).filter(TeamMember.role_id.in_(firm_role_ids)).all()
-    for membership in firm_memberships:
-        if any(p.action == action for p in membership.role.permissions):
-            return True
-
-    # 2. Check team-level roles
-    if team_id:
-        team_member = TeamMember.query.filter_by(user_id=user_id, team_id=team_id).first()
-        if team_member and team_member.role and any(p.action == action for p in team_member.role.permissions):
-            return True
+def _request_memo():
+    # Per-request memo of resolved scopes, keyed by (user_id, scope, scope_id).
+    if not has_app_context():
+        return {}
+    memo = getattr(g, '_rbac_permissions', None)
+    if memo is None:
+        memo = g._rbac_permissions = {}
+    return memo
+
+
+def _role_actions(member_model, scope, where):
+    return (
+        select(literal(scope).label('scope'), Permission.action.label('action'))
+        .select_from(member_model)
+        .join(role_permissions, role_permissions.c.role_id == member_model.role_id)
+        .join(Permission, Permission.id == role_permissions.c.permission_id)
+        .where(*where)
+    )
+
 
-    # 3. Check project-level roles
+def _load_scopes(user_id, scopes):
+    """Resolve the permission actions of several (scope, scope_id) pairs in one query."""
+    parts = []
+    for scope, scope_id in scopes:
+        if scope == 'firm':
+            parts.append(
+                select(literal('firm').label('scope'), literal(ADMIN_ACTION).label('action'))
+                .where(User.id == user_id, User.email == ADMIN_EMAIL)
+            )
+            parts.append(_role_actions(TeamMember, 'firm', [
+                TeamMember.user_id == user_id,
+                TeamMember.role_id.in_(select(Role.id).where(Role.scope == 'firm')),
+            ]))
+        elif scope == 'team':
+            parts.append(_role_actions(TeamMember, 'team', [
+                TeamMember.user_id == user_id, TeamMember.team_id == scope_id]))
+        elif scope == 'project':
+            parts.append(_role_actions(ProjectMember, 'project', [
+                ProjectMember.user_id == user_id, ProjectMember.project_id == scope_id]))
+    found = {scope: set() for scope, _ in scopes}
+    for row in db.session.execute(union_all(*parts)):
+        found[row.scope].add(row.action)
+    return {(user_id, scope, scope_id): frozenset(found[scope]) for scope, scope_id in scopes}
+
+
+def get_permissions(user_id, team_id=None, project_id=None):
+    """
+    Effective permission actions of a user for the given team/project scope.
+    Firm-level roles always apply; the result contains ADMIN_ACTION for the admin user.
+    """
+    user_id = int(user_id)
+    scopes = [('firm', None)]
+    if team_id:
+        scopes.append(('team', int(team_id)))
     if project_id:
-        project_member = ProjectMember.query.filter_by(user_id=user_id, project_id=project_id).first()
-        if project_member and project_member.role and any(p.action == action for p in project_member.role.permissions):
-            return True
+        scopes.append(('project', int(project_id)))
+    memo = _request_memo()
+    missing = []
+    for s in scopes:
+        key = (user_id,) + s
+        if key in memo:
+            continue
+        cached = permission_cache.get(key)
+        if cached is None:
+            missing.append(s)
+        else:
+            memo[key] = cached
+    if missing:
+        loaded = _load_scopes(user_id, missing)
+        for key, perms in loaded.items():
+            permission_cache.set(key, perms)
+        memo.update(loaded)
+    return frozenset().union(*(memo[(user_id,) + s] for s in scopes))
 
+
+def invalidate_permissions(user_id=None, scope=None, scope_id=None):
+    """Forget cached permission sets after a role or membership change has been committed."""
+    permission_cache.invalidate(user_id=user_id, scope=scope, scope_id=scope_id)
+    _request_memo().clear()
+
+
+def invalidate_team_membership(user_id, team_id):
+    # Firm roles are granted through TeamMember rows, so the firm scope changes too.
+    invalidate_permissions(user_id=user_id, scope='team', scope_id=team_id)
+    invalidate_permissions(user_id=user_id, scope='firm')
+
+
+def invalidate_project_membership(user_id, project_id):
+    invalidate_permissions(user_id=user_id, scope='project', scope_id=project_id)
+
+
+def is_admin(user_id):
+    if not user_id:
         return False
+    return ADMIN_ACTION in get_permissions(user_id)
+
+
+def has_permission(user_id, action, team_id=None, project_id=None):
+    perms = get_permissions(user_id, team_id=team_id, project_id=project_id)
+    return ADMIN_ACTION in perms or action in perms
 
 
 def require_permission(action, team_lookup=None, project_lookup=None):
@@ -82,6 +158,11 @@ def require_project_permission(action, allow_own=None):
                 item = Item.query.get(item_id)
                 if item:
                     project_id = item.project_id
+            column_id = kwargs.get('column_id') or (getattr(request, 'view_args', {}) or {}).get('column_id')
+            if not project_id and column_id:
+                column = BoardColumn.query.get(column_id)
+                if column:
+                    project_id = column.project_id
             if not project_id:
                 return jsonify({"error": "Project ID not found in request."}), 400
             # Check main permission
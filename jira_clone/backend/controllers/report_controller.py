@@ -1,54 +1,82 @@
 from flask import request, jsonify
+from sqlalchemy import func
+from models.db import db
 from models.project import Project
 from models.item import Item
 from models.project_member import ProjectMember
+from models.role import Role
 from models.user import User
-from controllers.rbac import require_project_permission 
+from controllers.rbac import require_project_permission
+from controllers.db_router import read_replica
+from controllers.pagination import page_args, keyset_page, InvalidCursor
+from controllers.project_stats import project_counts
+from controllers.serialization import ITEM_REPORT
 
+STATUSES = ('todo', 'inprogress', 'inreview', 'done')
+
+
+def breakdown(project_id, column):
+    # One GROUP BY over the project's items; {value: count}
+    rows = db.session.query(column, func.count(Item.id)) \
+        .filter(Item.project_id == project_id) \
+        .group_by(column).all()
+    return {value: count for value, count in rows}
+
+
+def status_stats(project_id, counts=None):
+    # Served from the materialized ProjectStats rows, not from the item table
+    if counts is None:
+        counts = project_counts(project_id, 'status')
+    stats = {'total': sum(counts.values())}
+    for status in STATUSES:
+        stats[status] = counts.get(status, 0)
+    return stats
+
+
+def assignee_breakdown(project_id):
+    rows = db.session.query(Item.assignee_id, User.username, func.count(Item.id)) \
+        .outerjoin(User, User.id == Item.assignee_id) \
+        .filter(Item.project_id == project_id) \
+        .group_by(Item.assignee_id, User.username).all()
+    return [{'assignee_id': assignee_id, 'username': username, 'count': count}
+            for assignee_id, username, count in rows]
+
+
+def project_members(project_id):
+    rows = db.session.query(User.id, User.username, User.email, Role.name) \
+        .join(ProjectMember, ProjectMember.user_id == User.id) \
+        .outerjoin(Role, Role.id == ProjectMember.role_id) \
+        .filter(ProjectMember.project_id == project_id).all()
+    return [{'id': uid, 'username': username, 'email': email, 'role': role}
+            for uid, username, email, role in rows]
+
+
+@read_replica
 @require_project_permission('view_tasks')
 def get_project_report(project_id):
-
     project = Project.query.get(project_id)
     if not project:
         return jsonify({'error': 'Project not found'}), 404
-    items = Item.query.filter_by(project_id=project_id).all()
-    members = ProjectMember.query.filter_by(project_id=project_id).all()
-    member_details = []
-    for m in members:
-        user = User.query.get(m.user_id)
-        if user:
-            member_details.append({
-                'id': user.id,
-                'username': user.username,
-                'email': user.email,
-                'role': m.role.name if m.role else None
-            })
-    status_counts = {}
-    for item in items:
-        status_counts[item.status] = status_counts.get(item.status, 0) + 1
-    # Add tasks field for frontend
-    tasks = [
-        {
-            'id': item.id,
-            'title': item.title,
-            'type': item.type,
-            'status': item.status,
-            'assignee_id': item.assignee_id,
-            'reporter_id': item.reporter_id,
-            'due_date': item.due_date.isoformat() if item.due_date else None
-        }
-        for item in items
-    ]
+    status_counts = project_counts(project_id, 'status')
     report = {
-        'project': { 'id': project.id, 'name': project.name },
-        'members': member_details,
-        'stats': {
-            'total': len(items),
-            'done': status_counts.get('done', 0),
-            'inprogress': status_counts.get('inprogress', 0),
-            'inreview': status_counts.get('inreview', 0),
-            'todo': status_counts.get('todo', 0),
+        'project': {'id': project.id, 'name': project.name, 'description': project.description},
+        'members': project_members(project_id),
+        'stats': status_stats(project_id, status_counts),
+        'breakdowns': {
+            'status': status_counts,
+            'type': project_counts(project_id, 'type'),
+            'priority': {k or 'none': v for k, v in breakdown(project_id, Item.priority).items()},
+            'assignee': assignee_breakdown(project_id),
         },
-        'tasks': tasks
     }
-    return jsonify({'report': report}), 200
\ No newline at end of file
+    # The per-task listing is opt-in and paginated; aggregates above never load rows
+    if request.args.get('include_tasks', '').lower() in ('1', 'true', 'yes'):
+        limit, cursor, _ = page_args()
+        query = ITEM_REPORT.query(Item).filter_by(project_id=project_id)
+        try:
+            items, next_cursor = keyset_page(query, Item.created_at, Item.id, cursor=cursor, limit=limit)
+        except InvalidCursor:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        report['tasks'] = ITEM_REPORT.dump_many(items)
+        report['next_cursor'] = next_cursor
+    return jsonify({'report': report}), 200
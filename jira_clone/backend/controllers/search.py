@@ -0,0 +1,246 @@
+import logging
+import re
+import weakref
+import click
+from flask import request, jsonify
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event, text, bindparam, select, or_, inspect
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm.attributes import get_history
+from models.db import db
+from models.item import Item
+from models.comment import Comment
+from models.project_member import ProjectMember
+from models.role import role_permissions
+from models.permission import Permission
+from controllers.rbac import get_permissions, ADMIN_ACTION
+from controllers.db_router import read_replica
+
+logger = logging.getLogger(__name__)
+
+MAX_PAGE = 50
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+_INDEXED_FIELDS = ('title', 'description', 'steps_to_reproduce', 'project_id')
+
+# Postgres: weighted tsvector per item (title A, description B, steps C, comments D) behind a GIN index
+_PG_DDL = [
+    """CREATE TABLE IF NOT EXISTS item_search_document (
+        item_id INTEGER PRIMARY KEY,
+        project_id INTEGER NOT NULL,
+        document TSVECTOR NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_item_search_document_gin ON item_search_document USING GIN (document)",
+    "CREATE INDEX IF NOT EXISTS ix_item_search_document_project ON item_search_document (project_id)",
+]
+_PG_DELETE = "DELETE FROM item_search_document WHERE item_id IN :ids"
+_PG_INSERT = """
+    INSERT INTO item_search_document (item_id, project_id, document)
+    SELECT i.id, i.project_id,
+        setweight(to_tsvector('english', coalesce(i.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(i.description, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(i.steps_to_reproduce, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(
+            (SELECT string_agg(c.content, ' ') FROM comment c WHERE c.item_id = i.id), '')), 'D')
+    FROM item i WHERE i.id IN :ids
+"""
+_PG_SEARCH = """
+    SELECT d.item_id, ts_rank(d.document, q) AS rank
+    FROM item_search_document d, websearch_to_tsquery('english', :q) q
+    WHERE d.document @@ q {scope}
+    ORDER BY rank DESC, d.item_id DESC
+    LIMIT :limit OFFSET :offset
+"""
+
+# SQLite (local testing): FTS5 table whose rowid is the item id; bm25 is negated so higher ranks first
+_SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS item_fts USING fts5(project_id UNINDEXED, title, body)",
+]
+_SQLITE_DELETE = "DELETE FROM item_fts WHERE rowid IN :ids"
+_SQLITE_INSERT = """
+    INSERT INTO item_fts (rowid, project_id, title, body)
+    SELECT i.id, i.project_id, i.title,
+        coalesce(i.description, '') || ' ' || coalesce(i.steps_to_reproduce, '') || ' ' ||
+        coalesce((SELECT group_concat(c.content, ' ') FROM comment c WHERE c.item_id = i.id), '')
+    FROM item i WHERE i.id IN :ids
+"""
+_SQLITE_SEARCH = """
+    SELECT rowid AS item_id, -bm25(item_fts, 0.0, 10.0, 1.0) AS rank
+    FROM item_fts
+    WHERE item_fts MATCH :q {scope}
+    ORDER BY rank DESC, rowid DESC
+    LIMIT :limit OFFSET :offset
+"""
+
+_DELETE_PROJECT = {
+    'postgresql': "DELETE FROM item_search_document WHERE project_id = :project_id",
+    'sqlite': "DELETE FROM item_fts WHERE project_id = :project_id",
+}
+
+_TABLES = {'postgresql': 'item_search_document', 'sqlite': 'item_fts'}
+
+_BACKENDS = {
+    'postgresql': (_PG_DDL, _PG_DELETE, _PG_INSERT, _PG_SEARCH, 'd.project_id'),
+    'sqlite': (_SQLITE_DDL, _SQLITE_DELETE, _SQLITE_INSERT, _SQLITE_SEARCH, 'project_id'),
+}
+# Per engine rather than per URL: two in-memory SQLite engines share 'sqlite://'
+_ready = weakref.WeakKeyDictionary()
+
+
+def _backend(connection):
+    """
+    SQL for this dialect, creating the index on first use; None means LIKE fallback.
+    Read-only replicas refuse the DDL, so there it is enough that the index already exists.
+    """
+    name = connection.dialect.name
+    if name not in _BACKENDS:
+        return None
+    key = connection.engine
+    if key not in _ready:
+        try:
+            with connection.begin_nested():
+                for ddl in _BACKENDS[name][0]:
+                    connection.execute(text(ddl))
+            _ready[key] = True
+        except DBAPIError:
+            _ready[key] = inspect(connection).has_table(_TABLES[name])
+            if not _ready[key]:
+                logger.warning('Full-text index unavailable on %s; search falls back to LIKE', name)
+    return _BACKENDS[name] if _ready[key] else None
+
+
+def reindex_items(connection, item_ids):
+    backend = _backend(connection)
+    if not backend or not item_ids:
+        return
+    ids = sorted(set(item_ids))
+    _, delete_sql, insert_sql, _, _ = backend
+    connection.execute(text(delete_sql).bindparams(bindparam('ids', expanding=True)), {'ids': ids})
+    connection.execute(text(insert_sql).bindparams(bindparam('ids', expanding=True)), {'ids': ids})
+
+
+def remove_project_documents(connection, project_id):
+    if _backend(connection):
+        connection.execute(text(_DELETE_PROJECT[connection.dialect.name]), {'project_id': project_id})
+
+
+@event.listens_for(db.session, 'before_flush')
+def _collect_deleted_search_documents(session, flush_context, instances):
+    # Comment.item_id of a deleted comment must be read before the row is gone
+    session.info['search_stale'] = {
+        obj.id if isinstance(obj, Item) else obj.item_id
+        for obj in session.deleted if isinstance(obj, (Item, Comment))
+    }
+
+
+@event.listens_for(db.session, 'after_flush')
+def _refresh_search_documents(session, flush_context):
+    stale = session.info.pop('search_stale', set())
+    for obj in session.new:
+        if isinstance(obj, Item):
+            stale.add(obj.id)
+        elif isinstance(obj, Comment):
+            stale.add(obj.item_id)
+    for obj in session.dirty:
+        if isinstance(obj, Item) and any(get_history(obj, f).has_changes() for f in _INDEXED_FIELDS):
+            stale.add(obj.id)
+        elif isinstance(obj, Comment) and get_history(obj, 'content').has_changes():
+            stale.add(obj.item_id)
+    stale.discard(None)
+    if stale:
+        # Deleted items simply produce no row on re-insert
+        reindex_items(session.connection(), stale)
+
+
+def _viewable_projects(user_id):
+    """None means every project (admin or a firm role granting view_tasks)."""
+    firm = get_permissions(user_id)
+    if ADMIN_ACTION in firm or 'view_tasks' in firm:
+        return None
+    return select(ProjectMember.project_id) \
+        .join(role_permissions, role_permissions.c.role_id == ProjectMember.role_id) \
+        .join(Permission, Permission.id == role_permissions.c.permission_id) \
+        .where(ProjectMember.user_id == int(user_id), Permission.action == 'view_tasks')
+
+
+def _fts5_query(q):
+    # Quote each term so user input cannot inject FTS5 syntax; terms are ANDed
+    return ' '.join('"%s"' % term for term in re.findall(r'\w+', q))
+
+
+@read_replica
+def search_items():
+    user_id = get_jwt_identity()
+    q = (request.args.get('q') or '').strip()
+    if not q:
+        return jsonify({'error': 'Query parameter q is required'}), 400
+    try:
+        limit = max(1, min(int(request.args.get('limit', DEFAULT_LIMIT)), MAX_LIMIT))
+        page = max(1, min(int(request.args.get('page', 1)), MAX_PAGE))
+        project_id = request.args.get('project_id', type=int)
+    except ValueError:
+        return jsonify({'error': 'limit and page must be integers'}), 400
+
+    viewable = _viewable_projects(user_id)
+    project_ids = None
+    if viewable is not None:
+        project_ids = [pid for (pid,) in db.session.execute(viewable)]
+    if project_id is not None:
+        if project_ids is not None and project_id not in project_ids:
+            return jsonify({'error': "Forbidden: You lack 'view_tasks' permission."}), 403
+        project_ids = [project_id]
+    if project_ids is not None and not project_ids:
+        return jsonify({'results': [], 'page': page, 'limit': limit}), 200
+
+    connection = db.session.connection()
+    backend = _backend(connection)
+    params = {'limit': limit, 'offset': (page - 1) * limit}
+    if backend:
+        search_sql, project_col = backend[3], backend[4]
+        params['q'] = q if connection.dialect.name == 'postgresql' else _fts5_query(q)
+        if not params['q']:
+            return jsonify({'results': [], 'page': page, 'limit': limit}), 200
+        stmt = text(search_sql.format(scope=f'AND {project_col} IN :project_ids' if project_ids is not None else ''))
+        if project_ids is not None:
+            stmt = stmt.bindparams(bindparam('project_ids', expanding=True))
+            params['project_ids'] = project_ids
+        ranked = [(row.item_id, float(row.rank)) for row in connection.execute(stmt, params)]
+    else:
+        # No full-text index for this dialect: unranked substring match
+        like = f'%{q}%'
+        query = db.session.query(Item.id).filter(or_(Item.title.ilike(like), Item.description.ilike(like),
+                                                     Item.steps_to_reproduce.ilike(like)))
+        if project_ids is not None:
+            query = query.filter(Item.project_id.in_(project_ids))
+        ranked = [(item_id, 0.0) for (item_id,) in
+                  query.order_by(Item.id.desc()).limit(limit).offset(params['offset'])]
+
+    items = {i.id: i for i in Item.query.filter(Item.id.in_([item_id for item_id, _ in ranked]))} if ranked else {}
+    results = [{
+        'id': item.id,
+        'title': item.title,
+        'status': item.status,
+        'type': item.type,
+        'priority': item.priority,
+        'project_id': item.project_id,
+        'rank': rank,
+    } for item_id, rank in ranked for item in [items.get(item_id)] if item]
+    return jsonify({'results': results, 'page': page, 'limit': limit}), 200
+
+
+def rebuild_index(batch_size=1000):
+    connection = db.session.connection()
+    if not _backend(connection):
+        return 0
+    ids = [item_id for (item_id,) in db.session.query(Item.id).order_by(Item.id)]
+    for start in range(0, len(ids), batch_size):
+        reindex_items(connection, ids[start:start + batch_size])
+    db.session.commit()
+    return len(ids)
+
+
+def init_app(app):
+    @app.cli.command('rebuild-search')
+    def rebuild_search_command():
+        """Create the full-text index if needed and re-index every item."""
+        click.echo(f'Indexed {rebuild_index()} items.')
@@ -0,0 +1,132 @@
+"""
+Declared response serializers and the app's JSON backend.
+
+A Serializer is a list of columns. It selects exactly those columns and turns each Row into
+a dict with a closure over the (key, index) pairs worked out once from the declaration: no
+ORM instance is built and no per-field type checks run per row. Date and datetime columns
+come out as ISO strings, as the hand-written dicts did.
+
+    ITEM_ROW = Serializer(Item.id, Item.title, Item.due_date)
+    rows = ITEM_ROW.query(Item).filter_by(project_id=1).all()
+    ITEM_ROW.dump_many(rows)   # [{'id': 1, 'title': '...', 'due_date': '2026-10-18'}, ...]
+
+init_app() makes jsonify() use orjson when it is installed (JSON_BACKEND='auto'); set
+JSON_BACKEND='stdlib' to keep Flask's encoder.
+"""
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import Date, DateTime
+from sqlalchemy.orm import aliased
+from models.db import db
+from models.item import Item
+from models.user import User
+from models.comment import Comment
+from models.role import Role
+from models.project_member import ProjectMember
+from models.team import Team
+from models.project import Project
+from models.activity_log import ActivityLog
+
+try:
+    import orjson
+except ImportError:  # optional; Flask's stdlib encoder is used instead
+    orjson = None
+
+
+class Serializer:
+    def __init__(self, *columns, extra=()):
+        """`columns` are emitted, keyed by their name or label; `extra` are only selected (e.g. sort keys)."""
+        self.columns = columns + tuple(extra)
+        self.fields = tuple(column.key for column in columns)
+        self.dump = self._compile(columns)
+
+    @staticmethod
+    def _compile(columns):
+        fields = tuple((column.key, index) for index, column in enumerate(columns))
+        dates = tuple((column.key, index) for index, column in enumerate(columns)
+                      if isinstance(column.type, (Date, DateTime)))
+
+        def dump(row):
+            data = {key: row[index] for key, index in fields}
+            # Reassigning keeps each date in its declared position
+            for key, index in dates:
+                value = row[index]
+                if value is not None:
+                    data[key] = value.isoformat()
+            return data
+        return dump
+
+    def query(self, entity):
+        """A Query for these columns FROM `entity`; filter_by() and joins start from it."""
+        return db.session.query(*self.columns).select_from(entity)
+
+    def dump_many(self, rows):
+        dump = self.dump
+        return [dump(row) for row in rows]
+
+
+# --- items ---
+ITEM_LIST = Serializer(Item.id, Item.title, Item.status, Item.assignee_id, Item.priority, Item.due_date,
+                       Item.parent_id, Item.type, extra=(Item.created_at,))
+ITEM_SUMMARY = Serializer(Item.id, Item.title, Item.status, Item.priority, Item.due_date)
+ITEM_TASK = Serializer(Item.id, Item.title, Item.description, Item.status, Item.type, Item.priority, Item.due_date,
+                       Item.project_id, Item.assignee_id, Item.reporter_id, Item.created_at, Item.updated_at)
+ITEM_REPORT = Serializer(Item.id, Item.title, Item.type, Item.status, Item.assignee_id, Item.reporter_id,
+                         Item.due_date, extra=(Item.created_at,))
+ITEM_EXPORT = Serializer(Item.id, Item.title, Item.description, Item.type, Item.status, Item.priority, Item.severity,
+                         Item.estimate, Item.due_date, Item.parent_id, Item.column_id, Item.rank, Item.assignee_id,
+                         Item.reporter_id, Item.created_at, Item.updated_at)
+_Assignee, _Reporter = aliased(User), aliased(User)
+ITEM_DETAIL = Serializer(
+    Item.id, Item.title, Item.description, Item.status, Item.priority, Item.due_date, Item.parent_id,
+    Item.assignee_id, _Assignee.username.label('assignee_name'),
+    Item.reporter_id, _Reporter.username.label('reporter_name'),
+    Item.type, Item.estimate, Item.column_id, Item.created_at, Item.updated_at,
+)
+
+
+def query_item_detail():
+    return ITEM_DETAIL.query(Item) \
+        .outerjoin(_Assignee, _Assignee.id == Item.assignee_id) \
+        .outerjoin(_Reporter, _Reporter.id == Item.reporter_id)
+
+
+COMMENT = Serializer(Comment.id, User.username.label('author_name'), Comment.content, Comment.user_id,
+                     Comment.created_at)
+ACTIVITY_EXPORT = Serializer(ActivityLog.id, ActivityLog.item_id, ActivityLog.user_id, ActivityLog.action,
+                             ActivityLog.details, ActivityLog.created_at)
+
+# --- people ---
+MEMBER = Serializer(ProjectMember.user_id, User.username, User.email, Role.name.label('role'))
+USER = Serializer(User.id, User.username, User.email)
+USER_TEAM = Serializer(Team.id, Team.name, Team.description, Team.manager_id, Role.name.label('role'))
+USER_PROJECT = Serializer(Project.id, Project.name, Project.description, Project.owner_team_id, Role.name.label('role'))
+
+
+# --- JSON backend ---
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    jsonify() through orjson. Dates and other types orjson would format differently are
+    passed to Flask's default hook, so responses keep the same values; keys aren't sorted.
+    """
+    sort_keys = False
+    _options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        option = self._options | (orjson.OPT_INDENT_2 if kwargs.get('indent') else 0)
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode()
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        option = self._options
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        body = orjson.dumps(obj, default=self.default, option=option | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_app(app):
+    backend = app.config.setdefault('JSON_BACKEND', 'auto')
+    if backend == 'orjson' and orjson is None:
+        raise RuntimeError("JSON_BACKEND='orjson' but orjson is not installed")
+    if backend in ('auto', 'orjson') and orjson is not None:
+        app.json = OrjsonProvider(app)
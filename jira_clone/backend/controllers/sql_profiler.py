@@ -0,0 +1,112 @@
+"""
+Opt-in per-request SQL profiling.
+
+With SQL_PROFILING on, every request records its statement count, total DB time,
+repeated statements (the N+1 signature) and wall time. The numbers go out in a
+Server-Timing header (visible in the browser's network panel) and slow requests, slow
+statements and N+1 patterns are logged. Off by default; the cursor hooks cost a couple
+of microseconds per statement.
+
+    SQL_PROFILING = True
+    SQL_SLOW_REQUEST_MS = 500     # log requests slower than this
+    SQL_SLOW_QUERY_MS = 100       # log single statements slower than this
+    SQL_REPEAT_THRESHOLD = 5      # log a statement run this many times in one request
+
+Blogging_Website/sql_profiler.py loads this file too, so it must only import Flask and
+SQLAlchemy, not anything from jira_clone.
+"""
+import logging
+import time
+from collections import Counter
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_PROFILE_KEY = 'sql_profile'
+_TIMER_KEY = 'sql_profile_started'
+
+
+class RequestProfile:
+    def __init__(self, slow_query_ms):
+        self.slow_query_ms = slow_query_ms
+        self.started = time.perf_counter()
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.repeats = Counter()
+
+    @property
+    def wall_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    @property
+    def db_ms(self):
+        return self.db_seconds * 1000
+
+    def duplicates(self, threshold=2):
+        """[(statement, times)] for statements issued at least `threshold` times, most first."""
+        return [(sql, n) for sql, n in self.repeats.most_common() if n >= threshold]
+
+
+def current_profile():
+    return g.get(_PROFILE_KEY) if has_request_context() else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_profile() is not None:
+        conn.info.setdefault(_TIMER_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = current_profile()
+    timers = conn.info.get(_TIMER_KEY)
+    if profile is None or not timers:
+        return
+    elapsed = time.perf_counter() - timers.pop()
+    profile.statements += 1
+    profile.db_seconds += elapsed
+    profile.repeats[statement] += 1
+    if elapsed * 1000 >= profile.slow_query_ms:
+        logger.warning('Slow query (%.1f ms) in %s %s: %s', elapsed * 1000, request.method, request.path,
+                       _shorten(statement))
+
+
+def _shorten(sql, limit=300):
+    sql = ' '.join(sql.split())
+    return sql if len(sql) <= limit else sql[:limit] + '...'
+
+
+def init_app(app):
+    app.config.setdefault('SQL_PROFILING', False)
+    app.config.setdefault('SQL_SLOW_REQUEST_MS', 500)
+    app.config.setdefault('SQL_SLOW_QUERY_MS', 100)
+    app.config.setdefault('SQL_REPEAT_THRESHOLD', 5)
+    if not app.config['SQL_PROFILING']:
+        return
+    # Listening on the Engine class covers every engine and bind, created now or later
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def _start_profile():
+        setattr(g, _PROFILE_KEY, RequestProfile(app.config['SQL_SLOW_QUERY_MS']))
+
+    @app.after_request
+    def _report_profile(response):
+        profile = g.pop(_PROFILE_KEY, None)
+        if profile is None:
+            return response
+        wall_ms, db_ms = profile.wall_ms, profile.db_ms
+        response.headers.add('Server-Timing', f'db;dur={db_ms:.1f};desc="{profile.statements} queries"')
+        response.headers.add('Server-Timing', f'app;dur={wall_ms - db_ms:.1f}')
+        response.headers.add('Server-Timing', f'total;dur={wall_ms:.1f}')
+        response.headers['X-Query-Count'] = str(profile.statements)
+        where = f'{request.method} {request.full_path.rstrip("?")} -> {response.status_code}'
+        if wall_ms >= app.config['SQL_SLOW_REQUEST_MS']:
+            logger.warning('Slow request %s: %.1f ms total, %.1f ms in %d queries',
+                           where, wall_ms, db_ms, profile.statements)
+        for sql, times in profile.duplicates(app.config['SQL_REPEAT_THRESHOLD']):
+            logger.warning('Possible N+1 in %s: statement ran %d times: %s', where, times, _shorten(sql))
+        return response
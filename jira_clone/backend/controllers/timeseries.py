@@ -0,0 +1,252 @@
+import re
+from collections import defaultdict
+from datetime import datetime, date, timedelta
+import click
+from flask import request, jsonify
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event, func, select, insert, delete, literal, union_all
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import get_history
+from models.db import db
+from models.item import Item
+from models.project import Project
+from models.activity_log import ActivityLog
+from models.item_event import ItemStatusEvent, ProjectDailyStatus
+from controllers.rbac import require_project_permission
+from controllers.db_router import read_replica
+
+MAX_DAYS = 365
+DONE_STATUS = 'done'
+
+
+def _current_user_id():
+    try:
+        user_id = get_jwt_identity()
+    except RuntimeError:
+        return None
+    return int(user_id) if user_id else None
+
+
+def _old(item, attr):
+    history = get_history(item, attr)
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(item, attr)
+
+
+@event.listens_for(db.session, 'before_flush')
+def _collect_deleted_items(session, flush_context, instances):
+    # Deletes are captured before the rows disappear; events and buckets of a
+    # deleted project go with it, ahead of the project row itself.
+    deleted_projects = {obj.id for obj in session.deleted if isinstance(obj, Project)}
+    for project_id in deleted_projects:
+        for table in (ItemStatusEvent.__table__, ProjectDailyStatus.__table__):
+            session.connection().execute(delete(table).where(table.c.project_id == project_id))
+    session.info['deleted_projects'] = deleted_projects
+    session.info['deleted_item_events'] = [
+        (_old(obj, 'project_id'), obj.id, _old(obj, 'status'), None)
+        for obj in session.deleted
+        if isinstance(obj, Item) and _old(obj, 'project_id') not in deleted_projects
+    ]
+
+
+@event.listens_for(db.session, 'after_flush')
+def _record_status_events(session, flush_context):
+    # New items only have an id once flushed, so events are written here
+    rows = session.info.pop('deleted_item_events', [])
+    deleted_projects = session.info.pop('deleted_projects', set())
+    for obj in session.new:
+        if isinstance(obj, Item) and obj.status:
+            rows.append((obj.project_id, obj.id, None, obj.status))
+    for obj in session.dirty:
+        if isinstance(obj, Item) and obj.project_id not in deleted_projects \
+                and get_history(obj, 'status').has_changes():
+            old, new = _old(obj, 'status'), obj.status
+            if old != new:
+                rows.append((obj.project_id, obj.id, old, new))
+    insert_status_events(session, rows)
+
+
+def insert_status_events(session, rows):
+    """rows: (project_id, item_id, from_status, to_status); for writes that bypass the flush."""
+    if rows:
+        now = datetime.utcnow()
+        user_id = _current_user_id()
+        session.connection().execute(insert(ItemStatusEvent.__table__), [
+            {'project_id': p, 'item_id': i, 'user_id': user_id, 'from_status': f, 'to_status': t, 'created_at': now}
+            for p, i, f, t in rows
+        ])
+
+
+def _as_date(value):
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _moves(project_id, start, end):
+    """+1/-1 per status for every event in [start, end), with its day."""
+    day = func.date(ItemStatusEvent.created_at)
+    window = [
+        ItemStatusEvent.project_id == project_id,
+        ItemStatusEvent.created_at >= datetime.combine(start, datetime.min.time()),
+        ItemStatusEvent.created_at < datetime.combine(end, datetime.min.time()),
+    ]
+    return union_all(
+        select(day.label('day'), ItemStatusEvent.to_status.label('status'), literal(1).label('delta'))
+        .where(ItemStatusEvent.to_status.isnot(None), *window),
+        select(day.label('day'), ItemStatusEvent.from_status.label('status'), literal(-1).label('delta'))
+        .where(ItemStatusEvent.from_status.isnot(None), *window),
+    ).subquery()
+
+
+def _daily_deltas(project_id, start, end):
+    """Net change per (day, status) for events in [start, end) as one GROUP BY."""
+    moves = _moves(project_id, start, end)
+    deltas = defaultdict(dict)
+    query = select(moves.c.day, moves.c.status, func.sum(moves.c.delta)).group_by(moves.c.day, moves.c.status)
+    for row_day, status, delta in db.session.execute(query):
+        deltas[_as_date(row_day)][status] = int(delta)
+    return deltas
+
+
+def _status_deltas(project_id, start, end):
+    """Net change per status over all of [start, end) as one GROUP BY."""
+    moves = _moves(project_id, start, end)
+    query = select(moves.c.status, func.sum(moves.c.delta)).group_by(moves.c.status)
+    return {status: int(delta) for status, delta in db.session.execute(query)}
+
+
+def _unrolled_buckets(project_id, until, since=None):
+    """
+    {day: {status: count}} for the days after the last stored bucket up to `until`,
+    computed from the events newer than that bucket. With `since`, days before it are
+    only folded into the starting counts, not returned. Only reads.
+    """
+    last = db.session.query(func.max(ProjectDailyStatus.day)).filter_by(project_id=project_id).scalar()
+    if last:
+        counts = {s: c for s, c in db.session.query(ProjectDailyStatus.status, ProjectDailyStatus.count)
+                  .filter_by(project_id=project_id, day=last)}
+        start = last + timedelta(days=1)
+    else:
+        first = db.session.query(func.min(ItemStatusEvent.created_at)).filter_by(project_id=project_id).scalar()
+        if not first:
+            return {}
+        counts, start = {}, first.date()
+    if since and since > start:
+        for status, delta in _status_deltas(project_id, start, since).items():
+            counts[status] = counts.get(status, 0) + delta
+        start = since
+    deltas = _daily_deltas(project_id, start, until + timedelta(days=1)) if start <= until else {}
+    buckets = {}
+    day = start
+    while day <= until:
+        for status, delta in deltas.get(day, {}).items():
+            counts[status] = counts.get(status, 0) + delta
+        buckets[day] = dict(counts)
+        day += timedelta(days=1)
+    return buckets
+
+
+def rollup(project_id, until=None):
+    """
+    Store the project's daily buckets up to `until` (default: yesterday), starting after
+    the last stored day. Run from the rollup-flow command (daily, e.g. from cron), never
+    from a request: it reads and writes the primary. Returns days written.
+    """
+    until = until or datetime.utcnow().date() - timedelta(days=1)
+    db.session.info['db_primary'] = True
+    buckets = _unrolled_buckets(project_id, until)
+    if not buckets:
+        return 0
+    rows = [{'project_id': project_id, 'day': day, 'status': s, 'count': c}
+            for day, counts in buckets.items() for s, c in counts.items()]
+    try:
+        db.session.execute(insert(ProjectDailyStatus.__table__), rows)
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent rollup already wrote these days
+        db.session.rollback()
+        return 0
+    return len(buckets)
+
+
+def rollup_all(until=None):
+    """rollup() for every project; returns days written."""
+    return sum(rollup(project_id, until) for (project_id,) in db.session.query(Project.id).all())
+
+
+def project_flow(project_id, days):
+    """Cumulative flow (count per status) and burndown (not-done remaining) for the last `days` days."""
+    today = datetime.utcnow().date()
+    start = today - timedelta(days=days - 1)
+    buckets = defaultdict(dict)
+    for day, status, count in db.session.query(ProjectDailyStatus.day, ProjectDailyStatus.status, ProjectDailyStatus.count) \
+            .filter(ProjectDailyStatus.project_id == project_id, ProjectDailyStatus.day >= start - timedelta(days=1)):
+        buckets[day][status] = count
+    # Days not rolled up yet (always including today, which is still open) come from
+    # the events; nothing is written, so this is safe on a replica. Without recent
+    # rollups, events before the window are only summed per status, not per day.
+    buckets.update(_unrolled_buckets(project_id, today, since=start))
+    series = []
+    day = start
+    while day <= today:
+        counts = {s: c for s, c in buckets.get(day, {}).items() if c}
+        total = sum(counts.values())
+        done = counts.get(DONE_STATUS, 0)
+        series.append({'date': day.isoformat(), 'counts': counts, 'total': total, 'done': done, 'remaining': total - done})
+        day += timedelta(days=1)
+    return series
+
+
+@read_replica
+@require_project_permission('view_tasks')
+def get_project_flow(project_id):
+    try:
+        days = int(request.args.get('days', 30))
+    except ValueError:
+        return jsonify({'error': 'days must be an integer'}), 400
+    days = max(1, min(days, MAX_DAYS))
+    return jsonify({'project_id': project_id, 'days': days, 'series': project_flow(project_id, days)}), 200
+
+
+_STATUS_CHANGE = re.compile(r'status: (\S+) -> (\S+)')
+
+
+def backfill_events():
+    """
+    One-off import of history recorded before structured events existed: parses the
+    'status: a -> b' text of ActivityLog and seeds a creation event per item.
+    """
+    db.session.execute(delete(ProjectDailyStatus.__table__))
+    db.session.execute(delete(ItemStatusEvent.__table__))
+    items = {i.id: i for i in db.session.query(Item.id, Item.project_id, Item.status, Item.created_at)}
+    transitions = defaultdict(list)
+    for log in db.session.query(ActivityLog.item_id, ActivityLog.user_id, ActivityLog.details, ActivityLog.created_at) \
+            .filter(ActivityLog.details.like('%status: %')).order_by(ActivityLog.created_at, ActivityLog.id):
+        match = _STATUS_CHANGE.search(log.details or '')
+        if match and log.item_id in items:
+            transitions[log.item_id].append((log.user_id, match.group(1), match.group(2), log.created_at))
+    rows = []
+    for item_id, item in items.items():
+        moves = transitions.get(item_id, [])
+        initial = moves[0][1] if moves else item.status
+        rows.append({'project_id': item.project_id, 'item_id': item_id, 'user_id': None,
+                     'from_status': None, 'to_status': initial, 'created_at': item.created_at or datetime.utcnow()})
+        for user_id, old, new, created_at in moves:
+            rows.append({'project_id': item.project_id, 'item_id': item_id, 'user_id': user_id,
+                         'from_status': old, 'to_status': new, 'created_at': created_at})
+    for start in range(0, len(rows), 1000):
+        db.session.execute(insert(ItemStatusEvent.__table__), rows[start:start + 1000])
+    db.session.commit()
+    return len(rows)
+
+
+def init_app(app):
+    @app.cli.command('rollup-flow')
+    @click.option('--backfill', is_flag=True, help='Rebuild events from ActivityLog text first')
+    def rollup_flow_command(backfill):
+        """Roll up daily burndown/cumulative-flow buckets for every project; run once a day."""
+        if backfill:
+            click.echo(f'Backfilled {backfill_events()} status events.')
+        click.echo(f'Rolled up {rollup_all()} project-days of flow buckets.')
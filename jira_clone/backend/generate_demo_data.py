@@ -12,8 +12,19 @@ This script will:
 - Create users, teams, projects, roles, permissions, and tasks
 - Assign users to teams and projects with appropriate roles
 - Assign permissions to roles as per RBAC
+
+Load data for benchmarking goes on top of the demo data with bulk inserts:
+
+    python generate_demo_data.py --users 10000 --projects 500 --items-per-project 2000 --comments-per-item 5
+
+Generated users are user1@example.com ... userN@example.com / password123. The same
+--seed (and --today) always produces the same rows.
 """
-from datetime import datetime, timedelta
+import argparse
+import random
+import time
+from itertools import accumulate
+from datetime import datetime, date, timedelta
 from models.db import db
 from models.user import User
 from models.team import Team
@@ -24,8 +35,12 @@ from models.team_member import TeamMember
 from models.project_member import ProjectMember
 from models.item import Item
 from models.board_column import BoardColumn
+from models.comment import Comment
+from models.activity_log import ActivityLog
+from models.notification import Notification
+from models.item_event import ItemStatusEvent
+from sqlalchemy import insert
 from werkzeug.security import generate_password_hash
-from app import app
 
 def reset_db():
     db.drop_all()
@@ -170,8 +185,223 @@ def seed_data():
     db.session.add(Item(title='Fix bug', description='Critical bug fix', type='bug', status='done', project_id=project_objs['Project Y'].id, reporter_id=user_objs['dave'].id, assignee_id=user_objs['carol'].id, due_date=now + timedelta(days=2), priority='High', created_at=now, updated_at=now, column_id=project_columns['Project Y']['done'].id))
     db.session.commit()
 
-if __name__ == '__main__':
+# --- Load data ---
+CHUNK_SIZE = 5000
+STATUSES = {'todo': 35, 'inprogress': 20, 'inreview': 10, 'done': 35}
+TYPES = {'task': 55, 'bug': 20, 'story': 15, 'feature': 7, 'epic': 3}
+PRIORITIES = {'Low': 25, 'Medium': 45, 'High': 22, 'Critical': 5, None: 3}
+COLUMNS = [('todo', 'To Do'), ('inprogress', 'In Progress'), ('inreview', 'In Review'), ('done', 'Done')]
+VERBS = ['Fix', 'Add', 'Refactor', 'Update', 'Remove', 'Investigate', 'Document', 'Migrate', 'Test', 'Optimize']
+NOUNS = ['login flow', 'board drag and drop', 'search index', 'report export', 'notification emails', 'API pagination',
+         'user settings', 'billing page', 'audit log', 'dashboard widgets', 'CSV import', 'permissions check']
+WORDS = ('the of and to in is that for it as with was on be by this are from at or an have not but which '
+         'customer release sprint backend frontend query cache latency page error timeout retry').split()
+
+
+def _weighted(rng, weights):
+    choices, cum_weights = list(weights), list(accumulate(weights.values()))
+    return lambda: rng.choices(choices, cum_weights=cum_weights)[0]
+
+
+class _Writer:
+    """Buffers rows for one table and writes them with multi-row INSERTs."""
+
+    def __init__(self, table):
+        self.table = table
+        self.rows = []
+        self.count = 0
+
+    def add(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= CHUNK_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            db.session.execute(insert(self.table), self.rows)
+            self.count += len(self.rows)
+            self.rows = []
+
+
+def _insert_returning_ids(table, rows):
+    ids = []
+    for start in range(0, len(rows), CHUNK_SIZE):
+        result = db.session.execute(insert(table).returning(table.c.id, sort_by_parameter_order=True),
+                                    rows[start:start + CHUNK_SIZE])
+        ids.extend(result.scalars())
+    return ids
+
+
+def seed_load_data(users=1000, projects=50, items_per_project=500, comments_per_item=3, seed=42, today=None,
+                   log=print):
+    """
+    Bulk-insert a realistic data set: users in teams of ~20, projects owned by a team with
+    its members on board, items with skewed assignees, subtasks, comments, activity,
+    status history and notifications. Derived tables (counters, search, daily flow
+    buckets up to yesterday) are rebuilt at the end. Needs the roles from seed_data(). Returns row counts per table.
+    """
+    from controllers.ranking import spaced_ranks
+    from controllers.project_stats import rebuild_stats
+    from controllers.search import rebuild_index
+    from controllers.timeseries import rollup_all
+    rng = random.Random(seed)
+    today = today or date.today()
+    now = datetime.combine(today, datetime.min.time()) + timedelta(hours=12)
+    roles = {name: role_id for role_id, name in db.session.query(Role.id, Role.name)}
+    status_of, type_of, priority_of = _weighted(rng, STATUSES), _weighted(rng, TYPES), _weighted(rng, PRIORITIES)
+    sentences = [' '.join(rng.choice(WORDS) for _ in range(rng.randint(8, 30))).capitalize() + '.' for _ in range(200)]
+    started = time.perf_counter()
+
+    def ago(max_days):
+        return now - timedelta(seconds=rng.randint(0, max_days * 86400))
+
+    # Users share one password hash; hashing each would take most of the run
+    password_hash = generate_password_hash('password123')
+    user_ids = _insert_returning_ids(User.__table__, [{
+        'username': f'user{n}', 'email': f'user{n}@example.com', 'password_hash': password_hash,
+        'created_at': ago(730), 'updated_at': now} for n in range(1, users + 1)])
+    counts = {'users': len(user_ids)}
+
+    # Teams of ~20; the first member manages the team
+    shuffled = user_ids[:]
+    rng.shuffle(shuffled)
+    team_size = 20
+    team_members = [shuffled[start:start + team_size] for start in range(0, len(shuffled), team_size)]
+    team_ids = _insert_returning_ids(Team.__table__, [{
+        'name': f'Team {n}', 'description': f'Generated team {n}', 'manager_id': members[0],
+        'created_at': ago(730), 'updated_at': now} for n, members in enumerate(team_members, start=1)])
+    db.session.execute(insert(TeamMember.__table__), [
+        {'team_id': team_id, 'user_id': user_id, 'role_id': roles['Team Manager' if k == 0 else 'Team Member']}
+        for team_id, members in zip(team_ids, team_members) for k, user_id in enumerate(members)])
+    counts['teams'] = len(team_ids)
+
+    # A few teams own many projects, most own one or two
+    owner_teams = rng.choices(range(len(team_ids)), weights=[1 / (k + 1) for k in range(len(team_ids))], k=projects)
+    project_ids = _insert_returning_ids(Project.__table__, [{
+        'name': f'Project {n}', 'description': rng.choice(sentences), 'owner_id': team_members[t][0],
+        'owner_team_id': team_ids[t], 'created_at': ago(365), 'updated_at': now}
+        for n, t in enumerate(owner_teams, start=1)])
+    column_ranks = spaced_ranks(len(COLUMNS))
+    column_ids = _insert_returning_ids(BoardColumn.__table__, [{
+        'name': name, 'project_id': project_id, 'order': k, 'rank': column_ranks[k], 'created_at': now, 'updated_at': now}
+        for project_id in project_ids for k, (_, name) in enumerate(COLUMNS)])
+    counts['projects'] = len(project_ids)
+
+    writers = {table.name: _Writer(table) for table in (
+        ProjectMember.__table__, Comment.__table__, ActivityLog.__table__, ItemStatusEvent.__table__,
+        Notification.__table__)}
+    items_written = 0
+    for p, (project_id, t) in enumerate(zip(project_ids, owner_teams)):
+        owner, *members = team_members[t]
+        # Plus a couple of visitors from other teams
+        visitors = set(rng.sample(user_ids, min(2, len(user_ids)))) - set(team_members[t])
+        writers['project_member'].add({'project_id': project_id, 'user_id': owner, 'role_id': roles['Project Owner']})
+        for user_id in members:
+            writers['project_member'].add({'project_id': project_id, 'user_id': user_id,
+                                           'role_id': roles['Project Contributor']})
+        for user_id in visitors:
+            writers['project_member'].add({'project_id': project_id, 'user_id': user_id,
+                                           'role_id': roles['Project Visitor']})
+        people = [owner] + members
+        # Work piles up on a few people
+        people_weights = [1 / (k + 1) for k in range(len(people))]
+        columns = dict(zip([status for status, _ in COLUMNS], column_ids[p * len(COLUMNS):(p + 1) * len(COLUMNS)]))
+
+        items = []
+        for n in range(items_per_project):
+            status, item_type = status_of(), type_of()
+            created_at = ago(365)
+            items.append({
+                'title': f'{rng.choice(VERBS)} {rng.choice(NOUNS)} #{n + 1}', 'description': rng.choice(sentences),
+                'type': item_type, 'status': status, 'column_id': columns[status], 'project_id': project_id,
+                'reporter_id': rng.choice(people),
+                'assignee_id': rng.choices(people, weights=people_weights)[0] if rng.random() < 0.85 else None,
+                'priority': priority_of(), 'severity': rng.choice(['Minor', 'Major', 'Critical']) if item_type == 'bug' else None,
+                'estimate': rng.choice([1, 2, 3, 5, 8, 13]) if rng.random() < 0.6 else None,
+                'due_date': (now + timedelta(days=rng.randint(-30, 60))).date() if rng.random() < 0.7 else None,
+                'created_at': created_at, 'updated_at': created_at + (now - created_at) * rng.random(),
+                'parent_id': None,
+            })
+        # Ranks follow creation order within each column
+        by_column = {}
+        for item in sorted(items, key=lambda i: i['created_at']):
+            by_column.setdefault(item['column_id'], []).append(item)
+        for column_items in by_column.values():
+            for item, rank in zip(column_items, spaced_ranks(len(column_items))):
+                item['rank'] = rank
+        # ~10% are subtasks of an earlier top-level item in the project
+        subtasks = [k for k in range(len(items)) if k and rng.random() < 0.1]
+        subtask_set = set(subtasks)
+        top = [k for k in range(len(items)) if k not in subtask_set]
+        ids = dict(zip(top, _insert_returning_ids(Item.__table__, [items[k] for k in top])))
+        for k in subtasks:
+            items[k]['parent_id'] = ids[rng.choice(top[:max(1, len(top) * k // len(items))])]
+        ids.update(zip(subtasks, _insert_returning_ids(Item.__table__, [items[k] for k in subtasks])))
+        items_written += len(items)
+
+        for k, item in enumerate(items):
+            item_id, created_at = ids[k], item['created_at']
+            writers['activity_log'].add({'item_id': item_id, 'user_id': item['reporter_id'], 'action': 'created',
+                                         'details': f"Task created: {item['title']}", 'created_at': created_at})
+            writers['item_status_event'].add({'project_id': project_id, 'item_id': item_id, 'user_id': None,
+                                              'from_status': None, 'to_status': 'todo', 'created_at': created_at})
+            if item['status'] != 'todo':
+                changed_by = item['assignee_id'] or item['reporter_id']
+                writers['activity_log'].add({'item_id': item_id, 'user_id': changed_by, 'action': 'updated',
+                                             'details': f"status: todo -> {item['status']}",
+                                             'created_at': item['updated_at']})
+                writers['item_status_event'].add({'project_id': project_id, 'item_id': item_id, 'user_id': changed_by,
+                                                  'from_status': 'todo', 'to_status': item['status'],
+                                                  'created_at': item['updated_at']})
+            for _ in range(rng.randint(0, 2 * comments_per_item)):
+                writers['comment'].add({'item_id': item_id, 'user_id': rng.choice(people),
+                                        'content': rng.choice(sentences),
+                                        'created_at': created_at + (now - created_at) * rng.random()})
+        db.session.commit()
+        if log and (p + 1) % max(1, projects // 10) == 0:
+            log(f'  {p + 1}/{projects} projects, {items_written} items ({time.perf_counter() - started:.0f}s)')
+
+    for user_id in user_ids:
+        for _ in range(rng.randint(0, 12)):
+            writers['notification'].add({'user_id': user_id, 'message': f'{rng.choice(VERBS)} {rng.choice(NOUNS)}',
+                                         'is_read': rng.random() < 0.7, 'created_at': ago(60)})
+    for writer in writers.values():
+        writer.flush()
+    db.session.commit()
+    counts.update({'items': items_written, **{name: writer.count for name, writer in writers.items()}})
+
+    if log:
+        log('  rebuilding counters, search index and flow buckets')
+    rebuild_stats()
+    rebuild_index()
+    rollup_all(until=today - timedelta(days=1))
+    counts['seconds'] = round(time.perf_counter() - started, 1)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=0, help='Generated users (0: demo data only)')
+    parser.add_argument('--projects', type=int, default=50)
+    parser.add_argument('--items-per-project', type=int, default=500)
+    parser.add_argument('--comments-per-item', type=int, default=3, help='Average; each item gets 0..2x this')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--today', type=date.fromisoformat, default=None,
+                        help='Date the data is generated around (YYYY-MM-DD); fix it for identical runs')
+    parser.add_argument('--database-url', default=None, help='Defaults to the app config (DATABASE_URL)')
+    args = parser.parse_args(argv)
+
+    from app import create_app
+    app = create_app({'SQLALCHEMY_DATABASE_URI': args.database_url} if args.database_url else None)
     with app.app_context():
         reset_db()
         seed_data()
-        print('Demo data generated.')
\ No newline at end of file
+        print('Demo data generated.')
+        if args.users:
+            counts = seed_load_data(args.users, args.projects, args.items_per_project, args.comments_per_item,
+                                    seed=args.seed, today=args.today)
+            print('Load data generated: ' + ', '.join(f'{k}={v}' for k, v in counts.items()))
+
+
+if __name__ == '__main__':
+    main()
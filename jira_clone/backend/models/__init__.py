@@ -10,3 +10,5 @@ from .activity_log import ActivityLog
 from .notification import Notification
 from .role import Role
 from .permission import Permission
+from .project_stats import ProjectStats, UserTaskStats
+from .item_event import ItemStatusEvent, ProjectDailyStatus
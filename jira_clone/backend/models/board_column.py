@@ -4,7 +4,12 @@ from .db import db
 class BoardColumn(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(50), nullable=False)
-    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id', ondelete='CASCADE'), nullable=False)
     order = db.Column(db.Integer, nullable=False)
+    rank = db.Column(db.String(64))  # lexicographic position on the board, see controllers/ranking.py
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_board_column_project_rank', 'project_id', 'rank'),
+    )
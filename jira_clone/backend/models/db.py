@@ -1,3 +1,26 @@
+from flask import g, has_app_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.selectable import Select
 
-db = SQLAlchemy()
+
+class RoutingSession(Session):
+    """
+    Sends reads to the replica bind picked for the request (g.db_replica, set by
+    controllers.db_router.read_replica). Flushes, INSERT/UPDATE/DELETE and locking reads go
+    to the primary, and once anything has, the rest of the transaction stays there.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self.info.get('db_primary'):
+            replica = g.get('db_replica') if has_app_context() else None
+            if replica:
+                locking = isinstance(clause, Select) and clause._for_update_arg is not None
+                if not (self._flushing or locking or isinstance(clause, UpdateBase)):
+                    return self._db.engines[replica]
+                self.info['db_primary'] = True
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
@@ -1,6 +1,11 @@
 from datetime import datetime
 from .db import db
 
+# Allowed values, shared by every endpoint that validates or filters items
+ITEM_STATUSES = ('todo', 'inprogress', 'inreview', 'done')
+ITEM_TYPES = ('task', 'bug', 'story', 'feature', 'epic')
+ITEM_PRIORITIES = ('Low', 'Medium', 'High', 'Critical')  # lowest first; ORDER BY priority uses this
+
 class Item(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(120), nullable=False)
@@ -8,17 +13,36 @@ class Item(db.Model):
     type = db.Column(db.String(20), nullable=False)
     status = db.Column(db.String(30), nullable=False)
     column_id = db.Column(db.Integer, db.ForeignKey('board_column.id'), nullable=False)
-    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
+    rank = db.Column(db.String(64))  # lexicographic position within the column, see controllers/ranking.py
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id', ondelete='CASCADE'), nullable=False)
     reporter_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     assignee_id = db.Column(db.Integer, db.ForeignKey('user.id'))
     due_date = db.Column(db.Date)
     priority = db.Column(db.String(10))
     severity = db.Column(db.String(10))
     steps_to_reproduce = db.Column(db.Text)
+    estimate = db.Column(db.Integer)  # story points, rolled up by the hierarchy API
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     start_date = db.Column(db.DateTime)
-    parent_id = db.Column(db.Integer, db.ForeignKey('item.id'))  # For subtasks
-    subtasks = db.relationship('Item', backref=db.backref('parent', remote_side=[id]), lazy='dynamic')
-    activity_logs = db.relationship('ActivityLog', backref='item', lazy='dynamic')
-    comments = db.relationship('Comment', backref='item', lazy='dynamic')
+    parent_id = db.Column(db.Integer, db.ForeignKey('item.id', ondelete='SET NULL'))  # For subtasks
+    # Children are removed/detached by the database (see controllers/deletion.py), never loaded to delete
+    subtasks = db.relationship('Item', backref=db.backref('parent', remote_side=[id]), lazy='dynamic', passive_deletes=True)
+    activity_logs = db.relationship('ActivityLog', backref='item', lazy='dynamic', passive_deletes=True)
+    comments = db.relationship('Comment', backref='item', lazy='dynamic', passive_deletes=True)
+
+    # Keyset pagination seeks on (created_at, id) within each listing's filter column
+    __table_args__ = (
+        db.Index('ix_item_project_created', 'project_id', 'created_at', 'id'),
+        db.Index('ix_item_assignee_created', 'assignee_id', 'created_at', 'id'),
+        db.Index('ix_item_reporter_created', 'reporter_id', 'created_at', 'id'),
+        # Report GROUP BYs over a project's items
+        db.Index('ix_item_project_status', 'project_id', 'status'),
+        # Item query language: due-date ranges and parent/epic lookups
+        db.Index('ix_item_project_due', 'project_id', 'due_date'),
+        db.Index('ix_item_parent', 'parent_id'),
+        # Board ETag: count and max(updated_at) per project from the index alone
+        db.Index('ix_item_project_updated', 'project_id', 'updated_at'),
+        # Card order within a column
+        db.Index('ix_item_column_rank', 'column_id', 'rank'),
+    )
@@ -0,0 +1,25 @@
+from datetime import datetime
+from .db import db
+
+class ItemStatusEvent(db.Model):
+    """Structured status transition of an item; from_status is None on create, to_status None on delete."""
+    __tablename__ = 'item_status_event'
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id', ondelete='CASCADE'), nullable=False)
+    item_id = db.Column(db.Integer, nullable=False)  # no FK: events outlive deleted items
+    user_id = db.Column(db.Integer, nullable=True)
+    from_status = db.Column(db.String(30))
+    to_status = db.Column(db.String(30))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_item_status_event_project_created', 'project_id', 'created_at'),
+    )
+
+class ProjectDailyStatus(db.Model):
+    """End-of-day item count per status, rolled up from ItemStatusEvent."""
+    __tablename__ = 'project_daily_status'
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id', ondelete='CASCADE'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    status = db.Column(db.String(30), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
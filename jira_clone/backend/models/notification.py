@@ -6,4 +6,11 @@ class Notification(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     message = db.Column(db.String(255), nullable=False)
     is_read = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow) 
\ No newline at end of file
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Unread counts and unread listings
+        db.Index('ix_notification_user_read_created', 'user_id', 'is_read', 'created_at'),
+        # Keyset-paginated listing of a user's full history
+        db.Index('ix_notification_user_created', 'user_id', 'created_at', 'id'),
+    )
@@ -11,7 +11,7 @@ class Project(db.Model):
     owner_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    board_columns = db.relationship('BoardColumn', backref='project', cascade='all, delete-orphan', lazy='dynamic')
-    items = db.relationship('Item', backref='project', cascade='all, delete-orphan', lazy='dynamic')
-    members = db.relationship('ProjectMember', backref='project', cascade='all, delete-orphan', lazy='dynamic')
+    board_columns = db.relationship('BoardColumn', backref='project', cascade='all, delete-orphan', lazy='dynamic', passive_deletes=True)
+    items = db.relationship('Item', backref='project', cascade='all, delete-orphan', lazy='dynamic', passive_deletes=True)
+    members = db.relationship('ProjectMember', backref='project', cascade='all, delete-orphan', lazy='dynamic', passive_deletes=True)
     owner_team_id = db.Column(db.Integer, db.ForeignKey('team.id'), nullable=True)
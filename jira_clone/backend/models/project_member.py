@@ -6,7 +6,7 @@ from models.team_member import TeamMember
 class ProjectMember(db.Model):
     __tablename__ = 'project_member'
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id', ondelete='CASCADE'), primary_key=True)
     role_id = db.Column(db.Integer, db.ForeignKey('role.id'), nullable=False)
     role = db.relationship('Role', backref='project_members')
 
@@ -23,6 +23,8 @@ def add_team_as_project_visitors(project_id, team_id):
             db.session.add(pm)
             added += 1
     db.session.commit()
+    from controllers.rbac import invalidate_permissions
+    invalidate_permissions(scope='project', scope_id=project_id)
     return added
 
 # Helper function to remove all visitor members from a project
@@ -37,12 +39,14 @@ def remove_all_project_visitors(project_id):
         db.session.delete(v)
         count += 1
     db.session.commit()
+    from controllers.rbac import invalidate_permissions
+    invalidate_permissions(scope='project', scope_id=project_id)
     return count
 
 class ProjectJoinRequest(db.Model):
     __tablename__ = 'project_join_request'
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id', ondelete='CASCADE'), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     type = db.Column(db.String(20), nullable=False) 
     status = db.Column(db.String(20), nullable=False, default='pending')  
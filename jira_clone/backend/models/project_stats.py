@@ -0,0 +1,15 @@
+from .db import db
+
+class ProjectStats(db.Model):
+    """Materialized item counts per project, one row per (dimension, value), e.g. ('status', 'done')."""
+    __tablename__ = 'project_stats'
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id', ondelete='CASCADE'), primary_key=True)
+    dimension = db.Column(db.String(20), primary_key=True)  # 'status', 'type'
+    value = db.Column(db.String(30), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+class UserTaskStats(db.Model):
+    """Number of items a user reports or is assigned to (counted once per item)."""
+    __tablename__ = 'user_task_stats'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    task_count = db.Column(db.Integer, nullable=False, default=0)
@@ -6,7 +6,8 @@ from models.team_member import TeamMember
 from models.project import Project
 from models.project_member import ProjectMember
 from models.role import Role
-from controllers.rbac import is_admin
+from controllers.rbac import is_admin, invalidate_team_membership, invalidate_project_membership
+from controllers.permission_cache import permission_cache
 from models.db import db
 from models.project_member import add_team_as_project_visitors, remove_all_project_visitors
 
@@ -39,6 +40,7 @@ def add_user_to_team(user_id, team_id):
     tm = TeamMember(user_id=user_id, team_id=team_id, role_id=team_role.id)
     db.session.add(tm)
     db.session.commit()
+    invalidate_team_membership(user_id, team_id)
     return jsonify({'message': 'User added to team'}), 200
 
 # Remove user from team
@@ -50,6 +52,7 @@ def remove_user_from_team(user_id, team_id):
         return jsonify({'error': 'Membership not found'}), 404
     db.session.delete(tm)
     db.session.commit()
+    invalidate_team_membership(user_id, team_id)
     return jsonify({'message': 'User removed from team'}), 200
 
 # Add user to project
@@ -67,6 +70,7 @@ def add_user_to_project(user_id, project_id):
     pm = ProjectMember(user_id=user_id, project_id=project_id, role_id=project_role.id)
     db.session.add(pm)
     db.session.commit()
+    invalidate_project_membership(user_id, project_id)
     return jsonify({'message': 'User added to project'}), 200
 
 # Remove user from project
@@ -78,6 +82,7 @@ def remove_user_from_project(user_id, project_id):
         return jsonify({'error': 'Membership not found'}), 404
     db.session.delete(pm)
     db.session.commit()
+    invalidate_project_membership(user_id, project_id)
     return jsonify({'message': 'User removed from project'}), 200
 
 # Change user's team role
@@ -92,6 +97,7 @@ def change_user_team_role(user_id, team_id):
         return jsonify({'error': 'Invalid membership or role'}), 400
     tm.role_id = role_id
     db.session.commit()
+    invalidate_team_membership(user_id, team_id)
     return jsonify({'message': 'Team role updated'}), 200
 
 # Change user's project role
@@ -106,6 +112,7 @@ def change_user_project_role(user_id, project_id):
         return jsonify({'error': 'Invalid membership or role'}), 400
     pm.role_id = role_id
     db.session.commit()
+    invalidate_project_membership(user_id, project_id)
     return jsonify({'message': 'Project role updated'}), 200
 
 # List all members and roles in a team
@@ -171,4 +178,10 @@ def remove_visitors_from_project(project_id):
         removed = remove_all_project_visitors(project_id)
         return jsonify({'message': f'All visitors removed', 'visitors_removed': removed}), 200
     except Exception as e:
-        return jsonify({'error': str(e)}), 400 
\ No newline at end of file
+        return jsonify({'error': str(e)}), 400 
+
+# Permission cache statistics (hit rate under load)
+@admin_bp.route('/admin/permission-cache', methods=['GET'])
+@admin_required
+def permission_cache_stats():
+    return jsonify(permission_cache.stats()), 200
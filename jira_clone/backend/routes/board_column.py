@@ -1,5 +1,6 @@
 from flask import Blueprint
-from controllers.board_column_controller import get_columns, create_column, update_column, delete_column
+from controllers.board_column_controller import get_columns, get_board, create_column, update_column, delete_column
+from controllers.ranking import move_column
 from flask_jwt_extended import jwt_required
 
 column_bp = Blueprint('column', __name__)
@@ -9,6 +10,11 @@ column_bp = Blueprint('column', __name__)
 def get_columns_route(project_id):
     return get_columns(project_id)
 
+@column_bp.route('/projects/<int:project_id>/board', methods=['GET'])
+@jwt_required()
+def get_board_route(project_id):
+    return get_board(project_id)
+
 @column_bp.route('/projects/<int:project_id>/columns', methods=['POST'])
 @jwt_required()
 def create_column_route(project_id):
@@ -19,6 +25,11 @@ def create_column_route(project_id):
 def update_column_route(column_id):
     return update_column(column_id)
 
+@column_bp.route('/columns/<int:column_id>/move', methods=['POST'])
+@jwt_required()
+def move_column_route(column_id):
+    return move_column(column_id)
+
 @column_bp.route('/columns/<int:column_id>', methods=['DELETE'])
 @jwt_required()
 def delete_column_route(column_id):
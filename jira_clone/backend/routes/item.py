@@ -1,11 +1,12 @@
 from flask import Blueprint, make_response
 from controllers.item_controller import create_item, get_items, get_item, update_item, delete_item, get_subtasks, create_subtask, update_subtask, delete_subtask, get_activity_logs, get_recent_activity, get_my_tasks, add_comment, edit_comment
+from controllers.hierarchy import get_item_tree, get_item_ancestors
+from controllers.ranking import move_item
+from controllers.bulk_controller import bulk_items
 from flask_jwt_extended import jwt_required
 
 item_bp = Blueprint('item', __name__)
 
-print(f"[ROUTE REGISTRATION] Registering get_items: {get_items}")
-
 @item_bp.route('/projects/<int:project_id>/items', methods=['POST'])
 @jwt_required()
 def create_item_route(project_id):
@@ -16,6 +17,11 @@ def create_item_route(project_id):
 def get_items_route(project_id):
     return get_items(project_id)
 
+@item_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def bulk_items_route():
+    return bulk_items()
+
 @item_bp.route('/<int:item_id>', methods=['GET'])
 @jwt_required()
 def get_item_route(item_id):
@@ -60,6 +66,21 @@ def update_subtask_route(subtask_id):
 def delete_subtask_route(subtask_id):
     return delete_subtask(subtask_id)
 
+@item_bp.route('/<int:item_id>/move', methods=['POST'])
+@jwt_required()
+def move_item_route(item_id):
+    return move_item(item_id)
+
+@item_bp.route('/<int:item_id>/tree', methods=['GET'])
+@jwt_required()
+def get_item_tree_route(item_id):
+    return get_item_tree(item_id)
+
+@item_bp.route('/<int:item_id>/ancestors', methods=['GET'])
+@jwt_required()
+def get_item_ancestors_route(item_id):
+    return get_item_ancestors(item_id)
+
 @item_bp.route('/<int:item_id>/activity', methods=['GET'])
 @jwt_required()
 def get_activity_logs_route(item_id):
@@ -1,5 +1,5 @@
 from flask import Blueprint
-from controllers.notification_controller import get_notifications, mark_as_read
+from controllers.notification_controller import get_notifications, get_unread_count, mark_as_read, mark_all_as_read, issue_stream_token, stream_events
 from flask_jwt_extended import jwt_required
 
 notification_bp = Blueprint('notification', __name__)
@@ -12,4 +12,25 @@ def notifications():
 @notification_bp.route('/notifications/<int:notif_id>/read', methods=['POST'])
 @jwt_required()
 def read_notification(notif_id):
-    return mark_as_read(notif_id) 
\ No newline at end of file
+    return mark_as_read(notif_id)
+
+@notification_bp.route('/notifications/unread-count', methods=['GET'])
+@jwt_required()
+def unread_count():
+    return get_unread_count()
+
+@notification_bp.route('/notifications/read-all', methods=['POST'])
+@jwt_required()
+def read_all_notifications():
+    return mark_all_as_read()
+
+@notification_bp.route('/notifications/stream-token', methods=['POST'])
+@jwt_required()
+def notification_stream_token():
+    return issue_stream_token()
+
+# EventSource cannot send headers: the stream takes ?token=<stream token> from the route above
+@notification_bp.route('/notifications/stream', methods=['GET'])
+def notification_stream():
+    return stream_events()
+
@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from controllers.project_controller import create_project, get_projects, get_dashboard_stats, update_project, delete_project, transfer_ownership, get_project_progress, get_all_projects
 from controllers.project_controller import get_project
+from controllers.export import export_project
+from controllers.importer import import_items
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask_cors import cross_origin
 from models.project_member import ProjectMember
@@ -26,6 +28,16 @@ def get_projects_route():
 def get_project_route(project_id):
     return get_project(project_id)
 
+@projects_bp.route('/projects/<int:project_id>/export', methods=['GET'])
+@jwt_required()
+def export_project_route(project_id):
+    return export_project(project_id)
+
+@projects_bp.route('/projects/<int:project_id>/import', methods=['POST'])
+@jwt_required()
+def import_items_route(project_id):
+    return import_items(project_id)
+
 @projects_bp.route('/projects/<int:project_id>/progress', methods=['GET'])
 @jwt_required()
 def get_project_progress_route(project_id):
@@ -1,5 +1,6 @@
 from flask import Blueprint
 from controllers.report_controller import get_project_report
+from controllers.timeseries import get_project_flow
 from flask_jwt_extended import jwt_required
 
 reports_bp = Blueprint('reports', __name__)
@@ -7,4 +8,9 @@ reports_bp = Blueprint('reports', __name__)
 @reports_bp.route('/reports/project/<int:project_id>', methods=['GET'])
 @jwt_required()
 def project_report(project_id):
-    return get_project_report(project_id)
\ No newline at end of file
+    return get_project_report(project_id)
+
+@reports_bp.route('/reports/project/<int:project_id>/flow', methods=['GET'])
+@jwt_required()
+def project_flow(project_id):
+    return get_project_flow(project_id)
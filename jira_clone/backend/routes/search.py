@@ -0,0 +1,10 @@
+from flask import Blueprint
+from controllers.search import search_items
+from flask_jwt_extended import jwt_required
+
+search_bp = Blueprint('search', __name__)
+
+@search_bp.route('/search', methods=['GET'])
+@jwt_required()
+def search():
+    return search_items()
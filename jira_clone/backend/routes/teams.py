@@ -7,7 +7,8 @@ from models.team_member import TeamMember
 from models.project import Project
 from models.project_member import ProjectMember
 from models.role import Role
-from controllers.rbac import is_admin
+from controllers.rbac import is_admin, invalidate_permissions, invalidate_team_membership
+from controllers.notification_controller import create_notification, notify_many
 from datetime import datetime
 import logging
 logger = logging.getLogger(__name__)
@@ -27,13 +28,6 @@ class TeamManagerRequest(_db.Model):
     status = Column(String(20), default='pending')  # pending, accepted, rejected
     created_at = Column(DateTime, default=datetime.utcnow)
 
-# --- Notification helper ---
-def create_notification(user_id, message):
-    from models.notification import Notification
-    notif = Notification(user_id=user_id, message=message)
-    db.session.add(notif)
-    db.session.commit()
-
 # --- Request to be manager ---
 @teams_bp.route('/teams/<int:team_id>/manager-request', methods=['POST'])
 @jwt_required()
@@ -50,10 +44,9 @@ def request_manager(team_id):
     db.session.add(req)
     db.session.commit()
     # Notify current manager and firm admin
-    create_notification(team.manager_id, f"User {user_id} requested to become manager of team {team_id}.")
     admin_user = User.query.filter_by(email='admin@example.com').first()
-    if admin_user:
-        create_notification(admin_user.id, f"User {user_id} requested to become manager of team {team_id}.")
+    notify_many([team.manager_id, admin_user.id if admin_user else None],
+                f"User {user_id} requested to become manager of team {team_id}.")
     return jsonify({'message': 'Request submitted'}), 200
 
 # --- List manager requests (admin/manager only) ---
@@ -104,6 +97,7 @@ def accept_manager_request(team_id, request_id):
         tm.role_id = manager_role.id
     req.status = 'accepted'
     db.session.commit()
+    invalidate_permissions(scope='team', scope_id=team_id)
     create_notification(req.user_id, f"Your request to become manager of team {team_id} was accepted.")
     return jsonify({'message': 'Manager transferred'}), 200
 
@@ -204,6 +198,7 @@ def add_team_project(team_id):
             pm = ProjectMember(project_id=project_id, user_id=tm.user_id, role_id=role_obj.id)
             db.session.add(pm)
     db.session.commit()
+    invalidate_permissions(scope='project', scope_id=project_id)
     return jsonify({'message': 'Project associated'}), 200
 
 @teams_bp.route('/teams/<int:team_id>/projects/<int:project_id>', methods=['DELETE'])
@@ -226,6 +221,7 @@ def remove_team_project(team_id, project_id):
             db.session.delete(direct_member)
     # db.session.delete(pt) # This line is removed as ProjectTeam is no longer imported.
     db.session.commit()
+    invalidate_permissions(scope='project', scope_id=project_id)
     return jsonify({'message': 'Project disassociated'}), 200
 
 @teams_bp.route('/teams/<int:team_id>/members', methods=['POST'])
@@ -271,6 +267,7 @@ def add_team_member(team_id):
             pm = ProjectMember(project_id=pl.id, user_id=user.id, role_id=project_role.id)
             db.session.add(pm)
     db.session.commit()
+    invalidate_permissions(user_id=user.id)
     return jsonify({'message': 'Member added'}), 200
 
 @teams_bp.route('/teams/<int:team_id>/members/<int:user_id>', methods=['DELETE'])
@@ -302,6 +299,7 @@ def remove_team_member(team_id, user_id):
             db.session.delete(direct_member)
     db.session.delete(tm)
     db.session.commit()
+    invalidate_permissions(user_id=user_id)
     return jsonify({'message': 'Member removed'}), 200
 
 @teams_bp.route('/teams/<int:team_id>/my-role', methods=['GET'])
@@ -351,6 +349,8 @@ def change_team_member_role(team_id, user_id):
         team.manager_id = user_id
     tm.role_id = role_id
     db.session.commit()
+    invalidate_permissions(scope='team', scope_id=team_id)
+    invalidate_team_membership(user_id, team_id)
     return jsonify({'message': 'Team role updated'}), 200
 
 @teams_bp.route('/teams/<int:team_id>', methods=['DELETE'])
@@ -364,9 +364,12 @@ def delete_team(team_id):
     if not team:
         return jsonify({'error': 'Team not found'}), 404
     # Delete all team members first to avoid FK constraint
+    member_ids = [tm.user_id for tm in TeamMember.query.filter_by(team_id=team_id)]
     TeamMember.query.filter_by(team_id=team_id).delete()
     db.session.delete(team)
     db.session.commit()
+    for member_id in member_ids:
+        invalidate_team_membership(member_id, team_id)
     return jsonify({'message': 'Team deleted'}), 200
 
 @teams_bp.route('/teams/my-teams', methods=['GET'])
@@ -3,58 +3,33 @@ from flask import Blueprint, jsonify
 from models.user import User
 from models.team_member import TeamMember
 from models.role import Role
-from controllers.rbac import is_admin
-from models.project_member import ProjectMember, ProjectJoinRequest
+from controllers.rbac import is_admin, invalidate_permissions
+from models.project_member import ProjectMember
 from models.db import db
+from controllers.deletion import delete_user as delete_user_rows, DeletionBlocked
+from controllers.serialization import USER, USER_TEAM, USER_PROJECT
 
 user_bp = Blueprint('user', __name__)
 
 @user_bp.route('/users/<int:user_id>', methods=['GET'])
 @jwt_required()
 def get_user(user_id):
-    user = User.query.get(user_id)
-    if not user:
+    row = USER.query(User).filter(User.id == user_id).first()
+    if not row:
         return jsonify({'error': 'User not found'}), 404
-    # Get teams
-    from models.team_member import TeamMember
     from models.team import Team
-    from models.role import Role
-    team_memberships = TeamMember.query.filter_by(user_id=user_id).all()
-    teams = []
-    for tm in team_memberships:
-        team = Team.query.get(tm.team_id)
-        role = Role.query.get(tm.role_id) if tm.role_id else None
-        if team:
-            teams.append({
-                'id': team.id,
-                'name': team.name,
-                'description': team.description,
-                'manager_id': team.manager_id,
-                'role': role.name if role else None
-            })
-    # Get projects
-    from models.project_member import ProjectMember
     from models.project import Project
-    project_memberships = ProjectMember.query.filter_by(user_id=user_id).all()
-    projects = []
-    for pm in project_memberships:
-        project = Project.query.get(pm.project_id)
-        role = Role.query.get(pm.role_id) if pm.role_id else None
-        if project:
-            projects.append({
-                'id': project.id,
-                'name': project.name,
-                'description': project.description,
-                'owner_team_id': project.owner_team_id,
-                'role': role.name if role else None
-            })
-    return jsonify({'user': {
-        'id': user.id,
-        'username': user.username,
-        'email': user.email,
-        'teams': teams,
-        'projects': projects
-    }}), 200
+    # One query each for teams and projects, with the user's role in each
+    teams = USER_TEAM.query(TeamMember).filter_by(user_id=user_id) \
+        .join(Team, Team.id == TeamMember.team_id) \
+        .outerjoin(Role, Role.id == TeamMember.role_id)
+    projects = USER_PROJECT.query(ProjectMember).filter_by(user_id=user_id) \
+        .join(Project, Project.id == ProjectMember.project_id) \
+        .outerjoin(Role, Role.id == ProjectMember.role_id)
+    user = USER.dump(row)
+    user['teams'] = USER_TEAM.dump_many(teams)
+    user['projects'] = USER_PROJECT.dump_many(projects)
+    return jsonify({'user': user}), 200
 
 @user_bp.route('/me/firm-permissions', methods=['GET'])
 @jwt_required()
@@ -96,11 +71,12 @@ def delete_user(user_id):
     user = User.query.get(user_id)
     if not user:
         return jsonify({'error': 'User not found'}), 404
-    # Remove from TeamMember, ProjectMember, ProjectJoinRequest
-    TeamMember.query.filter_by(user_id=user_id).delete()
-    ProjectMember.query.filter_by(user_id=user_id).delete()
-    ProjectJoinRequest.query.filter_by(user_id=user_id).delete()
-    # Remove the user
-    db.session.delete(user)
+    # Memberships, comments, activity and notifications go; reported items pass to project owners
+    try:
+        counts = delete_user_rows(user_id)
+    except DeletionBlocked as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 409
     db.session.commit()
-    return jsonify({'message': 'User deleted'}), 200
+    invalidate_permissions(user_id=user_id)
+    return jsonify({'message': 'User deleted', 'deleted': counts}), 200
@@ -0,0 +1,48 @@
+import os
+import sys
+import pytest
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from models.db import db  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    """App on a fresh in-memory SQLite database holding the demo data."""
+    from generate_demo_data import seed_data
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'SECRET_KEY': 'test-secret-key-' * 3,
+                      'TESTING': True, 'LOG_LEVEL': 'WARNING'})
+    with app.app_context():
+        db.create_all()
+        seed_data()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def login(client):
+    def login(email='alice@example.com', password='password123'):
+        response = client.post('/login', json={'email': email, 'password': password})
+        return {'Authorization': f"Bearer {response.get_json()['token']}"}
+    return login
+
+
+@pytest.fixture
+def statements(app):
+    """SQL statements executed while the test runs, in order."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(db.engine, 'before_cursor_execute', record)
@@ -0,0 +1,45 @@
+import sqlite3
+import pytest
+from benchmarks.endpoints import compare, main
+
+BASE = {'get_item': {'p50_ms': 5.0, 'p95_ms': 6.0, 'statements': 4}}
+
+
+def test_compare_gates_on_median_and_statements_only():
+    noisy_tail = {'get_item': {'p50_ms': 5.2, 'p95_ms': 9.1, 'statements': 4}}
+    assert compare(noisy_tail, BASE, max_regression=20, min_delta_ms=2) == []
+
+    slower = {'get_item': {'p50_ms': 8.0, 'p95_ms': 6.0, 'statements': 4}}
+    assert [f.split(':')[1].split()[0] for f in compare(slower, BASE, 20, 2)] == ['p50_ms']
+
+    more_sql = {'get_item': {'p50_ms': 5.0, 'p95_ms': 6.0, 'statements': 5}}
+    assert len(compare(more_sql, BASE, 20, 2)) == 1
+
+
+def test_dataset_is_pinned_to_a_date(tmp_path, capsys):
+    baseline = tmp_path / 'endpoints.json'
+    args = ['--users', '10', '--projects', '1', '--items-per-project', '20', '--comments-per-item', '1',
+            '--requests', '2', '--warmup', '0', '--only', 'get_item', '--json',
+            '--database-url', f'sqlite:///{tmp_path / "bench.db"}', '--baseline', str(baseline)]
+    assert main(args + ['--reseed', '--save-baseline']) == 0
+    assert '"today": "2026-01-01"' in baseline.read_text()
+    assert main(args + ['--today', '2026-02-01']) == 0
+    assert 'different data set' in capsys.readouterr().err
+
+
+def test_explicit_database_is_not_reseeded_without_asking(tmp_path):
+    path = tmp_path / 'dev.db'
+    with sqlite3.connect(path) as conn:
+        conn.execute('CREATE TABLE keep_me (id INTEGER)')
+    with pytest.raises(SystemExit, match='--reseed'):
+        main(['--database-url', f'sqlite:///{path}', '--requests', '1', '--only', 'get_item'])
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall() == [('keep_me',)]
+
+
+def test_runs_without_comments(tmp_path, capsys):
+    assert main(['--users', '5', '--projects', '1', '--items-per-project', '10', '--comments-per-item', '0',
+                 '--requests', '1', '--warmup', '0', '--only', 'get_item', '--json', '--reseed',
+                 '--database-url', f'sqlite:///{tmp_path / "bench.db"}',
+                 '--baseline', str(tmp_path / 'none.json')]) == 0
+    assert '"get_item"' in capsys.readouterr().out
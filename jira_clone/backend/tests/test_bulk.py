@@ -0,0 +1,55 @@
+from models.db import db
+from models.item import Item
+from models.project_stats import ProjectStats, UserTaskStats
+
+
+def _stats():
+    return (sorted((s.project_id, s.dimension, s.value, s.count) for s in ProjectStats.query.all()),
+            sorted((u.user_id, u.task_count) for u in UserTaskStats.query.all()))
+
+
+def test_create_without_optional_fields(client, login):
+    headers = login()
+    response = client.post('/items/bulk', headers=headers, json={'operations': [
+        {'op': 'create', 'project_id': 1, 'column_id': 1, 'title': 'bare'},
+        {'op': 'create', 'project_id': 1, 'column_id': 1, 'title': 'assigned', 'assignee_id': 3, 'priority': 'High'},
+    ]})
+    assert response.status_code == 200, response.get_json()
+    ids = [r['id'] for r in response.get_json()['results']]
+    bare, assigned = db.session.get(Item, ids[0]), db.session.get(Item, ids[1])
+    assert (bare.assignee_id, bare.status, bare.type) == (None, 'todo', 'task')
+    assert (assigned.assignee_id, assigned.priority) == (3, 'High')
+    # Counters written by the batch match a rebuild from the item table
+    from controllers.project_stats import rebuild_stats
+    counted = _stats()
+    rebuild_stats()
+    assert counted == _stats()
+
+
+def test_malformed_ids_are_rejected_per_operation(client, login):
+    headers = login()
+    response = client.post('/items/bulk', headers=headers, json={'operations': [
+        {'op': 'update', 'id': [1], 'status': 'done'},
+        {'op': 'create', 'project_id': 1, 'column_id': {'x': 1}, 'title': 'x'},
+        {'op': 'update', 'id': 1, 'assignee_id': '3'},
+    ]})
+    assert response.status_code == 400
+    errors = [r['error'] for r in response.get_json()['results']]
+    assert errors == ['id must be an integer', 'column_id must be an integer', 'assignee_id must be an integer']
+
+
+def test_wrongly_typed_fields_are_rejected_per_operation(client, login):
+    headers = login()
+    response = client.post('/items/bulk', headers=headers, json={'operations': [
+        {'op': 'create', 'project_id': 1, 'column_id': 1, 'title': 123},
+        {'op': 'update', 'id': 1, 'status': ['x']},
+        {'op': 'update', 'id': 2, 'priority': {'a': 1}},
+        {'op': ['create']},
+        {'op': 'create', 'project_id': 1, 'column_id': 1, 'title': 'x', 'estimate': True},
+        {'op': 'create', 'project_id': 1, 'column_id': 1, 'title': 'y', 'estimate': '5'},
+    ]})
+    assert response.status_code == 400
+    errors = [r['error'] for r in response.get_json()['results']]
+    assert errors == ['title must be a string', 'status must be a string', 'priority must be a string',
+                      'op must be one of create, update, move, delete',
+                      'estimate must be a non-negative integer', 'estimate must be a non-negative integer']
@@ -0,0 +1,19 @@
+import csv
+import io
+from sqlalchemy import delete
+from models.db import db
+from models.activity_log import ActivityLog
+
+
+def test_empty_csv_export_still_has_a_header(client, login):
+    db.session.execute(delete(ActivityLog))
+    db.session.commit()
+    response = client.get('/projects/1/export?format=csv&data=activity', headers=login())
+    assert response.status_code == 200
+    assert response.get_data(as_text=True).splitlines() == ['id,item_id,user_id,action,details,created_at']
+
+
+def test_csv_export_has_one_line_per_item(client, login):
+    response = client.get('/projects/1/export?format=csv', headers=login())
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [int(row['id']) for row in rows] == [1, 2]
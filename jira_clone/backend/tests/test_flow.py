@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from models.db import db
+from models.item_event import ItemStatusEvent, ProjectDailyStatus
+from controllers.timeseries import rollup
+
+
+def test_flow_is_read_only_and_matches_rolled_up_buckets(client, login):
+    headers = login()
+    now = datetime.utcnow()
+    db.session.execute(insert(ItemStatusEvent.__table__), [
+        {'project_id': 1, 'item_id': 1, 'from_status': 'todo', 'to_status': 'inprogress', 'created_at': now - timedelta(days=5)},
+        {'project_id': 1, 'item_id': 1, 'from_status': 'inprogress', 'to_status': 'done', 'created_at': now - timedelta(days=2)},
+    ])
+    db.session.commit()
+    client.patch('/items/2', headers=headers, json={'status': 'done'})
+
+    response = client.get('/reports/project/1/flow?days=7', headers=headers)
+    assert response.status_code == 200
+    assert ProjectDailyStatus.query.count() == 0
+    series = response.get_json()['series']
+    assert series[-1]['done'] == 2
+
+    rollup(1)
+    assert ProjectDailyStatus.query.count() > 0
+    assert client.get('/reports/project/1/flow?days=7', headers=headers).get_json()['series'] == series
+
+
+def test_flow_window_matches_rollup_with_old_history(client, login):
+    headers = login()
+    now = datetime.utcnow()
+    db.session.execute(insert(ItemStatusEvent.__table__), [
+        {'project_id': 1, 'item_id': 1, 'from_status': None, 'to_status': 'todo', 'created_at': now - timedelta(days=200)},
+        {'project_id': 1, 'item_id': 1, 'from_status': 'todo', 'to_status': 'inprogress', 'created_at': now - timedelta(days=90)},
+        {'project_id': 1, 'item_id': 2, 'from_status': None, 'to_status': 'todo', 'created_at': now - timedelta(days=40)},
+        {'project_id': 1, 'item_id': 2, 'from_status': 'todo', 'to_status': 'done', 'created_at': now - timedelta(days=3)},
+    ])
+    db.session.commit()
+    unrolled = client.get('/reports/project/1/flow?days=7', headers=headers).get_json()['series']
+    assert unrolled[0]['counts'].get('inprogress', 0) >= 1
+
+    rollup(1)
+    assert client.get('/reports/project/1/flow?days=7', headers=headers).get_json()['series'] == unrolled
+
+
+def test_load_data_is_rolled_up(app):
+    from generate_demo_data import seed_load_data
+    seed_load_data(users=5, projects=1, items_per_project=20, comments_per_item=0, log=None)
+    assert ProjectDailyStatus.query.count() > 0
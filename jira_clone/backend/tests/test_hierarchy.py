@@ -0,0 +1,44 @@
+from datetime import datetime
+from sqlalchemy import insert, update
+from models.db import db
+from models.item import Item
+from controllers.hierarchy import MAX_DEPTH, would_create_cycle
+
+
+def _add_chain(parent_id, length):
+    """`length` items, each the child of the one before; returns their ids top-down."""
+    now = datetime.utcnow()
+    ids = []
+    for n in range(length):
+        parent_id = db.session.execute(insert(Item).returning(Item.id), {
+            'title': f'level {n}', 'type': 'task', 'status': 'todo', 'project_id': 1, 'column_id': 1,
+            'reporter_id': 2, 'parent_id': parent_id, 'created_at': now, 'updated_at': now}).scalar()
+        ids.append(parent_id)
+    db.session.commit()
+    return ids
+
+
+def test_tree_survives_a_parent_cycle(client, login):
+    headers = login()
+    top, middle, bottom = _add_chain(None, 3)
+    # Bad data from before the cycle check: the top item filed under its own descendant
+    db.session.execute(update(Item).where(Item.id == top).values(parent_id=bottom))
+    db.session.commit()
+
+    response = client.get(f'/items/{top}/tree?depth={MAX_DEPTH}', headers=headers)
+    assert response.status_code == 200
+    tree = response.get_json()['tree']
+    assert tree['id'] == top
+    assert tree['children'][0]['id'] == middle
+    assert tree['children'][0]['children'][0]['id'] == bottom
+    assert tree['children'][0]['children'][0]['children'] == []
+    assert tree['progress']['total'] == 3
+
+
+def test_cycle_check_walks_past_the_depth_cap(client, login):
+    chain = _add_chain(None, MAX_DEPTH + 10)
+    assert would_create_cycle(chain[0], chain[-1])
+    assert not would_create_cycle(chain[-1], chain[0])
+
+    response = client.patch(f'/items/{chain[0]}', headers=login(), json={'parent_id': chain[-1]})
+    assert response.status_code == 400
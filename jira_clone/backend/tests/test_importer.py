@@ -0,0 +1,33 @@
+import json
+from models.item import Item
+
+
+def test_mixed_type_json_rows_are_reported_per_row(client, login):
+    headers = login()
+    before = Item.query.count()
+    rows = [
+        {'title': 'fine', 'estimate': 3, 'assignee': 'bob@example.com'},
+        {'title': 123},
+        {'title': 'listed status', 'status': ['x']},
+        {'title': 'bool estimate', 'estimate': True},
+        {'title': 'dict priority', 'priority': {'a': 1}},
+        {'title': 'numeric date', 'due_date': 20261018},
+    ]
+    response = client.post('/projects/1/import?format=json', data=json.dumps(rows),
+                           headers={**headers, 'Content-Type': 'application/json'})
+    assert response.status_code == 400
+    report = response.get_json()
+    assert report['imported'] == 0
+    assert [(e['row'], e['error']) for e in report['errors']] == [
+        (2, 'title must be a string'),
+        (3, 'status must be a string'),
+        (4, 'Invalid estimate: True'),
+        (5, 'priority must be a string'),
+        (6, 'Invalid due_date: 20261018'),
+    ]
+    assert Item.query.count() == before
+
+    response = client.post('/projects/1/import?format=json', data=json.dumps(rows[:1]),
+                           headers={**headers, 'Content-Type': 'application/json'})
+    assert response.status_code == 201
+    assert response.get_json()['imported'] == 1
@@ -0,0 +1,48 @@
+from datetime import datetime
+from sqlalchemy import insert
+from models.db import db
+from models.item import Item
+from models.comment import Comment
+from controllers.item_controller import load_item_detail
+
+
+def _add_comments(item_id, count):
+    now = datetime.utcnow()
+    db.session.execute(insert(Comment), [
+        {'item_id': item_id, 'user_id': 2 + n % 2, 'content': f'comment {n}', 'created_at': now} for n in range(count)])
+
+
+def _add_subtasks(parent_id, count):
+    now = datetime.utcnow()
+    db.session.execute(insert(Item), [
+        {'title': f'subtask {n}', 'type': 'task', 'status': 'todo', 'project_id': 1, 'column_id': 1,
+         'reporter_id': 2, 'parent_id': parent_id, 'created_at': now, 'updated_at': now} for n in range(count)])
+
+
+def _count(statements, item_id):
+    del statements[:]
+    item = load_item_detail(item_id)
+    return len(statements), item
+
+
+def test_item_detail_query_count_is_constant(app, statements):
+    _add_comments(1, 1)
+    _add_comments(2, 50)
+    _add_subtasks(2, 20)
+    _add_subtasks(1, 1)
+    db.session.execute(db.update(Item).where(Item.id == 2).values(parent_id=1))
+    db.session.commit()
+
+    small, small_item = _count(statements, 1)
+    large, large_item = _count(statements, 2)
+    assert (len(small_item['comments']), len(small_item['subtasks'])) == (1, 2)
+    assert (len(large_item['comments']), len(large_item['subtasks'])) == (50, 20)
+    assert large_item['parent_epic']['id'] == 1
+    assert large_item['comments'][0]['author_name'] in ('alice', 'bob')
+    assert small == large == 3
+
+
+def test_get_item_endpoint(client, login):
+    response = client.get('/items/1', headers=login())
+    assert response.status_code == 200
+    assert response.get_json()['item']['id'] == 1
@@ -0,0 +1,27 @@
+import pytest
+from controllers.item_query import compile_query, QueryError, MAX_DEPTH
+
+
+@pytest.mark.parametrize('text', ['(' * 400 + 'status = todo' + ')' * 400, 'NOT ' * 100 + 'status = todo'])
+def test_deep_nesting_is_a_query_error(text):
+    with pytest.raises(QueryError, match='nested too deeply'):
+        compile_query(text)
+
+
+def test_nesting_within_limit_compiles():
+    depth = MAX_DEPTH - 1
+    compile_query('(' * depth + 'status = todo' + ')' * depth)
+
+
+def test_deep_nesting_over_http_is_400(client, login):
+    response = client.get('/items/projects/1/items', headers=login(), query_string={'q': '(' * 400 + 'id = 1' + ')' * 400})
+    assert response.status_code == 400
+    assert 'nested too deeply' in response.get_json()['error']
+
+
+def test_story_type_can_be_filtered(client, login):
+    headers = login()
+    client.patch('/items/1', headers=headers, json={'type': 'story'})
+    response = client.get('/items/projects/1/items', headers=headers, query_string={'q': 'type = story'})
+    assert response.status_code == 200, response.get_json()
+    assert [item['id'] for item in response.get_json()['items']] == [1]
@@ -0,0 +1,24 @@
+def test_stream_opens_with_a_stream_token_only(app, client, login):
+    headers = login()
+    access_token = headers['Authorization'].split()[1]
+    assert client.post('/notifications/stream-token').status_code == 401
+
+    issued = client.post('/notifications/stream-token', headers=headers).get_json()
+    assert issued['expires_in'] == 60
+    response = client.get('/notifications/stream', query_string={'token': issued['token']})
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    response.close()
+
+    # The long-lived access token is no longer accepted in the URL, and a stream token isn't a bearer token
+    assert client.get('/notifications/stream', query_string={'jwt': access_token}).status_code == 401
+    assert client.get('/notifications/stream', query_string={'token': access_token}).status_code == 401
+    assert client.get('/notifications', headers={'Authorization': f"Bearer {issued['token']}"}).status_code != 200
+
+
+def test_stream_token_expires(app, client, login):
+    issued = client.post('/notifications/stream-token', headers=login()).get_json()
+    app.config['STREAM_TOKEN_TTL'] = -1
+    response = client.get('/notifications/stream', query_string={'token': issued['token']})
+    assert response.status_code == 401
+    assert response.get_json()['error'] == 'Stream token expired'
@@ -0,0 +1,24 @@
+import base64
+import json
+
+
+def _cursor(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def test_offset_cursor_pages_through_query_results(client, login):
+    headers = login()
+    first = client.get('/items/projects/1/items?q=ORDER BY priority&limit=1', headers=headers).get_json()
+    assert len(first['items']) == 1 and first['next_cursor']
+    second = client.get(f"/items/projects/1/items?q=ORDER BY priority&limit=1&cursor={first['next_cursor']}",
+                        headers=headers).get_json()
+    assert second['items'][0]['id'] != first['items'][0]['id']
+    assert second['next_cursor'] is None
+
+
+def test_crafted_offset_cursors_are_rejected(client, login):
+    headers = login()
+    for payload in ({'offset': -5}, {'offset': 'x'}, [1], {}):
+        response = client.get(f'/items/projects/1/items?q=ORDER BY priority&cursor={_cursor(payload)}', headers=headers)
+        assert response.status_code == 400, payload
+        assert response.get_json()['error'] == 'Invalid cursor'
@@ -0,0 +1,45 @@
+from models.db import db
+from models.item import Item
+from controllers.ranking import MAX_RANK_LENGTH, rank_after
+
+
+def test_rank_after_keeps_keys_short():
+    keys, last = [], None
+    for _ in range(50000):
+        last = rank_after(last)
+        keys.append(last)
+    assert keys == sorted(keys) and len(set(keys)) == len(keys)
+    assert max(map(len, keys)) <= 5
+
+
+def test_appending_cards_keeps_ranks_bounded(client, login):
+    headers = login()
+    for n in range(300):
+        response = client.post('/items/projects/1/items', headers=headers, json={'title': f'card {n}', 'column_id': 1})
+        assert response.status_code == 201, response.get_json()
+    response = client.post('/items/bulk', headers=headers, json={'operations': [
+        {'op': 'create', 'project_id': 1, 'column_id': 1, 'title': f'bulk {n}'} for n in range(100)]})
+    assert response.status_code == 200
+    rows = db.session.query(Item.title, Item.rank).filter(Item.column_id == 1).order_by(Item.rank).all()
+    assert max(len(rank) for _, rank in rows) <= MAX_RANK_LENGTH
+    # Appended in creation order
+    titles = [title for title, _ in rows if title.startswith(('card ', 'bulk '))]
+    assert titles == [f'card {n}' for n in range(300)] + [f'bulk {n}' for n in range(100)]
+
+
+def test_failed_move_in_a_legacy_list_commits_nothing(client, login):
+    from datetime import datetime, timedelta
+    from sqlalchemy import insert, update
+    now = datetime.utcnow()
+    ids = db.session.execute(insert(Item).returning(Item.id, sort_by_parameter_order=True), [
+        {'title': f'legacy {n}', 'type': 'task', 'status': 'todo', 'project_id': 1, 'column_id': 1,
+         'reporter_id': 2, 'created_at': now + timedelta(seconds=n), 'updated_at': now} for n in range(3)]).scalars().all()
+    db.session.execute(update(Item).where(Item.column_id == 1).values(rank=None))
+    db.session.commit()
+
+    # Numbering the list puts ids[2] after ids[1], so these neighbours are out of order
+    response = client.post(f'/items/{ids[0]}/move', headers=login(),
+                           json={'before_id': ids[2], 'after_id': ids[1]})
+    assert response.status_code == 409
+    db.session.expire_all()
+    assert db.session.query(Item.rank).filter(Item.column_id == 1).distinct().all() == [(None,)]
@@ -0,0 +1,19 @@
+from datetime import date, datetime
+from models.item import Item
+from controllers.serialization import Serializer
+
+
+def test_dump_keeps_declared_order_and_formats_dates():
+    dump = Serializer(Item.id, Item.due_date, Item.title, Item.created_at).dump
+    row = dump((1, date(2026, 10, 18), 'Fix login', datetime(2026, 10, 18, 9, 30)))
+    assert list(row) == ['id', 'due_date', 'title', 'created_at']
+    assert row == {'id': 1, 'due_date': '2026-10-18', 'title': 'Fix login', 'created_at': '2026-10-18T09:30:00'}
+    assert dump((2, None, 'No date', None))['due_date'] is None
+
+
+def test_dump_many_reads_query_rows(app):
+    serializer = Serializer(Item.id, Item.title, Item.due_date)
+    rows = serializer.query(Item).filter_by(project_id=1).order_by(Item.id).all()
+    dumped = serializer.dump_many(rows)
+    assert [d['id'] for d in dumped] == [row.id for row in rows]
+    assert all(set(d) == {'id', 'title', 'due_date'} for d in dumped)
@@ -27,7 +27,7 @@ function Header() {
           return;
         }
         try {
-          const res = await fetch('http://localhost:5000/notifications', {
+          const res = await fetch('http://localhost:5000/notifications/unread-count', {
             headers: { 'Authorization': `Bearer ${token}` }
           });
           if (res.status === 401) {
@@ -39,7 +39,7 @@ function Header() {
           }
           if (res.ok) {
             const data = await res.json();
-            setUnreadCount(Array.isArray(data) ? data.filter(n => !n.is_read).length : 0);
+            setUnreadCount(typeof data.unread === 'number' ? data.unread : 0);
           }
         } catch {
           setUnreadCount(0);
@@ -49,6 +49,39 @@ function Header() {
     }
   }, [currentUser, notifVisible]);
 
+  // Push channel: bump the badge when the server streams a new notification.
+  // EventSource can't send headers, so the stream opens with a short-lived stream token
+  // (never the login token); once the browser gives up on a stale one, fetch a new one.
+  useEffect(() => {
+    if (!currentUser || !localStorage.getItem('token')) return undefined;
+    let source = null;
+    let retry = null;
+    let closed = false;
+    const connect = async () => {
+      try {
+        const res = await fetch('http://localhost:5000/notifications/stream-token', {
+          method: 'POST',
+          headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}` }
+        });
+        if (!res.ok || closed) return;
+        const { token } = await res.json();
+        source = new EventSource(`http://localhost:5000/notifications/stream?token=${encodeURIComponent(token)}`);
+        source.addEventListener('notification', () => setUnreadCount(count => count + 1));
+        source.onerror = () => {
+          if (source.readyState === EventSource.CLOSED && !closed) retry = setTimeout(connect, 5000);
+        };
+      } catch {
+        if (!closed) retry = setTimeout(connect, 5000);
+      }
+    };
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(retry);
+      if (source) source.close();
+    };
+  }, [currentUser]);
+
   const handleLogout = () => {
     logout();
     navigate('/login');
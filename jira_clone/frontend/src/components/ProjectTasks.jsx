@@ -6,6 +6,7 @@ import dayjs from 'dayjs';
 import TaskDetailModal from './TaskDetailModal';
 import { useNavigate } from 'react-router-dom';
 import { getTypeIcon, getStatusColor, getPriorityColor } from '../utils/itemUi.jsx';
+import { apiFetchAll } from '../utils/api';
 
 const { Option } = Select;
 const { Title } = Typography;
@@ -68,14 +69,13 @@ function ProjectTasks() {
 
   const fetchTasks = async () => {
     setLoading(true);
-    const token = localStorage.getItem('token');
     let url = `http://localhost:5000/items/projects/${selectedProject.id}/items`;
     if (typeFilter !== 'all') url += `?type=${typeFilter}`;
-    const res = await fetch(url, {
-      headers: { 'Authorization': `Bearer ${token}` }
-    });
-    const data = await res.json();
-    if (res.ok) setTasks(data.items);
+    try {
+      setTasks(await apiFetchAll(url, 'items'));
+    } catch {
+      setTasks([]);
+    }
     setLoading(false);
   };
 
@@ -17,7 +17,7 @@ import {
 import { SortableItem } from '../components/SortableItem';
 import { Row, Col, Card, Button, Input, Spin, Modal, message } from 'antd';
 import { PlusOutlined, DeleteOutlined } from '@ant-design/icons';
-import { apiFetch } from '../utils/api';
+import { apiFetch, apiFetchAll } from '../utils/api';
 
 const columnsDefault = [
   { key: 'todo', label: 'To Do' },
@@ -113,18 +113,15 @@ function Board() {
   const fetchTasks = async () => {
     setLoading(true);
     try {
-      const res = await apiFetch(`http://localhost:5000/items/projects/${selectedProject.id}/items`);
-      const data = await res.json();
-      if (res.ok) {
-        const grouped = { todo: [], inprogress: [], inreview: [], done: [] };
-        data.items.forEach(item => {
-          if (grouped[item.status]) grouped[item.status].push(item);
-        });
-        setTasks(grouped);
-        if (syncing) {
-          setOptimisticTasks(null);
-          setSyncing(false);
-        }
+      const items = await apiFetchAll(`http://localhost:5000/items/projects/${selectedProject.id}/items`, 'items');
+      const grouped = { todo: [], inprogress: [], inreview: [], done: [] };
+      items.forEach(item => {
+        if (grouped[item.status]) grouped[item.status].push(item);
+      });
+      setTasks(grouped);
+      if (syncing) {
+        setOptimisticTasks(null);
+        setSyncing(false);
       }
     } finally {
       setLoading(false);
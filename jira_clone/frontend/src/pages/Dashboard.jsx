@@ -6,7 +6,7 @@ import { Row, Col, Card, Statistic, Progress, List, Spin, message } from 'antd';
 import { CheckCircleOutlined, ProjectOutlined, TeamOutlined, PlusOutlined } from '@ant-design/icons';
 import { Button, Modal, Form, Input, Select, DatePicker, Alert, Space } from 'antd';
 import { useNavigate } from 'react-router-dom';
-import { apiFetch } from '../utils/api';
+import { apiFetch, apiFetchAll } from '../utils/api';
 
 function Dashboard() {
   const { selectedProject } = useContext(ProjectContext);
@@ -66,18 +66,8 @@ function Dashboard() {
           const data = await activityRes.json();
           setActivity(data.activity || []);
         }
-        // Fetch my tasks
-        const myTasksRes = await apiFetch('http://localhost:5000/items/my-tasks', {}, navigate);
-        if (myTasksRes.status === 401) {
-          localStorage.removeItem('token');
-          localStorage.removeItem('user');
-          navigate('/login');
-          return;
-        }
-        if (myTasksRes.ok) {
-          const data = await myTasksRes.json();
-          setMyTasks(data.tasks || []);
-        }
+        // Fetch my tasks (every page)
+        setMyTasks(await apiFetchAll('http://localhost:5000/items/my-tasks', 'tasks', navigate));
         // Fetch all projects for Add Task modal
         const projectsRes = await apiFetch('http://localhost:5000/projects', {}, navigate);
         if (projectsRes.status === 401) {
@@ -214,17 +204,9 @@ function Dashboard() {
         setUsers(data.members || []);
       }
       // Fetch epics
-      const epicsRes = await apiFetch(`http://localhost:5000/items/projects/${selectedTaskProject}/items`, {}, navigate);
-      if (epicsRes.status === 401) {
-        localStorage.removeItem('token');
-        localStorage.removeItem('user');
-        navigate('/login');
-        return;
-      }
-      if (epicsRes.ok) {
-        const data = await epicsRes.json();
-        setEpics((data.items || []).filter(i => i.type && i.type.toLowerCase() === 'epic'));
-      }
+      const epics = await apiFetchAll(`http://localhost:5000/items/projects/${selectedTaskProject}/items?type=epic`, 'items', navigate)
+        .catch(() => []);
+      setEpics(epics);
     };
     fetchForProject();
   }, [selectedTaskProject]);
@@ -8,7 +8,7 @@ import { ProjectContext } from '../context/ProjectContext';
 import { Pie } from '@ant-design/plots';
 import { CheckCircleTwoTone, ClockCircleTwoTone, ExclamationCircleTwoTone, TeamOutlined, PieChartTwoTone, UserOutlined } from '@ant-design/icons';
 import Reports from './Reports';
-import { apiFetch } from '../utils/api';
+import { apiFetch, apiFetchAll } from '../utils/api';
 
 const { Title, Paragraph } = Typography;
 
@@ -38,10 +38,10 @@ function ProjectPage() {
   useEffect(() => {
     const fetchTasks = async () => {
       setTasksLoading(true);
-      const res = await apiFetch(`http://localhost:5000/items/projects/${id}/items`);
-      if (res.ok) {
-        const data = await res.json();
-        setTasks(data.items || []);
+      try {
+        setTasks(await apiFetchAll(`http://localhost:5000/items/projects/${id}/items`, 'items'));
+      } catch {
+        setTasks([]);
       }
       setTasksLoading(false);
     };
@@ -40,12 +40,26 @@ function Reports({ projectId }) {
       setLoading(true);
       const token = localStorage.getItem('token');
       try {
-        const res = await fetch(`http://localhost:5000/reports/project/${projectId}`, {
-          headers: { 'Authorization': `Bearer ${token}` }
-        });
-        const data = await res.json();
-        if (res.ok) setReport(data.report);
-        else message.error(data.error || 'Failed to fetch report');
+        // The task listing is paginated: keep following next_cursor so large projects aren't cut off
+        let full = null;
+        let cursor = null;
+        do {
+          const url = `http://localhost:5000/reports/project/${projectId}?include_tasks=1&limit=200`
+            + (cursor ? `&cursor=${encodeURIComponent(cursor)}` : '');
+          const res = await fetch(url, {
+            headers: { 'Authorization': `Bearer ${token}` }
+          });
+          const data = await res.json();
+          if (!res.ok) {
+            message.error(data.error || 'Failed to fetch report');
+            full = null;
+            break;
+          }
+          const tasks = data.report.tasks || [];
+          full = full ? { ...full, tasks: [...full.tasks, ...tasks] } : { ...data.report, tasks };
+          cursor = data.report.next_cursor;
+        } while (cursor);
+        if (full) setReport({ ...full, next_cursor: null });
       } catch {
         message.error('Failed to fetch report');
       }
@@ -4,7 +4,7 @@ import { ProjectOutlined, TeamOutlined, CheckCircleOutlined } from '@ant-design/
 import dayjs from 'dayjs';
 import { getTypeIcon, getStatusColor, getPriorityColor } from '../utils/itemUi.jsx';
 import { ProjectContext } from '../context/ProjectContext.jsx';
-import { apiFetch } from '../utils/api';
+import { apiFetch, apiFetchAll } from '../utils/api';
 
 function Profile() {
   // --- FIX: Use the central context to get the current user ---
@@ -23,17 +23,16 @@ function Profile() {
       setLoading(true);
       try {
         // Fetch all data concurrently for better performance
-        const [tasksRes, projectsRes, teamsRes] = await Promise.all([
-          apiFetch('http://localhost:5000/items/my-tasks'),
+        const [tasks, projectsRes, teamsRes] = await Promise.all([
+          apiFetchAll('http://localhost:5000/items/my-tasks', 'tasks'),
           apiFetch('http://localhost:5000/projects'),
           apiFetch('http://localhost:5000/teams/my-teams')
         ]);
 
-        const tasksData = await tasksRes.json();
         const projectsData = await projectsRes.json();
         const teamsData = await teamsRes.json();
 
-        setTasks(tasksData.tasks || []);
+        setTasks(tasks);
         setProjects(projectsData.projects || []);
         setTeams(teamsData.teams || []);
 
@@ -20,4 +20,22 @@ export async function apiFetch(url, options = {}, navigate) {
     throw new Error('Unauthorized');
   }
   return res;
-} 
\ No newline at end of file
+} 
+
+// Every row of a cursor-paginated list endpoint (responses carry `next_cursor`),
+// fetched at the largest page size. Throws if any page fails.
+export async function apiFetchAll(url, key, navigate) {
+  const rows = [];
+  let cursor = null;
+  do {
+    const pageUrl = new URL(url);
+    pageUrl.searchParams.set('limit', '200');
+    if (cursor) pageUrl.searchParams.set('cursor', cursor);
+    const res = await apiFetch(pageUrl.toString(), {}, navigate);
+    if (!res.ok) throw new Error(`Failed to load ${url} (${res.status})`);
+    const data = await res.json();
+    rows.push(...(data[key] || []));
+    cursor = data.next_cursor;
+  } while (cursor);
+  return rows;
+}